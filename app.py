@@ -1,15 +1,25 @@
 # Çalıştırmak için: streamlit run .\app.py
 
+import time
+_RUN_START = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from tensorflow.keras.models import load_model
-import joblib, json
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-from streamlit_rag import setup_rag_chain
+from startup_profile import PROFILE
+from dotenv import load_dotenv
+import os
 import html
+import tempfile
+from collections import deque
+import metrics
+
+load_dotenv()
+
+# Ağır bağımlılıklar (TensorFlow/Keras, LangChain/Chroma/Gemini, tahmin servisi istemcisi)
+# modül başında değil, ilgili sekmenin içeriği gerçekten gerektiğinde yüklenir.
+pd = PROFILE.import_module("pandas")
+artifacts = PROFILE.import_module("artifacts")
+model_registry = PROFILE.import_module("model_registry")
+eda_cache = PROFILE.import_module("eda_cache")
                     
 is_dark = False
 try:
@@ -29,6 +39,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Aşama gecikme histogramları http://127.0.0.1:9108/metrics adresinde (METRICS_PORT) yayınlanır
+@st.cache_resource
+def start_metrics_server():
+    return metrics.start_server()
+
+start_metrics_server()
+
 # Sekme ve buton için CSS ekle
 st.markdown('''
     <style>
@@ -69,129 +86,149 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-# ─────────────────────────── Veri Yükleme (Raw) ─────────────────────────
+# ─────────────────────────── Model & Artefaktlar ────────────────────────
+# Artefaktlar model_registry.json'daki aktif sürümden okunur. Özellik sırası yalnızca
+# manuel formun alanları için hemen okunur; puanlama, eşik ve kayma izleme her zaman
+# puanlayan bundle'ın (store.current()) özellik ve eşiğini kullanır
 @st.cache_data
-def load_data():
-    df = pd.read_csv("data/data.csv")
-    df = df.drop(columns=["Unnamed: 32", "id"], errors="ignore")
-    return df
+def load_form_features(version):
+    _, entry = model_registry.version_entry(version)
+    return artifacts.load_features(entry["files"]["features"])
 
-df = load_data()
+ACTIVE_VERSION = model_registry.active_version()
+FEATURES = load_form_features(ACTIVE_VERSION)
 
-# ─────────────────────────── Model & Artefaktlar ────────────────────────
+# Model yalnızca ilk tahmin isteğinde yüklenir
 @st.cache_resource
-def load_artifacts():
-    model = load_model("breast_mlp.h5", compile=False)
-    scaler = joblib.load("scaler.pkl")
-    threshold = json.load(open("threshold.json"))["threshold"]
-    features = pd.read_csv("data/feature_order.csv", header=None)[0].tolist()
-    return model, scaler, threshold, features
+def get_model_store():
+    with PROFILE.timed("load_artifacts"):
+        return model_registry.ModelStore.open(ACTIVE_VERSION)
 
-model, scaler, THRESHOLD, FEATURES = load_artifacts()
+def get_bundle():
+    # Aktif sürüm değiştiyse yeni sürüm arka planda yüklenip ısıtılır; o ana kadar
+    # (yükleme başarısız olursa da) mevcut sürüm sunulmaya devam eder. İstek boyunca
+    # model, eşik ve özellikler bu tek bundle'dan okunur
+    store = get_model_store()
+    store.follow_registry()
+    return store.current()
 
-# ─────────────────────────── EDA Fonksiyonları ─────────────────────────
+# Kayma izleyicisi: taban dosyası (drift_baseline.npz) yoksa None; tahmin yolu etkilenmez
 @st.cache_resource
-def plot_class_distribution(df):
-    plt.style.use('default')
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.set_theme(style="whitegrid")
-    sns.countplot(
-        data=df,
-        x="diagnosis",
-        hue="diagnosis",
-        palette=["#43A047", "#E53935"],
-        ax=ax
-    )
-    legend = ax.get_legend()
-    if legend:
-        legend.remove()
-    ax.set_title("Tümör Sınıf Dağılımı", fontsize=14, pad=20, color="#1B5E20")
-    ax.set_xlabel("Teşhis (M = Malign, B = Benign)", fontsize=12, color="#424242")
-    ax.set_ylabel("Sayı", fontsize=12, color="#424242")
-    plt.tight_layout()
-    return fig
+def get_drift_monitor():
+    drift_monitor = PROFILE.import_module("drift_monitor")
+    return drift_monitor.open_monitor()
 
+# Eşik taraması: aktif sürüm test kümesinde bir kez puanlanır; eşik değişimi yeniden çıkarım gerektirmez
 @st.cache_resource
-def plot_corr_heatmap(df):
-    corr = df.drop(columns=["diagnosis"], errors="ignore").corr()
-    plt.style.use('default')
-    fig, ax = plt.subplots(figsize=(16,12))
-    sns.set_theme(style="whitegrid")
-    sns.heatmap(
-        corr,
-        cmap="RdYlGn",
-        linewidths=0.5,
-        ax=ax,
-        annot=False,
-        center=0
-    )
-    ax.set_title("Özellik Korelasyon Haritası", fontsize=14, pad=20, color="#1B5E20")
-    plt.tight_layout()
-    return fig
+def get_threshold_sweep(version, _bundle):
+    threshold_sweep = PROFILE.import_module("threshold_sweep")
+    sweep = threshold_sweep.ThresholdSweep.from_bundle(_bundle)
+    curve = pd.DataFrame(sweep.curve()).set_index("threshold")
+    return sweep, curve, sweep.best_f1()
+
+def set_eval_threshold(value):
+    st.session_state.eval_threshold = value
 
+# Tanımlıysa manuel form tahminleri başsız tahmin servisine gönderilir (prediction_service.py)
+SERVICE_URL = os.getenv("PREDICTION_SERVICE_URL")
+
+# ─────────────────────────── SağlıkGPT ─────────────────────────────────
+# LangChain/Chroma/Gemini yığını yalnızca ilk soru sorulduğunda import edilir
 @st.cache_resource
-def plot_radius_box(df):
-    plt.style.use('default')
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.set_theme(style="whitegrid")
-    sns.boxplot(
-        data=df,
-        x="diagnosis",
-        y="radius_mean",
-        hue="diagnosis",
-        palette=["#43A047", "#E53935"],
-        ax=ax
-    )
-    legend = ax.get_legend()
-    if legend:
-        legend.remove()
-    ax.set_title("Sınıflara Göre Yarıçap Dağılımı", fontsize=14, pad=20, color="#1B5E20")
-    ax.set_xlabel("Teşhis", fontsize=12, color="#424242")
-    ax.set_ylabel("Ortalama Yarıçap", fontsize=12, color="#424242")
-    plt.tight_layout()
-    return fig
+def rag_state():
+    # Süreç genelinde kurulum durumu; "loaded" yalnızca zincir başarıyla kurulduktan sonra True olur
+    # (st.cache_resource hataları önbelleğe almaz, modülün import edilmiş olması yeterli değildir)
+    return {"loaded": False}
 
 @st.cache_resource
-def plot_radius_hist(df):
-    plt.style.use('default')
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.set_theme(style="whitegrid")
-    sns.histplot(
-        data=df,
-        x="radius_mean",
-        hue="diagnosis",
-        bins=30,
-        kde=True,
-        palette=["#43A047", "#E53935"],
-        ax=ax
-    )
-    ax.set_title("Yarıçap Dağılımı (Histogram + KDE)", fontsize=14, pad=20, color="#1B5E20")
-    ax.set_xlabel("Ortalama Yarıçap", fontsize=12, color="#424242")
-    ax.set_ylabel("Frekans", fontsize=12, color="#424242")
-    plt.tight_layout()
-    return fig
+def get_rag_chain():
+    streamlit_rag = PROFILE.import_module("streamlit_rag")
+    with PROFILE.timed("setup_rag_chain"):
+        chain = streamlit_rag.setup_rag_chain()
+    rag_state()["loaded"] = True
+    return chain
+
+def rag_chain_if_loaded():
+    # Zincir bu süreçte daha önce kurulduysa döner (önbellek istatistikleri için); kurulum tetiklenmez
+    if not rag_state()["loaded"]:
+        return None
+    return get_rag_chain()
 
+# Sohbet geçmişi SQLite'ta oturum anahtarıyla saklanır (chat_history.py); süreçte tek depo
 @st.cache_resource
-def plot_pca(df):
-    features_only = df.drop(columns=["diagnosis"], errors="ignore")
-    scaled = StandardScaler().fit_transform(features_only)
-    pca = PCA(n_components=2)
-    pcs = pca.fit_transform(scaled)
-    plt.style.use('default')
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.set_theme(style="whitegrid")
-    sns.scatterplot(
-        x=pcs[:,0],
-        y=pcs[:,1],
-        hue=df["diagnosis"],
-        palette=["#43A047", "#E53935"],
-        ax=ax
-    )
-    ax.set_title("PCA 2D Projeksiyonu", fontsize=14, pad=20, color="#1B5E20")
-    ax.set_xlabel("PCA 1", fontsize=12, color="#424242")
-    ax.set_ylabel("PCA 2", fontsize=12, color="#424242")
-    plt.tight_layout()
-    return fig
+def get_chat_store():
+    chat_history = PROFILE.import_module("chat_history")
+    store = chat_history.ChatHistoryStore()
+    store.evict_inactive()
+    store.start_eviction()
+    return store
+
+# ─────────────────────────── EDA Grafikleri ─────────────────────────────
+# Grafikler data.csv özetine göre önceden çizilmiş PNG dosyalarından okunur (eda_cache.py)
+@st.cache_data
+def load_eda_figures(digest):
+    return eda_cache.ensure_cache()
+
+# ─────────────────────────── Tahmin Gösterimi ───────────────────────────
+def show_prediction(prob, threshold):
+    pred = int(prob > threshold)
+
+    st.subheader("Malign Olasılığı")
+    st.write(f"Malign (Kötü Huylu) Olasılığı: %{prob*100:.1f}")
+    st.write(f"Eşik: {threshold}")
+
+    # Sonucu renkli kutuda göster
+    if pred:
+        st.markdown("""
+        <div style='background:#ffcdd2; color:#b71c1c; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
+        Tahmin: Malign (Kötü Huylu)
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div style='background:#c8e6c9; color:#1b5e20; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
+        Tahmin: Benign (İyi Huylu)
+        </div>
+        """, unsafe_allow_html=True)
+
+def local_predict(df_in):
+    # (olasılık, eşik) döner; ikisi de aynı bundle'dan gelir
+    batch_scoring = PROFILE.import_module("batch_scoring")
+    bundle = get_bundle()
+    X = df_in[bundle.features]
+    prob = batch_scoring.predict_proba(bundle.model, bundle.scaler, X)
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        monitor.update(X.to_numpy(), prob)
+    return prob[0], bundle.threshold
+
+def drop_batches(keep=None):
+    # Oturumda yalnızca görüntülenen yüklemenin sonuçları tutulur; öncekilerin dizinleri hemen silinir.
+    # Oturum kapanınca kalan TemporaryDirectory de çöp toplayıcıyla birlikte temizlenir
+    for key in [k for k in st.session_state if k.startswith("batch_") and k != keep]:
+        st.session_state.pop(key)["workdir"].cleanup()
+
+# ─────────────────────────── Sohbet Gösterimi ───────────────────────────
+WELCOME_MESSAGE = "👋 Merhaba, ben SağlıkGPT! Yalnızca meme kanseri hakkında güvenilir ve kaynaklara dayalı bilgiler sunabilirim; tıbbi teşhis yerine geçmem ama bu konuda aklınızdaki soruları yanıtlamaya hazırım. Ne sormak istersiniz?"
+
+def chat_message_html(role, content):
+    return f"""
+        <div class="chat-message {role}">
+            <div class="avatar">
+                {'👤' if role == 'user' else '🤖'}
+            </div>
+            <div class="message">
+                {content}
+            </div>
+        </div>
+    """
+
+def chat_history_html(messages):
+    # Tüm pencere tek bir markdown bloğu olarak çizilir (mesaj başına ayrı öğe yerine)
+    return "".join(chat_message_html(m["role"], m["content"]) for m in messages)
+
+def show_older_chat_page():
+    st.session_state.chat_older_pages += 1
 
 # ─────────────────────────── Uygulama Başlığı ───────────────────────────
 st.title("🏥 Meme Kanseri Teşhis Sistemi")
@@ -208,58 +245,73 @@ tab2, tab1, tab3, tab4 = st.tabs([sekme_adi1, sekme_adi2, sekme_adi3, sekme_adi4
 
 with tab2:
     st.header("Teşhis Tahmini")
-    st.write("CSV dosyası yükleyerek veya özellikleri manuel olarak girerek tahmin alabilirsiniz. Bilgi: Yüklediğiniz CSV dosyasının sütun sırası, 'feature_order.csv' dosyasında belirtilen sırayla eşleşmelidir. Ayrıca proje klasöründe, data klasörü altında yer alan 'iyi.csv' (iyi huylu tümör örneği) ve 'kötü.csv' (kötü huylu tümör örneği) dosyalarını örnek veri olarak kullanabilirsiniz.")
-    uploaded = st.file_uploader("CSV Dosyası Yükle (30 özellik)", type=["csv"])
+    st.write("CSV, Parquet veya Arrow/Feather dosyası yükleyerek ya da özellikleri manuel olarak girerek tahmin alabilirsiniz. Bilgi: Sütunlar sıraya göre değil, 'feature_order.csv' dosyasındaki adlara göre eşleştirilir; fazladan sütunlar (ör. id, diagnosis) yok sayılır. Eksik, sayısal olmayan veya negatif değer içeren satırlar puanlanmaz ve hata raporunda listelenir. Ayrıca proje klasöründe, data klasörü altında yer alan 'iyi.csv' (iyi huylu tümör örneği) ve 'kötü.csv' (kötü huylu tümör örneği) dosyalarını örnek veri olarak kullanabilirsiniz.")
+    ingestion = PROFILE.import_module("ingestion")
+    uploaded = st.file_uploader("Dosya Yükle (30 özellik, çok satırlı dosyalar toplu olarak puanlanır)", type=ingestion.UPLOAD_TYPES)
     if uploaded:
-        try:
-            df_in = pd.read_csv(uploaded)
-            
-            # Sütun kontrolü
-            if list(df_in.columns) != FEATURES:
-                st.error("Hata: Sütunlar beklenen sırayla eşleşmiyor. Lütfen feature_order.csv dosyasını kontrol edin.")
-                st.stop()
-            
-            # Eksik veri kontrolü
-            if df_in.isnull().any().any():
-                st.error("Hata: Veri setinde eksik değerler var. Lütfen tüm değerlerin dolu olduğundan emin olun.")
+        # Streamlit her etkileşimde betiği baştan çalıştırır; aynı dosya için
+        # tüm satırları yeniden puanlamamak adına sonuç oturumda saklanır
+        batch_key = f"batch_{uploaded.file_id}"
+        drop_batches(keep=batch_key)
+        if batch_key not in st.session_state:
+            workdir = tempfile.TemporaryDirectory(prefix="toplu_puanlama_")
+            try:
+                status = st.empty()
+                batch_scoring = PROFILE.import_module("batch_scoring")
+                bundle = get_bundle()
+                with metrics.trace("batch_upload", file=uploaded.name):
+                    result = batch_scoring.score_file(
+                        uploaded, bundle.model, bundle.scaler, bundle.threshold, bundle.features,
+                        name=uploaded.name, out_dir=workdir.name, monitor=get_drift_monitor(),
+                        on_progress=lambda n, sec: status.write(f"{n:,} satır işlendi ({n / max(sec, 1e-9):,.0f} satır/sn)...")
+                    )
+                # Sonuçlar, sonradan sürüm değişse de puanlayan sürümün eşiğiyle gösterilir
+                st.session_state[batch_key] = {**result, "threshold": bundle.threshold, "version": bundle.version,
+                                               "workdir": workdir}
+                status.empty()
+            except ValueError as e:
+                workdir.cleanup()
+                st.error(str(e))
                 st.stop()
-            
-            # Veri tipi kontrolü
-            if not all(df_in.dtypes == 'float64'):
-                st.error("Hata: Tüm değerler sayısal olmalıdır. Lütfen veri setinizi kontrol edin.")
-                st.stop()
-            
-            # Değer aralığı kontrolü
-            if (df_in < 0).any().any():
-                st.error("Hata: Negatif değerler bulunamaz. Lütfen veri setinizi kontrol edin.")
+            except Exception as e:
+                workdir.cleanup()
+                st.error(f"Veri yükleme hatası: {str(e)}")
                 st.stop()
-            
-            X = scaler.transform(df_in[FEATURES])
-            prob = model.predict(X)[0][0]
-            pred = int(prob > THRESHOLD)
-            
-            st.subheader("Malign Olasılığı")
-            st.write(f"Malign (Kötü Huylu) Olasılığı: %{prob*100:.1f}")
-            st.write(f"Eşik: {THRESHOLD}")
-            
-            # Sonucu renkli kutuda göster
-            if pred:
-                st.markdown("""
-                <div style='background:#ffcdd2; color:#b71c1c; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
-                Tahmin: Malign (Kötü Huylu)
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div style='background:#c8e6c9; color:#1b5e20; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
-                Tahmin: Benign (İyi Huylu)
-                </div>
-                """, unsafe_allow_html=True)
-                
-        except Exception as e:
-            st.error(f"Veri yükleme hatası: {str(e)}")
-            st.stop()
+        summary = st.session_state[batch_key]
+
+        if summary["invalid_rows"]:
+            st.warning(f"{summary['invalid_rows']:,} satır hatalı değer içerdiği için puanlanmadı.")
+            with st.expander("Hata Raporu", expanded=not summary["scored"]):
+                st.dataframe(summary["errors"], use_container_width=True)
+                with open(summary["errors_path"], "rb") as f:
+                    st.download_button(
+                        "📥 Hata Raporunu İndir (CSV)",
+                        data=f,
+                        file_name="hata_raporu.csv",
+                        mime="text/csv"
+                    )
+
+        if summary["rows"] == 1 and summary["scored"] == 1:
+            show_prediction(summary["preview"]["malign_olasiligi"].iloc[0], summary["threshold"])
+        elif summary["scored"]:
+            st.subheader("Toplu Tahmin Sonuçları")
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Puanlanan Satır", f"{summary['scored']:,}")
+            c2.metric("Malign Tahmin", f"{summary['malign']:,}")
+            c3.metric("Hız (satır/sn)", f"{summary['rows_per_sec']:,.0f}")
+            st.write(f"Eşik: {summary['threshold']} (model sürümü: {summary['version']})")
+            st.dataframe(summary["preview"], use_container_width=True)
+            if summary["scored"] > len(summary["preview"]):
+                st.caption(f"İlk {len(summary['preview']):,} satır gösteriliyor. Tüm sonuçlar için dosyayı indirin.")
+            with open(summary["out_path"], "rb") as f:
+                st.download_button(
+                    "📥 Sonuçları İndir (CSV)",
+                    data=f,
+                    file_name="tahmin_sonuclari.csv",
+                    mime="text/csv"
+                )
     else:
+        drop_batches()
         st.subheader("Manuel Giriş")
         with st.form("prediction_form"):
             cols = st.columns(3)
@@ -288,27 +340,22 @@ with tab2:
                         st.stop()
                     
                     df_manual = pd.DataFrame([values], columns=FEATURES)
-                    X = scaler.transform(df_manual[FEATURES])
-                    prob = model.predict(X)[0][0]
-                    pred = int(prob > THRESHOLD)
-                    
-                    st.subheader("Malign Olasılığı")
-                    st.write(f"Malign (Kötü Huylu) Olasılığı: %{prob*100:.1f}")
-                    st.write(f"Eşik: {THRESHOLD}")
-                    
-                    if pred:
-                        st.markdown("""
-                        <div style='background:#ffcdd2; color:#b71c1c; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
-                        Tahmin: Malign (Kötü Huylu)
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown("""
-                        <div style='background:#c8e6c9; color:#1b5e20; padding:1rem; border-radius:8px; font-weight:bold; margin-bottom:1rem;'>
-                        Tahmin: Benign (İyi Huylu)
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
+                    with metrics.trace("manual_predict", service=bool(SERVICE_URL)):
+                        if SERVICE_URL:
+                            # Tahmin servisi tanımlıysa istek servise gönderilir (mikro-gruplama orada yapılır)
+                            prediction_service = PROFILE.import_module("prediction_service")
+                            try:
+                                with metrics.span("service_call"):
+                                    response = prediction_service.request_prediction(SERVICE_URL, dict(zip(FEATURES, values)))
+                                # Servis, olasılığı üreten sürümün eşiğini de döndürür
+                                prob, threshold = response["probability"], response["threshold"]
+                            except Exception as e:
+                                st.warning(f"Tahmin servisine ulaşılamadı, yerel model kullanılıyor: {str(e)}")
+                                prob, threshold = local_predict(df_manual)
+                        else:
+                            prob, threshold = local_predict(df_manual)
+                    show_prediction(prob, threshold)
+
                 except Exception as e:
                     st.error(f"Tahmin hatası: {str(e)}")
                     st.stop()
@@ -359,33 +406,38 @@ with tab1:
         </style>
     """, unsafe_allow_html=True)
     
-    # Zinciri oluştur
-    rag_chain = setup_rag_chain()
-
-    # Chat geçmişini saklamak için
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-
-    # Hoş geldin mesajı
-    if not st.session_state.messages:
-        st.session_state.messages.append({
-            "role": "bot",
-            "content": "👋 Merhaba, ben SağlıkGPT! Yalnızca meme kanseri hakkında güvenilir ve kaynaklara dayalı bilgiler sunabilirim; tıbbi teşhis yerine geçmem ama bu konuda aklınızdaki soruları yanıtlamaya hazırım. Ne sormak istersiniz?"
-        })
-
-    # Mesajları göster
-    for message in st.session_state.messages:
-        with st.container():
-            st.markdown(f"""
-                <div class="chat-message {message['role']}">
-                    <div class="avatar">
-                        {'👤' if message['role'] == 'user' else '🤖'}
-                    </div>
-                    <div class="message">
-                        {message['content']}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+    # Sohbet geçmişi: oturum kimliği URL'de (?sohbet=...) tutulur, sayfa yenilense de geçmiş geri gelir.
+    # Bellekte yalnızca son WINDOW_SIZE mesaj durur; eski mesajlar istek üzerine SQLite'tan okunur.
+    chat_history = PROFILE.import_module("chat_history")
+    chat_store = get_chat_store()
+    if "chat_session" not in st.session_state:
+        session_id = st.query_params.get("sohbet") or chat_history.new_session_id()
+        st.query_params["sohbet"] = session_id
+        chat_store.touch(session_id)
+        st.session_state.chat_session = session_id
+        st.session_state.chat_window = deque(chat_store.recent(session_id), maxlen=chat_history.WINDOW_SIZE)
+        st.session_state.chat_older_pages = 0
+    session_id = st.session_state.chat_session
+    chat_window = st.session_state.chat_window
+
+    with metrics.span("chat_render"):
+        oldest_id = chat_window[0]["id"] if chat_window else None
+        older = []
+        if oldest_id is not None and st.session_state.chat_older_pages:
+            older = chat_store.page(session_id, oldest_id, chat_history.PAGE_SIZE * st.session_state.chat_older_pages)
+        first_id = older[0]["id"] if older else oldest_id
+        if first_id is not None and chat_store.has_before(session_id, first_id):
+            st.button("⬆️ Daha eski mesajları göster", on_click=show_older_chat_page)
+        else:
+            # Hoş geldin mesajı saklanmaz; geçmişin başı görünürken gösterilir
+            st.markdown(chat_message_html("bot", WELCOME_MESSAGE), unsafe_allow_html=True)
+        if older:
+            with st.expander(f"🕘 Önceki mesajlar ({len(older)})", expanded=True):
+                st.markdown(chat_history_html(older), unsafe_allow_html=True)
+        st.markdown(chat_history_html(chat_window), unsafe_allow_html=True)
+
+    # Yeni soru ve akış halindeki yanıt formun üstünde, geçmişin hemen altında gösterilir
+    live_area = st.container()
 
     # Kullanıcı girişi ve gönderme
     with st.form("chat_form", clear_on_submit=True):
@@ -393,15 +445,37 @@ with tab1:
         submit_button = st.form_submit_button("Gönder")
     if submit_button and user_question.strip():
         # Kullanıcı mesajını ekle
-        st.session_state.messages.append({"role": "user", "content": user_question})
-        # Bot yanıtını al
-        with st.spinner("Yanıt oluşturuluyor..."):
-            result = rag_chain.invoke({"input": user_question.strip()})
-            bot_response = result["answer"]
-        # Bot yanıtını ekle
-        st.session_state.messages.append({"role": "bot", "content": bot_response})
-        # Sayfayı yenile
-        st.rerun()
+        chat_window.append(chat_store.append(session_id, "user", user_question))
+        with live_area:
+            st.markdown(chat_message_html("user", user_question), unsafe_allow_html=True)
+            bubble = st.empty()
+            bubble.markdown(chat_message_html("bot", "🔎 Kaynaklar aranıyor..."), unsafe_allow_html=True)
+            # Bot yanıtını token token balona yaz
+            bot_response = ""
+            # Zincir ilk soruda oluşturulur
+            with metrics.trace("chat"):
+                streamlit_rag = PROFILE.import_module("streamlit_rag")
+                try:
+                    rag_chain = get_rag_chain()
+                except streamlit_rag.IndexMismatchError as e:
+                    # İndeks başka bir embedding modeliyle oluşturulmuşsa zincir kurulmaz
+                    bubble.markdown(chat_message_html("bot", html.escape(str(e))), unsafe_allow_html=True)
+                    st.stop()
+                try:
+                    for token in streamlit_rag.stream_answer(
+                        rag_chain,
+                        user_question.strip(),
+                        on_context=lambda _: bubble.markdown(chat_message_html("bot", "✍️ Yanıt oluşturuluyor..."), unsafe_allow_html=True)
+                    ):
+                        bot_response += token
+                        bubble.markdown(chat_message_html("bot", bot_response + "▌"), unsafe_allow_html=True)
+                except TimeoutError as e:
+                    # Eşzamanlılık sırası dolu veya LLM yanıtı zaman aşımına uğradı
+                    bot_response = str(e)
+            bubble.markdown(chat_message_html("bot", bot_response), unsafe_allow_html=True)
+        # Bot yanıtını ekle; yeni tur canlı alanda zaten çizili olduğundan sayfa yenilenmez,
+        # sonraki çalıştırmada pencereden çizilir
+        chat_window.append(chat_store.append(session_id, "bot", bot_response))
 
     # Örnek Sorular kutusu (formun hemen altında)
     st.markdown("""
@@ -421,32 +495,89 @@ with tab1:
         </div>
     """, unsafe_allow_html=True)
 
+    # Anlamsal yanıt önbelleği istatistikleri (tüm oturumlar için ortak)
+    rag_chain = rag_chain_if_loaded()
+    if rag_chain is not None:
+        with st.expander("⚡ Yanıt Önbelleği"):
+            cache_stats = rag_chain.cache.metrics()
+            c1, c2, c3 = st.columns(3)
+            c1.metric("İsabet Oranı", f"%{cache_stats['hit_rate']*100:.1f}")
+            c2.metric("İsabet / Iskalama", f"{cache_stats['hits']} / {cache_stats['misses']}")
+            c3.metric("Kazanılan Süre", f"{cache_stats['saved_seconds']:.1f} sn")
+            executor_stats = rag_chain.executor.stats() if rag_chain.executor is not None else None
+            if executor_stats is not None:
+                c1, c2, c3 = st.columns(3)
+                c1.metric("LLM Çağrısı", executor_stats["upstream_calls"])
+                c2.metric("Birleştirilen İstek", executor_stats["coalesced"])
+                c3.metric("Zaman Aşımı", executor_stats["timeouts"])
+
 with tab3:
     st.header("Veri Analizi ve Görselleştirme")
+    eda_figures = load_eda_figures(eda_cache.data_hash())
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Sınıf Dağılımı")
-        st.pyplot(plot_class_distribution(df))
+        st.image(eda_figures["class_distribution"])
         st.caption("Veri setindeki benign ve malign tümör sayılarının dağılımı.")
     with col2:
         st.subheader("Yarıçap Dağılımı")
-        st.pyplot(plot_radius_box(df))
+        st.image(eda_figures["radius_box"])
         st.caption("Sınıflara göre ortalama yarıçap değerlerinin kutu grafiği.")
     st.subheader("Korelasyon Haritası")
-    st.pyplot(plot_corr_heatmap(df))
+    st.image(eda_figures["corr_heatmap"])
     st.caption("Özellikler arasındaki korelasyonları gösteren ısı haritası.")
     col3, col4 = st.columns(2)
     with col3:
         st.subheader("Yarıçap Histogramı")
-        st.pyplot(plot_radius_hist(df))
+        st.image(eda_figures["radius_hist"])
         st.caption("Tümör yarıçapı dağılımı ve sınıflara göre yoğunluk.")
     with col4:
         st.subheader("PCA Analizi")
-        st.pyplot(plot_pca(df))
+        st.image(eda_figures["pca"])
         st.caption("Veri setinin 2 boyutlu PCA ile görselleştirilmiş hali.")
 
 with tab4:
     st.header("Model Değerlendirmesi")
+    # Model ve test kümesi yalnızca canlı analiz açıldığında yüklenir
+    if st.toggle("🎚️ Canlı eşik analizi (test kümesi)", key="eval_live"):
+        bundle = get_bundle()
+        sweep, curve, (best_threshold, best_f1) = get_threshold_sweep(bundle.version, bundle)
+        # Aktif sürüm değiştiğinde kaydırıcı yeni sürümün eşiğinden başlar
+        if st.session_state.get("eval_version") != bundle.version:
+            st.session_state.eval_version = bundle.version
+            st.session_state.eval_threshold = float(bundle.threshold)
+        st.slider("Eşik (olasılık > eşik ise Malign)", 0.0, 1.0, step=0.001, format="%.3f", key="eval_threshold")
+        st.button(f"En iyi F1 eşiğini kullan ({best_threshold:.3f}, F1={best_f1:.3f})",
+                  on_click=set_eval_threshold, args=(best_threshold,))
+        threshold = st.session_state.eval_threshold
+        current = sweep.metrics(bundle.threshold)
+        chosen = sweep.metrics(threshold)
+        c1, c2, c3, c4 = st.columns(4)
+        for col, key, label in ((c1, "precision", "Precision"), (c2, "recall", "Recall"),
+                                (c3, "f1", "F1"), (c4, "accuracy", "Accuracy")):
+            col.metric(label, f"{chosen[key]:.3f}", f"{chosen[key] - current[key]:+.3f}")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.dataframe(pd.DataFrame(
+                [[chosen["tn"], chosen["fp"]], [chosen["fn"], chosen["tp"]]],
+                index=["Gerçek: Benign", "Gerçek: Malign"],
+                columns=["Tahmin: Benign", "Tahmin: Malign"],
+            ))
+            st.caption(f"{bundle.version} sürümü, {sweep.n} satırlık test kümesi. Değişimler mevcut eşiğe ({bundle.threshold}) göre.")
+        with col2:
+            st.line_chart(curve)
+        with st.form("save_threshold"):
+            version_name = st.text_input("Yeni sürüm adı", value=f"{bundle.version}-esik-{threshold:.3f}")
+            note = st.text_input("Not (isteğe bağlı)")
+            activate_new = st.checkbox("Kaydettikten sonra etkinleştir")
+            if st.form_submit_button("💾 Eşiği yeni sürüm olarak kaydet"):
+                try:
+                    threshold_sweep = PROFILE.import_module("threshold_sweep")
+                    threshold_sweep.save_threshold_version(version_name, threshold, bundle.version, note, activate_new)
+                    st.success(f"{version_name} kaydedildi" + (" ve etkinleştirildi." if activate_new else "."))
+                except (ValueError, KeyError, OSError) as e:
+                    st.error(str(e))
+        st.divider()
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Confusion Matrix")
@@ -473,6 +604,44 @@ with tab4:
         st.image("results/cat.png")
         st.caption("Modelin değerlendirmesi")
 
+# ─────────────────────────── Model Sürümü ───────────────────────────────
+with st.sidebar.expander("🗂️ Model Sürümü"):
+    registry = model_registry.load_registry()
+    st.write(f"Aktif sürüm: **{registry['active']}**")
+    versions = list(registry["versions"])
+    chosen = st.selectbox("Sürüm", versions, index=versions.index(registry["active"]))
+    if st.button("Etkinleştir", disabled=chosen == registry["active"]):
+        try:
+            # Yeni sürüm bir sonraki tahminde arka planda yüklenip ısıtılır ve sessizce devreye girer
+            model_registry.activate(chosen)
+            st.success(f"{chosen} etkinleştirildi.")
+        except (ValueError, KeyError, OSError) as e:
+            st.error(str(e))
+
+# ─────────────────────────── Veri Kayması ───────────────────────────────
+with st.sidebar.expander("📡 Veri Kayması"):
+    monitor = get_drift_monitor()
+    if monitor is None:
+        st.info("Taban dosyası bulunamadı: python drift_monitor.py baseline")
+    else:
+        drift = monitor.status()
+        st.write(f"İzlenen satır: {drift['rows']:,} · Tamamlanan pencere: {drift['windows']}")
+        st.caption(f"Taban modeli: {drift['baseline_model']} · Pencere: {monitor.window_rows:,} satır")
+        if drift["active_alerts"]:
+            st.warning("Etkin uyarılar: " + ", ".join(drift["active_alerts"]))
+        elif drift["windows"]:
+            st.success("Son pencerede eşik aşımı yok.")
+        if drift["recent_alerts"]:
+            st.dataframe(pd.DataFrame(drift["recent_alerts"]), use_container_width=True)
+
+# ─────────────────────────── Açılış Profili ─────────────────────────────
+with st.sidebar.expander("⏱️ Açılış Profili"):
+    startup = PROFILE.report()
+    if startup["first_render_sec"] is not None:
+        st.write(f"İlk çizim: {startup['first_render_sec']:.2f} sn")
+    st.dataframe(pd.DataFrame(startup["imports"] + startup["loads"]), use_container_width=True)
+    st.download_button("📥 Profili İndir (JSON)", data=PROFILE.to_json(), file_name="startup_profile.json", mime="application/json")
+
 st.markdown("""
     <hr style='margin-top:2rem;margin-bottom:0.5rem;'>
     <div style='text-align: center; color: #b71c1c; font-size: 1.1rem; margin-bottom: 1rem;'>
@@ -482,3 +651,7 @@ st.markdown("""
         Mahmut Kerem Erden - k.erden03@gmail.com
     </div>
 """, unsafe_allow_html=True)
+
+PROFILE.mark_first_render()
+# Betiğin baştan sona bir çalıştırılması (her etkileşimde Streamlit yeniden çalıştırır)
+metrics.observe("streamlit_run", time.perf_counter() - _RUN_START)
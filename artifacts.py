@@ -0,0 +1,79 @@
+# Model artefaktlarını Streamlit'ten bağımsız olarak yükler.
+# app.py (st.cache_resource ile), tahmin servisi ve komut satırı araçları aynı
+# dosyaları aynı şekilde okusun diye yükleme mantığı burada tutulur.
+#
+# MLP_ENGINE ortam değişkeni çıkarım motorunu seçer:
+#   auto  (varsayılan) güncel bir breast_mlp.npz varsa NumPy motoru, yoksa Keras
+#   numpy  her zaman NumPy motoru (numpy_mlp.py export ile üretilmiş .npz gerekir)
+#   keras  her zaman TensorFlow/Keras
+#
+# MLP_CASCADE=1 iken MLP önüne ucuz bir doğrusal model konur; yalnızca eşiğe yakın
+# satırlar MLP'ye gider (cascade.py, model dosyasının yanında cascade_linear.npz gerekir).
+# Cascade dosyası bu MLP/scaler için üretilmemişse veya eşik belirsizlik bandının
+# dışındaysa uyarı loglanır ve yalnızca MLP kullanılır.
+
+import os
+import json
+import logging
+import joblib
+import pandas as pd
+
+import cascade
+import metrics
+import numpy_mlp
+
+MODEL_PATH = "breast_mlp.h5"
+SCALER_PATH = "scaler.pkl"
+THRESHOLD_PATH = "threshold.json"
+FEATURES_PATH = "data/feature_order.csv"
+
+logger = logging.getLogger("artifacts")
+
+def load_features(features_path=FEATURES_PATH):
+    return pd.read_csv(features_path, header=None)[0].tolist()
+
+def load_threshold(threshold_path=THRESHOLD_PATH):
+    with open(threshold_path) as f:
+        return json.load(f)["threshold"]
+
+def _load_cascade(mlp, mlp_scaler, model_path, scaler_path, threshold, features):
+    # Kullanılamayan cascade için None döner; çağıran MLP ile devam eder
+    path = cascade.cascade_path(model_path)
+    if not cascade.is_current(path, model_path, scaler_path):
+        logger.warning("Cascade kullanılmıyor: %s yok veya %s / %s için üretilmemiş", path, model_path, scaler_path)
+        return None
+    model = cascade.load_cascade(mlp, mlp_scaler, path, features=features)
+    if threshold is not None and not model.low <= threshold <= model.high:
+        logger.warning("Cascade kullanılmıyor: eşik (%s) belirsizlik bandının [%s, %s] dışında",
+                       threshold, model.low, model.high)
+        return None
+    return model
+
+def load_model(model_path=MODEL_PATH, scaler_path=SCALER_PATH, engine=None, use_cascade=None,
+               threshold=None, features=None):
+    if use_cascade is None:
+        use_cascade = os.getenv("MLP_CASCADE", "0") == "1"
+    if use_cascade:
+        # Doğrusal model ham özellik aldığından cascade de scaler'ı kendi içinde uygular
+        mlp, mlp_scaler = load_model(model_path, scaler_path, engine, use_cascade=False)
+        model = _load_cascade(mlp, mlp_scaler, model_path, scaler_path, threshold, features or load_features())
+        if model is None:
+            return mlp, mlp_scaler
+        return model, numpy_mlp.IdentityScaler()
+
+    engine = engine or os.getenv("MLP_ENGINE", "auto")
+    npz_path = os.path.splitext(model_path)[0] + ".npz"
+
+    if engine == "numpy" or (engine == "auto" and numpy_mlp.is_current(npz_path, model_path, scaler_path)):
+        # Scaler ağırlıklara gömülü olduğundan transform adımı geçiş nesnesine dönüşür
+        return numpy_mlp.NumpyMLP.load(npz_path), numpy_mlp.IdentityScaler()
+
+    from tensorflow.keras.models import load_model as load_keras_model
+    return load_keras_model(model_path, compile=False), joblib.load(scaler_path)
+
+def load_artifacts(model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+                   threshold_path=THRESHOLD_PATH, features_path=FEATURES_PATH, engine=None, use_cascade=None):
+    threshold, features = load_threshold(threshold_path), load_features(features_path)
+    with metrics.span("artifact_load"):
+        model, scaler = load_model(model_path, scaler_path, engine, use_cascade, threshold, features)
+    return model, scaler, threshold, features
@@ -0,0 +1,112 @@
+# Yüklenen dosyaları sabit boyutlu parçalar (chunk) halinde okuyarak toplu tahmin üretir.
+# Dosyanın tamamı belleğe alınmaz: her parça için scaler.transform + model ileri
+# geçişi tek seferde çalıştırılır, sonuçlar diske eklenerek yazılır. Böylece dosya ne
+# kadar büyük olursa olsun bellek kullanımı parça boyutuyla sınırlı kalır.
+#
+# Okuma ve doğrulama ingestion.py üzerinden yapılır (CSV / Parquet / Arrow IPC, ada
+# göre sütun eşleştirme). Hatalı satırlar puanlanmaz, ayrı bir hata raporuna yazılır.
+# monitor verilirse puanlanan her parça kayma izleyicisine (drift_monitor.DriftMonitor) işlenir.
+#
+# Çıktı dosyalarının ömrü çağırana aittir: score_file ya açık yollar ya da çağıranın
+# sildiği bir dizin (ör. tempfile.TemporaryDirectory) alır, kendisi geçici dosya bırakmaz.
+
+import os
+import time
+import numpy as np
+import pandas as pd
+
+import ingestion
+import metrics
+
+CHUNK_SIZE = ingestion.BATCH_SIZE
+PREVIEW_ROWS = 1_000
+OUTPUT_NAME = "tahmin_sonuclari.csv"
+ERRORS_NAME = "hata_raporu.csv"
+
+# ─────────────────────────── Tahmin ─────────────────────────────────────
+def predict_proba(model, scaler, X):
+    # Tüm parça tek bir ileri geçişte hesaplanır (predict() yerine predict_on_batch:
+    # Keras'ın veri hattı ve ilerleme çubuğu maliyeti olmadan)
+    with metrics.span("scaling"):
+        X_scaled = scaler.transform(X)
+    with metrics.span("inference"):
+        prob = np.asarray(model.predict_on_batch(X_scaled)).reshape(-1)
+    metrics.count_rows("inference", len(prob))
+    return prob
+
+def score_matrix(model, scaler, threshold, features, X, rows, monitor=None):
+    prob = predict_proba(model, scaler, pd.DataFrame(X, columns=features))
+    if monitor is not None:
+        # Girdi ve çıktı dağılımı kayma izleyicisine işlenir (drift_monitor.py)
+        monitor.update(X, prob)
+    pred = (prob > threshold).astype(int)
+    return pd.DataFrame({
+        "satir": rows,
+        "malign_olasiligi": prob,
+        "tahmin": pred,
+        "sonuc": np.where(pred == 1, "Malign", "Benign"),
+    })
+
+def _append_csv(df, path, first):
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+def score_file(source, model, scaler, threshold, features, name="upload.csv", chunk_size=CHUNK_SIZE,
+               out_dir=None, out_path=None, errors_path=None, on_progress=None, monitor=None):
+    # Sonuçlar parça parça out_path'e, hatalı hücreler errors_path'e yazılır (verilmezlerse
+    # out_dir altına); dosyalar yalnızca yazılacak satır varsa oluşur.
+    # Bellekte yalnızca ilk PREVIEW_ROWS satır tutulur
+    if (out_path is None or errors_path is None) and out_dir is None:
+        raise TypeError("score_file: out_dir ya da out_path ve errors_path verilmelidir")
+    fmt = ingestion.detect_format(name)
+    out_path = out_path or os.path.join(out_dir, OUTPUT_NAME)
+    errors_path = errors_path or os.path.join(out_dir, ERRORS_NAME)
+
+    rows = 0
+    scored = 0
+    invalid_rows = 0
+    malign = 0
+    preview, preview_rows = [], 0
+    error_preview, error_preview_rows = [], 0
+    start = time.perf_counter()
+
+    for offset, X, non_numeric in ingestion.iter_feature_batches(source, features, fmt, chunk_size):
+        with metrics.span("validation"):
+            valid, bad = ingestion.validate(X, non_numeric)
+        if bad is not None:
+            report = ingestion.error_report(offset, bad, features)
+            _append_csv(report, errors_path, invalid_rows == 0)
+            invalid_rows += len(bad[0])
+            if error_preview_rows < PREVIEW_ROWS:
+                error_preview.append(report.head(PREVIEW_ROWS - error_preview_rows))
+                error_preview_rows += len(error_preview[-1])
+            X = X[valid]
+
+        if len(X):
+            result = score_matrix(model, scaler, threshold, features, X, offset + np.flatnonzero(valid), monitor)
+            _append_csv(result, out_path, scored == 0)
+            scored += len(result)
+            malign += int(result["tahmin"].sum())
+            if preview_rows < PREVIEW_ROWS:
+                preview.append(result.head(PREVIEW_ROWS - preview_rows))
+                preview_rows += len(preview[-1])
+
+        rows += len(valid)
+        if on_progress is not None:
+            on_progress(rows, time.perf_counter() - start)
+
+    if rows == 0:
+        raise ValueError("Hata: Yüklenen dosyada veri satırı bulunamadı.")
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "scored": scored,
+        "invalid_rows": invalid_rows,
+        "malign": malign,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+        "out_path": out_path if scored else None,
+        "errors_path": errors_path if invalid_rows else None,
+        "preview": pd.concat(preview, ignore_index=True) if preview else None,
+        "errors": pd.concat(error_preview, ignore_index=True) if error_preview else None,
+    }
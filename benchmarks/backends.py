@@ -0,0 +1,220 @@
+# Model arka uçları için çıkarım performansı ve regresyon takımı.
+# Proje kök dizininden: python -m benchmarks.backends
+#
+# Notebook'taki modeller (RF, LR, SVM, KNN, NB, XGBoost, CatBoost) aynı bölme ve
+# StandardScaler pipeline'ı ile yeniden eğitilir; MLP ise mevcut artefaktlardan
+# (NumPy ve Keras motorları) yüklenir. Her arka uç farklı grup boyutlarında
+# (1, 32, 1k, 100k sentetik satır) puanlanır ve gecikme yüzdelikleri, verim,
+# bellek tepe değeri ile test kümesi accuracy/F1 değerleri makine tarafından
+# okunabilir bir rapora yazılır. Gecikme bütçesi (benchmarks/latency_budgets.json)
+# veya önceki bir rapora göre izin verilen yavaşlama aşılırsa çıkış kodu 1 olur.
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+
+DATA_PATH = "data/data.csv"
+REPORT_PATH = "results/benchmark_report.json"
+BUDGETS_PATH = "benchmarks/latency_budgets.json"
+BATCH_SIZES = [1, 32, 1_000, 100_000]
+# Her grup boyutu için en az bu kadar tekrar ya da toplamda bu kadar süre ölçülür
+MIN_REPEATS = 5
+MIN_SECONDS = 1.0
+MAX_REPEATS = 200
+SEED = 42
+
+# ─────────────────────────── Veri ───────────────────────────────────────
+def load_dataset(features):
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(DATA_PATH).drop(columns=["id", "Unnamed: 32"], errors="ignore")
+    y = df["diagnosis"].map({"M": 1, "B": 0})
+    X = df[features]
+    # Notebook ile aynı bölme
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+def synthetic_rows(X, n, seed=SEED):
+    # Gerçek satırlardan yerine koyarak örnekleyip özellik std'sinin %5'i kadar gürültü eklenir
+    rng = np.random.default_rng(seed)
+    base = X.to_numpy()[rng.integers(0, len(X), size=n)]
+    noise = rng.normal(0.0, 0.05, size=base.shape) * X.to_numpy().std(axis=0)
+    return pd.DataFrame(np.clip(base + noise, 0.0, None), columns=X.columns)
+
+# ─────────────────────────── Arka Uçlar ─────────────────────────────────
+def sklearn_backends():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+
+    backends = {
+        "random_forest": lambda: RandomForestClassifier(random_state=42),
+        "logistic_regression": lambda: LogisticRegression(max_iter=1000, random_state=42),
+        "svm_linear": lambda: SVC(kernel="linear", random_state=42),
+        "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+        "naive_bayes": lambda: GaussianNB(),
+    }
+    try:
+        from xgboost import XGBClassifier
+        backends["xgboost"] = lambda: XGBClassifier(eval_metric="logloss", random_state=42)
+    except ImportError:
+        backends["xgboost"] = None
+    try:
+        from catboost import CatBoostClassifier
+        backends["catboost"] = lambda: CatBoostClassifier(verbose=0, random_state=42, allow_writing_files=False)
+    except ImportError:
+        backends["catboost"] = None
+    return backends
+
+def build_backends(names, X_train, y_train):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    predictors, skipped = {}, {}
+    for name, factory in sklearn_backends().items():
+        if names and name not in names:
+            continue
+        if factory is None:
+            skipped[name] = "paket kurulu değil"
+            continue
+        pipeline = Pipeline([("scaler", StandardScaler()), ("model", factory())])
+        pipeline.fit(X_train, y_train)
+        predictors[name] = pipeline.predict
+
+    threshold = artifacts.load_threshold()
+    for engine in ("numpy", "keras"):
+        name = f"mlp_{engine}"
+        if names and name not in names:
+            continue
+        try:
+            model, scaler = artifacts.load_model(engine=engine)
+        except (ImportError, OSError, KeyError) as e:
+            skipped[name] = str(e)
+            continue
+        predictors[name] = (lambda m, s: lambda X: (np.asarray(m.predict_on_batch(s.transform(X))).reshape(-1) > threshold).astype(int))(model, scaler)
+    return predictors, skipped
+
+# ─────────────────────────── Ölçüm ──────────────────────────────────────
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(p * len(sorted_values)) - 1)]
+
+def measure(predict, X):
+    predict(X)  # ısınma
+    times = []
+    start = time.perf_counter()
+    while len(times) < MAX_REPEATS and (len(times) < MIN_REPEATS or time.perf_counter() - start < MIN_SECONDS):
+        t = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - t)
+    times.sort()
+
+    # Python/NumPy tahsislerinin tepe değeri (TensorFlow'un C++ tahsisleri bu ölçüme girmez)
+    tracemalloc.start()
+    predict(X)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentile(times, 0.50)
+    return {
+        "repeats": len(times),
+        "latency_ms_p50": p50 * 1000,
+        "latency_ms_p95": percentile(times, 0.95) * 1000,
+        "latency_ms_p99": percentile(times, 0.99) * 1000,
+        "rows_per_sec": len(X) / p50 if p50 > 0 else None,
+        "peak_alloc_mb": peak / (1 << 20),
+    }
+
+def run(names=None, batch_sizes=BATCH_SIZES):
+    from sklearn.metrics import accuracy_score, f1_score
+
+    features = artifacts.load_features()
+    X_train, X_test, y_train, y_test = load_dataset(features)
+    predictors, skipped = build_backends(names, X_train, y_train)
+    batches = {size: synthetic_rows(X_train, size) for size in batch_sizes}
+
+    results = {}
+    for name, predict in predictors.items():
+        y_pred = predict(X_test)
+        results[name] = {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "f1": f1_score(y_test, y_pred),
+            "batches": {str(size): measure(predict, X) for size, X in batches.items()},
+        }
+        print(f"{name}: tamamlandı", file=sys.stderr)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "batch_sizes": batch_sizes,
+        "backends": results,
+        "skipped": skipped,
+    }
+
+# ─────────────────────────── Regresyon Kontrolü ─────────────────────────
+def check_budgets(report, budgets):
+    # Bütçe dosyası: {"default": {"<grup>": p99_ms}, "<arka uç>": {"<grup>": p99_ms}}
+    violations = []
+    for name, result in report["backends"].items():
+        limits = {**budgets.get("default", {}), **budgets.get(name, {})}
+        for size, stats in result["batches"].items():
+            limit = limits.get(size)
+            if limit is not None and stats["latency_ms_p99"] > limit:
+                violations.append(f"{name} [{size}] p99 {stats['latency_ms_p99']:.2f} ms > bütçe {limit} ms")
+    return violations
+
+def check_baseline(report, baseline, max_regression):
+    violations = []
+    for name, result in report["backends"].items():
+        previous = baseline.get("backends", {}).get(name)
+        if previous is None:
+            continue
+        for size, stats in result["batches"].items():
+            old = previous["batches"].get(size)
+            if old and stats["latency_ms_p50"] > old["latency_ms_p50"] * (1 + max_regression):
+                violations.append(
+                    f"{name} [{size}] p50 {old['latency_ms_p50']:.2f} -> {stats['latency_ms_p50']:.2f} ms "
+                    f"(izin verilen +%{max_regression * 100:.0f})"
+                )
+    return violations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model arka uçları çıkarım performans takımı")
+    parser.add_argument("--backends", nargs="*", help="Yalnızca bu arka uçları ölç (ör. mlp_numpy logistic_regression)")
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=BATCH_SIZES)
+    parser.add_argument("--out", default=REPORT_PATH)
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki rapor (JSON)")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Önceki rapora göre izin verilen p50 yavaşlama oranı")
+    args = parser.parse_args()
+
+    report = run(args.backends, args.batch_sizes)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Rapor yazıldı: {args.out}")
+
+    violations = []
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            violations += check_budgets(report, json.load(f))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            violations += check_baseline(report, json.load(f), args.max_regression)
+
+    for name, result in report["backends"].items():
+        row = result["batches"]
+        print(f"{name:22s} acc={result['accuracy']:.3f} f1={result['f1']:.3f} " +
+              " ".join(f"[{s}] p99={row[s]['latency_ms_p99']:.2f}ms" for s in row))
+    for v in violations:
+        print(f"GECİKME REGRESYONU: {v}")
+    sys.exit(1 if violations else 0)
@@ -0,0 +1,47 @@
+# Sohbet geçmişi: tur başına okuma + HTML üretim süresinin sohbet uzunluğuna göre değişimi.
+# Proje kök dizininden: python -m benchmarks.chat_history --turns 100 1000 10000
+#
+# "window": son WINDOW_SIZE mesaj SQLite'tan okunup tek blok HTML'e çevrilir (app.py'deki yol).
+# "full"  : tüm geçmiş okunup her mesaj ayrı HTML bloğu olarak üretilir (eski davranış).
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from chat_history import WINDOW_SIZE, ChatHistoryStore
+
+def _html(messages):
+    return "".join(f'<div class="chat-message {m["role"]}"><div class="message">{m["content"]}</div></div>'
+                   for m in messages)
+
+def run(turns_list, repeats=50):
+    path = os.path.join(tempfile.mkdtemp(), "chat.db")
+    store = ChatHistoryStore(path)
+    session = "bench"
+    written = 0
+    report = []
+    for turns in turns_list:
+        while written < turns * 2:
+            role = "user" if written % 2 == 0 else "bot"
+            store.append(session, role, f"mesaj {written} " + "meme kanseri taraması " * 8)
+            written += 1
+        start = time.perf_counter()
+        for _ in range(repeats):
+            _html(store.recent(session, WINDOW_SIZE))
+        window_ms = (time.perf_counter() - start) / repeats * 1000
+        start = time.perf_counter()
+        for _ in range(repeats):
+            _html(store.recent(session, written))
+        full_ms = (time.perf_counter() - start) / repeats * 1000
+        report.append({"turns": turns, "messages": written,
+                       "window_ms": round(window_ms, 3), "full_ms": round(full_ms, 3)})
+    store.close()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sohbet geçmişi çizim maliyeti")
+    parser.add_argument("--turns", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    print(json.dumps(run(sorted(args.turns)), indent=2))
@@ -0,0 +1,77 @@
+# Kayma izleyicisinin grup başına maliyeti ve uyarı davranışı.
+# Proje kök dizininden: python -m benchmarks.drift_monitor
+#
+# 1. Grup boyutu başına DriftMonitor.update süresi, aynı grubun model çıkarım süresiyle karşılaştırılır.
+# 2. data/data.csv satırları yeniden örneklenerek trafik üretilir: önce kaymasız, sonra
+#    boyut özellikleri (radius/perimeter/area) --scale ile çarpılarak (tarayıcı kalibrasyonu
+#    kayması benzetimi). Her senaryoda üretilen uyarılar raporlanır.
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import model_registry
+from drift_monitor import WINDOW_ROWS, DriftMonitor
+
+SIZE_FEATURES = ("radius", "perimeter", "area")
+
+def _median_us(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e6
+
+def latency(bundle, X_all, sizes, repeats=200):
+    monitor = DriftMonitor.open(window_rows=10**12)  # pencere değerlendirmesi ölçüme karışmasın
+    report = []
+    for size in sizes:
+        X = X_all[:size]
+        frame = pd.DataFrame(X, columns=bundle.features)
+        prob = bundle.predict_proba(frame)
+        update_us = _median_us(lambda: monitor.update(X, prob), repeats)
+        inference_us = _median_us(lambda: bundle.predict_proba(frame), repeats)
+        report.append({
+            "batch": size,
+            "update_us": round(update_us, 1),
+            "inference_us": round(inference_us, 1),
+            "overhead_pct": round(100 * update_us / inference_us, 1),
+        })
+    return report
+
+def scenario(bundle, X_all, scale, windows, batch=32, seed=0):
+    rng = np.random.default_rng(seed)
+    monitor = DriftMonitor.open()
+    cols = [i for i, f in enumerate(bundle.features) if f.split("_")[0] in SIZE_FEATURES]
+    for _ in range(windows * WINDOW_ROWS // batch):
+        X = X_all[rng.integers(0, len(X_all), batch)].copy()
+        X[:, cols] *= scale
+        monitor.update(X, bundle.predict_proba(pd.DataFrame(X, columns=bundle.features)))
+    status = monitor.status()
+    return {
+        "scale": scale,
+        "rows": status["rows"],
+        "windows": status["windows"],
+        "alerts": len(monitor.alerts),
+        "active_alerts": status["active_alerts"],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kayma izleyicisi maliyet ve uyarı testi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 32, 1000])
+    parser.add_argument("--scale", type=float, default=1.15)
+    parser.add_argument("--windows", type=int, default=5)
+    args = parser.parse_args()
+
+    bundle = model_registry.load_bundle()
+    X_all = pd.read_csv("data/data.csv")[bundle.features].to_numpy(np.float64)
+    X_big = np.tile(X_all, (max(args.sizes) // len(X_all) + 1, 1))
+    print(json.dumps({
+        "latency": latency(bundle, X_big, args.sizes),
+        "no_drift": scenario(bundle, X_all, 1.0, args.windows),
+        "drift": scenario(bundle, X_all, args.scale, args.windows),
+    }, ensure_ascii=False, indent=2))
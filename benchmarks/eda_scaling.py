@@ -0,0 +1,81 @@
+# EDA özetlerinin büyük veride süre ve bellek davranışı.
+# Proje kök dizininden: python -m benchmarks.eda_scaling --rows 100000 1000000 3000000
+#
+# data/data.csv satırları gürültüyle yeniden örneklenerek geçici Parquet dosyalarına
+# parça parça yazılır; her boyut için özet çıkarma süresi, grafik çizim süresi ve
+# özeti çıkaran (ayrı) sürecin tepe belleği (RSS) raporlanır.
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import artifacts
+import eda_summary
+
+WRITE_CHUNK = 250_000
+
+def write_synthetic(path, n_rows, seed=42):
+    features = artifacts.load_features()
+    base = pd.read_csv("data/data.csv")
+    X0 = base[features].to_numpy(np.float64)
+    y0 = base["diagnosis"].to_numpy()
+    rng = np.random.default_rng(seed)
+    writer = None
+    for start in range(0, n_rows, WRITE_CHUNK):
+        n = min(WRITE_CHUNK, n_rows - start)
+        idx = rng.integers(0, len(X0), n)
+        X = X0[idx] * rng.normal(1.0, 0.03, (n, len(features)))
+        table = pa.table({**{f: X[:, i] for i, f in enumerate(features)}, "diagnosis": y0[idx]})
+        writer = writer or pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+def _summarize_child(path):
+    # Tepe bellek yalnızca özet çıkarmayı ölçsün diye ayrı süreçte çalışır
+    summary = eda_summary.summarize(path)
+    return summary, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def render_all(summary):
+    import matplotlib.pyplot as plt
+    import eda_plots
+    from eda_cache import FIGURES
+
+    start = time.perf_counter()
+    for fn_name in FIGURES.values():
+        plt.close(getattr(eda_plots, fn_name)(summary))
+    return time.perf_counter() - start
+
+def run(sizes):
+    report = []
+    tmp = tempfile.mkdtemp()
+    for n_rows in sizes:
+        path = os.path.join(tmp, f"eda_{n_rows}.parquet")
+        write_synthetic(path, n_rows)
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            summary, peak_mb = pool.submit(_summarize_child, path).result()
+        report.append({
+            "rows": n_rows,
+            "file_mb": round(os.path.getsize(path) / 2**20, 1),
+            "summary_sec": round(summary["seconds"], 3),
+            "rows_per_sec": round(n_rows / summary["seconds"]),
+            "summary_peak_rss_mb": round(peak_mb, 1),
+            "render_sec": round(render_all(summary), 3),
+        })
+        os.remove(path)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EDA özetleri ölçeklenme testi")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    args = parser.parse_args()
+    print(json.dumps(run(sorted(args.rows)), indent=2))
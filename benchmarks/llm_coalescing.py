@@ -0,0 +1,179 @@
+# Eşzamanlı aynı sorularda LLM çağrısı birleştirme (coalescing) yük testi.
+# Proje kök dizininden: python -m benchmarks.llm_coalescing --users 24 --bursts 5
+#
+# Yerel bir sahte LLM sunucusu (ilk token gecikmesi + token akışı, sınırlı eşzamanlılık,
+# istek sayacı) başlatılır. Her patlamada --users oturum aynı anda --questions farklı
+# sorudan birini (büyük/küçük harf ve boşluk varyasyonlarıyla) sorar. İki mod karşılaştırılır:
+#   direct    : her oturum zinciri kendi iş parçacığında, kendi HTTP istemcisiyle çağırır (eski durum)
+#   coalesced : CachedRAGChain + CoalescingExecutor; tek paylaşılan istemci, birleştirme ve sıra
+# Her iki modda da anlamsal önbellek açıktır; sunucuya giden istek sayısı ve p50/p95/p99 raporlanır.
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from llm_executor import CoalescingExecutor
+from rag_index import StubEmbeddings
+from semantic_cache import CachedRAGChain, SemanticCache
+
+ANSWER = "Meme kanseri taramasında mamografi önerilir ve düzenli kontrol önemlidir.".split()
+
+def percentile(values, p):
+    return values[min(len(values) - 1, math.ceil(p * len(values)) - 1)]
+
+# ─────────────────────────── Sahte LLM Sunucusu ─────────────────────────
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, ttft_ms, token_ms, max_concurrency):
+        super().__init__(("127.0.0.1", 0), _FakeLLMHandler)
+        self.ttft = ttft_ms / 1000
+        self.token = token_ms / 1000
+        # Sağlayıcı tarafı kapasite: sınırın üstündeki istekler sunucuda bekler
+        self.slots = threading.Semaphore(max_concurrency)
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server._lock:
+            self.server.requests += 1
+        with self.server.slots:
+            time.sleep(self.server.ttft)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in ANSWER:
+                data = (token + " \n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                time.sleep(self.server.token)
+            self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+# ─────────────────────────── Sahte Zincir ───────────────────────────────
+class FakeRAGChain:
+    # create_retrieval_chain çıktısı gibi önce "context", sonra "answer" parçaları üretir
+    def __init__(self, url, retrieval_ms=20):
+        self.url = url
+        self.retrieval = retrieval_ms / 1000
+        self.client = None  # paylaşılan AsyncClient, executor döngüsünde oluşturulur
+
+    def stream(self, inputs, config=None):
+        # Eski yol: oturum başına bloklayan çağrı ve ayrı bağlantı
+        time.sleep(self.retrieval)
+        yield {"context": [], "input": inputs["input"]}
+        with httpx.Client(timeout=60) as client:
+            with client.stream("POST", f"{self.url}/generate", json={"prompt": inputs["input"]}) as r:
+                for line in r.iter_lines():
+                    if line:
+                        yield {"answer": line}
+
+    async def astream(self, inputs, config=None):
+        await asyncio.sleep(self.retrieval)
+        yield {"context": [], "input": inputs["input"]}
+        async with self.client.stream("POST", f"{self.url}/generate", json={"prompt": inputs["input"]}) as r:
+            async for line in r.aiter_lines():
+                if line:
+                    yield {"answer": line}
+
+def _variant(question, rng):
+    # Aynı sorunun yazım varyasyonları normalize_question ile aynı anahtara düşer
+    words = question.split()
+    return "  ".join(w.upper() if rng.random() < 0.3 else w for w in words) + rng.choice(["", " ", "  "])
+
+# ─────────────────────────── Yük Testi ──────────────────────────────────
+def run_mode(mode, server, users, bursts, questions, gap_sec, max_concurrency, seed=42):
+    rng = random.Random(seed)
+    chain = FakeRAGChain(server.url)
+    executor = None
+    if mode == "coalesced":
+        executor = CoalescingExecutor(max_concurrency=max_concurrency)
+
+        async def make_client():
+            limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            return httpx.AsyncClient(timeout=60, limits=limits)
+        chain.client = executor.run(make_client())
+    rag = CachedRAGChain(chain, SemanticCache(StubEmbeddings()), lambda: "bench", executor=executor)
+
+    requests_before, connections_before = server.requests, server.connections
+
+    def ask(question):
+        start = time.perf_counter()
+        answer = "".join(c.get("answer", "") for c in rag.stream({"input": question}))
+        assert answer.split() == ANSWER, answer
+        return time.perf_counter() - start
+
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        for b in range(bursts):
+            # Her patlama yeni sorularla gelir; önbellek patlama içindeki tekrarları karşılayamaz
+            pool_questions = [f"soru {b}-{q}: meme kanseri belirtileri nelerdir?" for q in range(questions)]
+            batch = [_variant(rng.choice(pool_questions), rng) for _ in range(users)]
+            latencies += pool.map(ask, batch)
+            time.sleep(gap_sec)
+    elapsed = time.perf_counter() - start - gap_sec * bursts
+
+    result = {
+        "mode": mode,
+        "sessions": users * bursts,
+        "upstream_requests": server.requests - requests_before,
+        "upstream_connections": server.connections - connections_before,
+        "cache": rag.cache.metrics(),
+        "seconds": round(elapsed, 3),
+        "latency_ms_p50": percentile(sorted(latencies), 0.50) * 1000,
+        "latency_ms_p95": percentile(sorted(latencies), 0.95) * 1000,
+        "latency_ms_p99": percentile(sorted(latencies), 0.99) * 1000,
+    }
+    if executor is not None:
+        result["executor"] = executor.stats()
+        executor.run(chain.client.aclose())
+        executor.close()
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM çağrısı birleştirme yük testi (sahte LLM sunucusu)")
+    parser.add_argument("--users", type=int, default=24, help="Patlama başına eşzamanlı oturum")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=3, help="Patlama başına farklı soru sayısı")
+    parser.add_argument("--gap", type=float, default=0.2, help="Patlamalar arası bekleme (sn)")
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--server-concurrency", type=int, default=4, help="Sahte sağlayıcının aynı anda işlediği istek")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Executor eşzamanlılık sınırı")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.ttft_ms, args.token_ms, args.server_concurrency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    report = [
+        run_mode(mode, server, args.users, args.bursts, args.questions, args.gap, args.max_concurrency)
+        for mode in ("direct", "coalesced")
+    ]
+    server.shutdown()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
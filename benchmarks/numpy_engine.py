@@ -0,0 +1,65 @@
+# NumPy ve Keras çıkarım motorlarının karşılaştırması.
+# Proje kök dizininden: python -m benchmarks.numpy_engine
+#
+# Her motor ayrı bir alt süreçte ölçülür; böylece import süresi ve bellek (RSS)
+# birbirini etkilemez. Raporlanan değerler: import + yükleme süresi, en yüksek RSS
+# ve farklı grup boyutlarında grup başına gecikme.
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+BATCH_SIZES = [1, 32, 569, 10_000]
+REPEATS = 50
+
+def child(engine, repeats):
+    import resource
+    start = time.perf_counter()
+    import pandas as pd
+    import artifacts
+    model, scaler, threshold, features = artifacts.load_artifacts(engine=engine)
+    load_sec = time.perf_counter() - start
+
+    X = pd.read_csv("data/data.csv")[features]
+    latencies = {}
+    for size in BATCH_SIZES:
+        batch = pd.concat([X] * (size // len(X) + 1), ignore_index=True).iloc[:size]
+        model.predict_on_batch(scaler.transform(batch))  # ısınma
+        times = []
+        for _ in range(repeats):
+            t = time.perf_counter()
+            model.predict_on_batch(scaler.transform(batch))
+            times.append(time.perf_counter() - t)
+        times.sort()
+        latencies[str(size)] = {"p50_ms": times[len(times) // 2] * 1000, "min_ms": times[0] * 1000}
+
+    return {
+        "engine": engine,
+        "import_and_load_sec": load_sec,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "batch_latency": latencies,
+    }
+
+def run(engines, repeats):
+    results = []
+    for engine in engines:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.numpy_engine", "--child", engine, "--repeats", str(repeats)],
+            capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy / Keras çıkarım motoru karşılaştırması")
+    parser.add_argument("--child", choices=["numpy", "keras"])
+    parser.add_argument("--engines", nargs="+", default=["numpy", "keras"])
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.repeats)))
+    else:
+        print(json.dumps(run(args.engines, args.repeats), indent=2))
@@ -0,0 +1,72 @@
+# Retrieval kalitesinin çevrimdışı değerlendirmesi.
+# Proje kök dizininden: python -m benchmarks.retrieval_eval
+#
+# Sabit soru kümesindeki (benchmarks/retrieval_questions.json) her soru için, cevabın
+# geçtiği beklenen ifadelerin bağlamda bulunma oranı (anahtar ifade recall'u) ve
+# isteme giren tahmini token sayısı, eski düz benzerlik retriever'ı (k=10) ile
+# HybridRetriever için karşılaştırılır. Hibrit retriever'ın recall'u tolerans
+# dışında düşerse çıkış kodu 1 olur.
+
+import argparse
+import json
+import sys
+import time
+
+from rag_index import open_vectorstore
+from retrieval import HybridRetriever, estimate_tokens
+
+QUESTIONS_PATH = "benchmarks/retrieval_questions.json"
+RECALL_TOLERANCE = 0.05
+
+def _normalize(text):
+    return " ".join(text.casefold().split())
+
+def evaluate(retriever, questions):
+    rows = []
+    for q in questions:
+        start = time.perf_counter()
+        docs = retriever.invoke(q["question"])
+        seconds = time.perf_counter() - start
+        context = _normalize(" ".join(d.page_content for d in docs))
+        found = [k for k in q["keywords"] if _normalize(k) in context]
+        rows.append({
+            "question": q["question"],
+            "recall": len(found) / len(q["keywords"]),
+            "docs": len(docs),
+            "context_tokens": estimate_tokens(context),
+            "latency_ms": seconds * 1000,
+        })
+    n = len(rows)
+    return {
+        "recall": sum(r["recall"] for r in rows) / n,
+        "context_tokens": sum(r["context_tokens"] for r in rows) / n,
+        "latency_ms": sum(r["latency_ms"] for r in rows) / n,
+        "questions": rows,
+    }
+
+def run(questions_path=QUESTIONS_PATH, embeddings=None):
+    with open(questions_path, encoding="utf-8") as f:
+        questions = json.load(f)
+    vs = open_vectorstore(embeddings)
+    baseline = evaluate(vs.as_retriever(search_type="similarity", search_kwargs={"k": 10}), questions)
+    hybrid = evaluate(HybridRetriever(vectorstore=vs), questions)
+    return {
+        "baseline": baseline,
+        "hybrid": hybrid,
+        "token_reduction": 1 - hybrid["context_tokens"] / baseline["context_tokens"] if baseline["context_tokens"] else 0.0,
+        "recall_delta": hybrid["recall"] - baseline["recall"],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrieval kalite değerlendirmesi")
+    parser.add_argument("--questions", default=QUESTIONS_PATH)
+    parser.add_argument("--tolerance", type=float, default=RECALL_TOLERANCE)
+    parser.add_argument("--verbose", action="store_true", help="Soru bazında sonuçları da yazdır")
+    args = parser.parse_args()
+
+    report = run(args.questions)
+    if not args.verbose:
+        for key in ("baseline", "hybrid"):
+            report[key].pop("questions")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(0 if report["recall_delta"] >= -args.tolerance else 1)
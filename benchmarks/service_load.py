@@ -0,0 +1,59 @@
+# Tahmin servisi için eşzamanlı yük testi.
+# Önce servisi başlatın: python prediction_service.py
+# Sonra proje kök dizininden: python -m benchmarks.service_load --concurrency 32 --requests 2000
+#
+# data/data.csv içinden rastgele satırlarla tekil /predict istekleri gönderir ve
+# p50/p95/p99 gecikme ile saniyedeki istek sayısını raporlar.
+
+import argparse
+import json
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from prediction_service import DEFAULT_PORT, request_prediction
+import artifacts
+
+def percentile(values, p):
+    return values[min(len(values) - 1, math.ceil(p * len(values)) - 1)]
+
+def run(url, concurrency, n_requests, seed=42):
+    features = artifacts.load_features()
+    rows = pd.read_csv("data/data.csv")[features].to_dict("records")
+    rng = random.Random(seed)
+    payloads = [rng.choice(rows) for _ in range(n_requests)]
+
+    def one(payload):
+        start = time.perf_counter()
+        request_prediction(url, payload)
+        return time.perf_counter() - start
+
+    # Isınma: bağlantı ve modelin ilk çağrı maliyeti ölçüme karışmasın
+    for payload in payloads[:min(10, n_requests)]:
+        request_prediction(url, payload)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, payloads))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "requests_per_sec": n_requests / elapsed,
+        "latency_ms_p50": percentile(latencies, 0.50) * 1000,
+        "latency_ms_p95": percentile(latencies, 0.95) * 1000,
+        "latency_ms_p99": percentile(latencies, 0.99) * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tahmin servisi yük testi")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.url, args.concurrency, args.requests), indent=2))
@@ -0,0 +1,230 @@
+# İki aşamalı (cascade) sınıflandırıcı: önce ucuz doğrusal model, eşiğe yakın satırlar için MLP.
+#
+# Veri setindeki örneklerin çoğu eşiğin (threshold.json) çok uzağında kalır; bu satırlar
+# için MLP'nin kararı Lojistik Regresyon ile aynıdır. Cascade modunda tüm satırlar önce
+# tek bir matris-vektör çarpımı olan doğrusal modelle puanlanır, yalnızca olasılığı
+# belirsizlik bandı [low, high] içinde kalan satırlar MLP'ye gönderilir.
+#
+# Doğrusal model notebook'taki bölme ile eğitim kümesinde, mevcut scaler.pkl çıktısı
+# üzerinde eğitilir; scaler katsayılara gömülerek cascade_linear.npz dosyasına yazılır.
+# Dosya model dosyasının yanında aranır (kayıttaki her sürüm kendi cascade'ini taşır) ve
+# üretildiği MLP ile scaler'ın özetlerini tutar; özetler tutmuyorsa cascade kullanılmaz.
+#
+# Kullanım:
+#   python cascade.py fit --low 0.05 --high 0.95   # cascade_linear.npz üretir
+#   python cascade.py fit --version v2              # models/v2/cascade_linear.npz
+#   python cascade.py report                        # data/data.csv üzerinde yükseltme oranı, hız ve uyum
+#
+# Uygulama ve tahmin servisi MLP_CASCADE=1 ortam değişkeniyle cascade modunda çalışır.
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from numpy_mlp import file_sha256, _sigmoid
+
+CASCADE_PATH = "cascade_linear.npz"
+DATA_PATH = "data/data.csv"
+BAND = (0.05, 0.95)
+# MLP-only kararlarıyla izin verilen en fazla uyuşmazlık oranı
+AGREEMENT_TOLERANCE = 0.01
+# Hız ölçümünde kullanılan satır sayısı (data.csv satırları tekrarlanır)
+BENCH_ROWS = 100_000
+
+# ─────────────────────────── Doğrusal Model ─────────────────────────────
+class LinearScorer:
+    def __init__(self, coef, intercept):
+        self.coef = coef
+        self.intercept = intercept
+
+    @classmethod
+    def load(cls, path=CASCADE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["coef"], float(data["intercept"])), (float(data["low"]), float(data["high"]))
+
+    def predict_proba(self, X):
+        # Girdi ham (ölçeklenmemiş) özelliklerdir; scaler katsayılara gömülüdür
+        return _sigmoid(np.asarray(X, dtype=self.coef.dtype) @ self.coef + self.intercept)
+
+class CascadeModel:
+    # MLP ile aynı predict_on_batch arayüzü; ham özellik alır (IdentityScaler ile kullanılır)
+    def __init__(self, linear, mlp, mlp_scaler, low, high, features=None):
+        if not low < high:
+            raise ValueError(f"Geçersiz belirsizlik bandı: [{low}, {high}]")
+        self.linear = linear
+        self.mlp = mlp
+        self.mlp_scaler = mlp_scaler
+        self.low = low
+        self.high = high
+        self.features = features
+        self.rows = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+
+    def _mlp_proba(self, X):
+        if self.features is not None and hasattr(self.mlp_scaler, "feature_names_in_"):
+            import pandas as pd
+            X = pd.DataFrame(X, columns=self.features)
+        return np.asarray(self.mlp.predict_on_batch(self.mlp_scaler.transform(X))).reshape(-1)
+
+    def escalation_mask(self, prob):
+        return (prob >= self.low) & (prob <= self.high)
+
+    def predict_on_batch(self, X):
+        X = np.asarray(X)
+        prob = self.linear.predict_proba(X).astype(np.float32)
+        uncertain = np.flatnonzero(self.escalation_mask(prob))
+        if len(uncertain):
+            prob[uncertain] = self._mlp_proba(X[uncertain])
+        with self._lock:
+            self.rows += len(X)
+            self.escalated += len(uncertain)
+        return prob.reshape(-1, 1)
+
+    def predict(self, X, **kwargs):
+        return self.predict_on_batch(X)
+
+    def stats(self):
+        with self._lock:
+            rows, escalated = self.rows, self.escalated
+        return {
+            "band": [self.low, self.high],
+            "rows": rows,
+            "escalated": escalated,
+            "escalated_fraction": escalated / rows if rows else 0.0,
+        }
+
+def cascade_path(model_path="breast_mlp.h5"):
+    # Sürümün cascade dosyası model dosyasıyla aynı dizindedir
+    return os.path.join(os.path.dirname(model_path), CASCADE_PATH)
+
+def is_current(path=CASCADE_PATH, model_path="breast_mlp.h5", scaler_path="scaler.pkl"):
+    # Bant MLP kararlarıyla uyuma göre seçildiğinden hem MLP hem scaler özeti tutmalıdır
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            recorded = (str(data["model_sha256"]), str(data["scaler_sha256"]))
+    except (OSError, KeyError):
+        return False
+    return recorded == (file_sha256(model_path), file_sha256(scaler_path))
+
+# ─────────────────────────── Eğitim ─────────────────────────────────────
+def _load_data(data_path=DATA_PATH, features_path=None):
+    import pandas as pd
+    import artifacts
+
+    features = artifacts.load_features(features_path or artifacts.FEATURES_PATH)
+    df = pd.read_csv(data_path)
+    return df[features], df["diagnosis"].map({"M": 1, "B": 0}).to_numpy(), features
+
+def fit(model_path="breast_mlp.h5", scaler_path="scaler.pkl", features_path=None, data_path=DATA_PATH,
+        out_path=None, low=BAND[0], high=BAND[1]):
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+
+    out_path = out_path or cascade_path(model_path)
+    X, y, _ = _load_data(data_path, features_path)
+    # Notebook ile aynı bölme; doğrusal model yalnızca eğitim kümesini görür
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    scaler = joblib.load(scaler_path)
+    lr = LogisticRegression(max_iter=1000, random_state=42).fit(scaler.transform(X_train), y_train)
+
+    # w·((x - mean) / scale) + b  =  (w / scale)·x + (b - w·mean / scale)
+    w = lr.coef_.ravel() / scaler.scale_
+    b = float(lr.intercept_[0] - np.dot(lr.coef_.ravel(), scaler.mean_ / scaler.scale_))
+    np.savez_compressed(
+        out_path,
+        coef=w.astype(np.float64),
+        intercept=np.array(b),
+        low=np.array(low),
+        high=np.array(high),
+        model_sha256=np.array(file_sha256(model_path)),
+        scaler_sha256=np.array(file_sha256(scaler_path)),
+    )
+    return out_path
+
+def load_cascade(mlp, mlp_scaler, path=CASCADE_PATH, band=None, features=None):
+    linear, saved_band = LinearScorer.load(path)
+    low, high = band or saved_band
+    return CascadeModel(linear, mlp, mlp_scaler, low, high, features)
+
+# ─────────────────────────── Rapor ──────────────────────────────────────
+def _rows_per_sec(predict, X, repeats=3):
+    predict(X[:32])  # ısınma
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - start)
+    return len(X) / best
+
+def report(version=None, path=None, data_path=DATA_PATH, band=None, engine=None, tolerance=AGREEMENT_TOLERANCE):
+    import artifacts
+    import model_registry
+
+    _, entry = model_registry.version_entry(version)
+    files = entry["files"]
+    X, y, features = _load_data(data_path, files["features"])
+    threshold = artifacts.load_threshold(files["threshold"])
+    mlp, mlp_scaler = artifacts.load_model(files["model"], files["scaler"], engine=engine, use_cascade=False)
+    cascade = load_cascade(mlp, mlp_scaler, path or cascade_path(files["model"]), band, features)
+    if not cascade.low <= threshold <= cascade.high:
+        raise ValueError(f"Eşik ({threshold}) belirsizlik bandının [{cascade.low}, {cascade.high}] dışında")
+
+    X = X.to_numpy()
+    mlp_prob = cascade._mlp_proba(X)
+    cascade_prob = cascade.predict_on_batch(X).reshape(-1)
+    mlp_pred = mlp_prob > threshold
+    cascade_pred = cascade_prob > threshold
+    disagreement = float(np.mean(mlp_pred != cascade_pred))
+    escalated = cascade.stats()["escalated_fraction"]
+
+    bench = np.resize(X, (BENCH_ROWS, X.shape[1]))
+    mlp_rps = _rows_per_sec(cascade._mlp_proba, bench)
+    cascade_rps = _rows_per_sec(cascade.predict_on_batch, bench)
+
+    return {
+        "rows": len(X),
+        "engine": type(mlp).__name__,
+        "band": [cascade.low, cascade.high],
+        "threshold": threshold,
+        "escalated_fraction": escalated,
+        "disagreement_with_mlp": disagreement,
+        "tolerance": tolerance,
+        "accuracy_mlp": float(np.mean(mlp_pred == y)),
+        "accuracy_cascade": float(np.mean(cascade_pred == y)),
+        "mlp_rows_per_sec": mlp_rps,
+        "cascade_rows_per_sec": cascade_rps,
+        "speedup": cascade_rps / mlp_rps,
+        "ok": disagreement <= tolerance,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Doğrusal model + MLP cascade sınıflandırıcı")
+    parser.add_argument("command", choices=["fit", "report"])
+    parser.add_argument("--low", type=float, help="Belirsizlik bandı alt sınırı (doğrusal model olasılığı)")
+    parser.add_argument("--high", type=float, help="Belirsizlik bandı üst sınırı")
+    parser.add_argument("--engine", choices=["auto", "numpy", "keras"], help="MLP çıkarım motoru")
+    parser.add_argument("--tolerance", type=float, default=AGREEMENT_TOLERANCE)
+    parser.add_argument("--version", help="Kayıttaki model sürümü (varsayılan: aktif sürüm)")
+    parser.add_argument("--out", help="Cascade dosyası (varsayılan: sürümün model dosyasının yanında)")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        import model_registry
+
+        _, entry = model_registry.version_entry(args.version)
+        files = entry["files"]
+        low = BAND[0] if args.low is None else args.low
+        high = BAND[1] if args.high is None else args.high
+        print(f"Yazıldı: {fit(files['model'], files['scaler'], files['features'], out_path=args.out, low=low, high=high)}")
+    else:
+        band = None if args.low is None or args.high is None else (args.low, args.high)
+        result = report(args.version, args.out, band=band, engine=args.engine, tolerance=args.tolerance)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["ok"] else 1)
@@ -0,0 +1,161 @@
+# SağlıkGPT sohbet geçmişi için SQLite tabanlı, oturum anahtarlı kalıcı depo.
+#
+# Mesajlar chat_history.db dosyasına yazılır; Streamlit oturumunda yalnızca son
+# WINDOW_SIZE mesaj tutulur ve çizilir. Daha eski mesajlar kullanıcı isteyince
+# (session_id, id) indeksi üzerinden sayfa sayfa okunur. Böylece tur başına okuma ve
+# çizim maliyeti sohbetin uzunluğundan bağımsız kalır. SESSION_TTL_SEC boyunca
+# etkinlik göstermeyen oturumlar mesajlarıyla birlikte silinir.
+#
+# Kullanım:
+#   python chat_history.py stats
+#   python chat_history.py evict --ttl 3600
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+DB_PATH = os.getenv("CHAT_DB_PATH", "chat_history.db")
+WINDOW_SIZE = 20
+PAGE_SIZE = 20
+SESSION_TTL_SEC = 7 * 24 * 3600
+EVICT_INTERVAL_SEC = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    last_active REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages(session_id, id);
+CREATE INDEX IF NOT EXISTS sessions_last_active ON sessions(last_active);
+"""
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+def _rows(cursor):
+    return [{"id": r[0], "role": r[1], "content": r[2]} for r in cursor]
+
+class ChatHistoryStore:
+    # Tek bağlantı tüm Streamlit oturumlarınca paylaşılır; yazma/okuma kısa olduğundan bir kilit yeterlidir
+    def __init__(self, path=DB_PATH, ttl_sec=SESSION_TTL_SEC):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.evicted = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def touch(self, session_id):
+        # Oturumu oluşturur veya son etkinlik zamanını günceller
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, created, last_active) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET last_active = excluded.last_active",
+                (session_id, now, now))
+
+    def append(self, session_id, role, content):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT INTO sessions (id, created, last_active) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET last_active = excluded.last_active",
+                    (session_id, now, now))
+                cur = self._conn.execute(
+                    "INSERT INTO messages (session_id, role, content, created) VALUES (?, ?, ?, ?)",
+                    (session_id, role, content, now))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return {"id": cur.lastrowid, "role": role, "content": content}
+
+    def recent(self, session_id, limit=WINDOW_SIZE):
+        # Son `limit` mesaj, eskiden yeniye
+        with self._lock:
+            rows = _rows(self._conn.execute(
+                "SELECT id, role, content FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit)))
+        return rows[::-1]
+
+    def page(self, session_id, before_id, limit=PAGE_SIZE):
+        # before_id'den önceki `limit` mesaj, eskiden yeniye
+        with self._lock:
+            rows = _rows(self._conn.execute(
+                "SELECT id, role, content FROM messages WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (session_id, before_id, limit)))
+        return rows[::-1]
+
+    def has_before(self, session_id, before_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM messages WHERE session_id = ? AND id < ? LIMIT 1",
+                (session_id, before_id)).fetchone()
+        return row is not None
+
+    def count(self, session_id):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+    def evict_inactive(self, ttl_sec=None):
+        # Süresi dolan oturumları ve mesajlarını siler; silinen oturum sayısını döndürür
+        cutoff = time.time() - (self.ttl_sec if ttl_sec is None else ttl_sec)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM messages WHERE session_id IN (SELECT id FROM sessions WHERE last_active < ?)",
+                    (cutoff,))
+                n = self._conn.execute("DELETE FROM sessions WHERE last_active < ?", (cutoff,)).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.evicted += n
+        return n
+
+    def start_eviction(self, interval=EVICT_INTERVAL_SEC):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.evict_inactive()
+        threading.Thread(target=loop, daemon=True, name="chat-history-evict").start()
+
+    def stats(self):
+        with self._lock:
+            sessions = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            messages = self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return {"sessions": sessions, "messages": messages, "evicted": self.evicted}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SağlıkGPT sohbet geçmişi deposu")
+    parser.add_argument("command", choices=["stats", "evict"])
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--ttl", type=float, default=SESSION_TTL_SEC, help="Etkinlik olmadan saklama süresi (sn)")
+    args = parser.parse_args()
+
+    store = ChatHistoryStore(args.db, args.ttl)
+    if args.command == "evict":
+        print(f"Silinen oturum: {store.evict_inactive()}")
+    print(store.stats())
@@ -0,0 +1,271 @@
+# Tahmin trafiğinde girdi ve çıktı dağılımı kayması (drift) izleme.
+#
+# data/data.csv eğitim dağılımından bir kez taban (baseline) çıkarılır: her özellik için
+# ondalık (decile) kova kenarları ve kova oranları, ortalama/std; model çıktısı
+# (malign olasılığı) için [0, 1] aralığında eşit kovalar. drift_baseline.npz'ye yazılır.
+#
+# DriftMonitor tahmin yolunda her grupla güncellenir; bellek trafik miktarından
+# bağımsızdır (özellik başına sabit sayıda sayaç):
+#   - Welford/Chan birleştirmesiyle akışlı ortalama ve varyans (toplam ve pencere)
+#   - sabit kenarlı kovalar için kenar başına "≥ kenar" sayıları (pencere); kova sayıları
+#     yalnızca pencere değerlendirilirken bunların farkından çıkarılır
+# WINDOW_ROWS satırlık her pencere sonunda PSI, kovalı KS (kova kenarlarındaki en büyük
+# CDF farkı) ve std cinsinden ortalama kayması hesaplanır; eşik aşılırsa uyarı loglanır,
+# app_drift_alerts_total sayacı artar ve uyarı geçmişe eklenir.
+#
+# Kullanım:
+#   python drift_monitor.py baseline                  # drift_baseline.npz üret (aktif model sürümüyle)
+#   python drift_monitor.py check yeni_tarama.csv     # dosyayı izleyiciden geçir, raporla
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+import metrics
+from numpy_mlp import file_sha256
+
+BASELINE_PATH = "drift_baseline.npz"
+DATA_PATH = "data/data.csv"
+BINS = 10
+WINDOW_ROWS = 1_000
+MIN_WINDOW_ROWS = 200
+PSI_ALERT = 0.2
+KS_ALERT = 0.15
+MEAN_SHIFT_ALERT = 0.5  # taban std'si cinsinden
+ALERT_HISTORY = 100
+PROBABILITY = "probability"
+_EPS = 1e-4
+
+logger = logging.getLogger("drift_monitor")
+
+DRIFT_PSI = metrics.register(metrics.Gauge("app_drift_psi", "Son pencerede tabana göre PSI"))
+DRIFT_KS = metrics.register(metrics.Gauge("app_drift_ks", "Son pencerede tabana göre kovalı KS"))
+DRIFT_ALERTS = metrics.register(metrics.Counter("app_drift_alerts_total", "Eşiği aşan kayma uyarıları"))
+
+# ─────────────────────────── Yardımcılar ────────────────────────────────
+def edge_counts(Z, edges):
+    # Z [n, k], edges [k, BINS-1] -> her kenara eşit veya büyük değer sayısı [k, BINS-1].
+    # Sütunlar bitişik (transpoz) tutulur; sayım en içteki eksende yapılır, bincount gerekmez.
+    return np.count_nonzero(np.ascontiguousarray(Z.T)[:, None, :] >= edges[:, :, None], axis=2)
+
+def counts_from_edges(n, ge):
+    # Kümülatif kenar sayılarından kova sayıları: kova i = (≥ kenar i-1) - (≥ kenar i)
+    full = np.concatenate([np.full((len(ge), 1), n), ge, np.zeros((len(ge), 1), dtype=ge.dtype)], axis=1)
+    return full[:, :-1] - full[:, 1:]
+
+def bin_counts(Z, edges):
+    return counts_from_edges(len(Z), edge_counts(Z, edges))
+
+def psi(ref, counts):
+    # Population Stability Index; boş kovalar küçük bir değerle sınırlanır
+    actual = counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)
+    expected = np.maximum(ref, _EPS)
+    actual = np.maximum(actual, _EPS)
+    return ((actual - expected) * np.log(actual / expected)).sum(axis=-1)
+
+def binned_ks(ref, counts):
+    # İki dağılımın kova kenarlarındaki kümülatif oran farklarının en büyüğü (gerçek KS'nin alt sınırı)
+    actual = counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)
+    return np.abs(np.cumsum(actual, axis=-1) - np.cumsum(ref, axis=-1)).max(axis=-1)
+
+def _combine(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    # İki moment kümesini Chan vd. ile birleştirir (satır satır Welford'un grup karşılığı)
+    n = n_a + n_b
+    if n_a == 0:
+        return n_b, mean_b, m2_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * (n_b / n), m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+
+def _merge(n_a, mean_a, m2_a, Z):
+    mean_b = Z.mean(axis=0)
+    d = Z - mean_b
+    return _combine(n_a, mean_a, m2_a, len(Z), mean_b, np.einsum("ij,ij->j", d, d))
+
+# ─────────────────────────── Taban ──────────────────────────────────────
+def build_baseline(data_path=DATA_PATH, out_path=BASELINE_PATH, version=None):
+    import pandas as pd
+    import model_registry
+
+    bundle = model_registry.load_bundle(version)
+    df = pd.read_csv(data_path)
+    X = df[bundle.features].to_numpy(np.float64)
+    prob = bundle.predict_proba(df[bundle.features])
+    Z = np.column_stack([X, prob])
+
+    quantiles = np.linspace(0, 1, BINS + 1)[1:-1]
+    feature_edges = np.quantile(X, quantiles, axis=0).T
+    # Olasılık için eşit genişlikli kovalar: 0.1, 0.2, ..., 0.9
+    edges = np.vstack([feature_edges, quantiles[None, :]])
+    counts = bin_counts(Z, edges)
+    _, entry = model_registry.version_entry(bundle.version)
+    np.savez_compressed(
+        out_path,
+        names=np.array(bundle.features + [PROBABILITY]),
+        edges=edges,
+        ref=counts / counts.sum(axis=1, keepdims=True),
+        mean=Z.mean(axis=0),
+        std=Z.std(axis=0, ddof=1),
+        rows=np.array(len(Z)),
+        model_version=np.array(bundle.version),
+        model_sha256=np.array(file_sha256(entry["files"]["model"])),
+        data_sha256=np.array(file_sha256(data_path)),
+    )
+    return out_path
+
+# ─────────────────────────── İzleyici ───────────────────────────────────
+class DriftMonitor:
+    def __init__(self, names, edges, ref, mean, std, model_version=None, window_rows=WINDOW_ROWS):
+        self.names = list(names)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.ref = np.asarray(ref, dtype=np.float64)
+        self.ref_mean = np.asarray(mean, dtype=np.float64)
+        self.ref_std = np.where(np.asarray(std) > 0, std, 1.0)
+        self.model_version = model_version
+        self.window_rows = window_rows
+        k = len(self.names)
+        self.n, self.mean, self.m2 = 0, np.zeros(k), np.zeros(k)
+        self.windows = 0
+        self.last = None
+        self.active = set()
+        self.alerts = deque(maxlen=ALERT_HISTORY)
+        self._reset_window()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path=BASELINE_PATH, window_rows=WINDOW_ROWS):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["names"].tolist(), data["edges"], data["ref"], data["mean"], data["std"],
+                       str(data["model_version"]), window_rows)
+
+    def _reset_window(self):
+        k = len(self.names)
+        self.w_n, self.w_mean, self.w_m2 = 0, np.zeros(k), np.zeros(k)
+        self.w_ge = np.zeros(self.edges.shape, dtype=np.int64)
+
+    def update(self, X, prob):
+        # X [n, 30] ham özellikler, prob [n] model çıktısı; birkaç vektörel işlem, satır döngüsü yok
+        with metrics.span("drift_monitor"):
+            Z = np.column_stack([np.asarray(X, dtype=np.float64), np.asarray(prob, dtype=np.float64).reshape(-1)])
+            if len(Z) == 0:
+                return None
+            ge = edge_counts(Z, self.edges)
+            with self._lock:
+                # Toplam momentler yalnızca pencere kapanırken birleştirilir; grup başına tek birleştirme
+                self.w_n, self.w_mean, self.w_m2 = _merge(self.w_n, self.w_mean, self.w_m2, Z)
+                self.w_ge += ge
+                if self.w_n < self.window_rows:
+                    return None
+                report = self._evaluate()
+                self.n, self.mean, self.m2 = _combine(self.n, self.mean, self.m2, self.w_n, self.w_mean, self.w_m2)
+                self._reset_window()
+            return report
+
+    def _window_stats(self):
+        # Kilit altında çağrılır; durum değiştirmez
+        counts = counts_from_edges(self.w_n, self.w_ge)
+        p = psi(self.ref, counts)
+        ks = binned_ks(self.ref, counts)
+        shift = np.abs(self.w_mean - self.ref_mean) / self.ref_std
+        report = {
+            "rows": int(self.w_n),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "psi": dict(zip(self.names, p.round(4).tolist())),
+            "ks": dict(zip(self.names, ks.round(4).tolist())),
+            "mean_shift": dict(zip(self.names, shift.round(4).tolist())),
+        }
+        crossed = {}
+        for stat, values, limit in (("psi", p, PSI_ALERT), ("ks", ks, KS_ALERT), ("mean_shift", shift, MEAN_SHIFT_ALERT)):
+            for i in np.flatnonzero(values > limit):
+                crossed[(self.names[i], stat)] = (round(float(values[i]), 4), limit)
+        report["crossed"] = sorted(f"{name}:{stat}" for name, stat in crossed)
+        return report, crossed, p, ks
+
+    def _evaluate(self):
+        # Kilit altında, pencere dolduğunda çağrılır
+        report, crossed, p, ks = self._window_stats()
+        self.windows += 1
+        self.last = report
+        for i, name in enumerate(self.names):
+            DRIFT_PSI.set(round(float(p[i]), 6), feature=name)
+            DRIFT_KS.set(round(float(ks[i]), 6), feature=name)
+        # Yalnızca yeni aşılan eşikler uyarı üretir; düzelen özellikler etkin uyarılardan çıkar
+        for (name, stat), (value, limit) in sorted(crossed.items()):
+            if (name, stat) in self.active:
+                continue
+            self.alerts.append({"time": report["time"], "feature": name, "stat": stat,
+                                "value": value, "limit": limit, "rows": report["rows"]})
+            DRIFT_ALERTS.inc(feature=name, stat=stat)
+            logger.warning("Veri kayması: %s %s=%.3f (eşik %.2f, %d satır)", name, stat, value, limit, report["rows"])
+        self.active = set(crossed)
+        return report
+
+    def evaluate_partial(self):
+        # Dolmamış pencereyi sıfırlamadan ve uyarı üretmeden değerlendirir (düşük trafikte durum görmek için)
+        with self._lock:
+            if self.w_n < MIN_WINDOW_ROWS:
+                return None
+            return self._window_stats()[0]
+
+    def status(self):
+        with self._lock:
+            n, mean, m2 = _combine(self.n, self.mean, self.m2, self.w_n, self.w_mean, self.w_m2)
+            std = np.sqrt(m2 / (n - 1)) if n > 1 else np.zeros(len(self.names))
+            return {
+                "baseline_model": self.model_version,
+                "rows": int(n),
+                "windows": self.windows,
+                "window_rows": int(self.w_n),
+                "active_alerts": sorted(f"{name}:{stat}" for name, stat in self.active),
+                "recent_alerts": list(self.alerts)[-10:],
+                "last_window": self.last,
+                "mean": dict(zip(self.names, np.round(mean, 4).tolist())),
+                "std": dict(zip(self.names, std.round(4).tolist())),
+            }
+
+def open_monitor(path=BASELINE_PATH):
+    # Taban dosyası yoksa izleme kapalıdır; tahmin yolu etkilenmez
+    try:
+        return DriftMonitor.open(path)
+    except (OSError, KeyError) as e:
+        logger.warning("Kayma izleme kapalı (%s): %s", path, e)
+        return None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Girdi ve çıktı dağılımı kayma izleyicisi")
+    parser.add_argument("command", choices=["baseline", "check"])
+    parser.add_argument("data", nargs="?", default=DATA_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--version", help="Taban çıktı dağılımı için model sürümü (varsayılan: aktif)")
+    parser.add_argument("--window", type=int, default=WINDOW_ROWS)
+    args = parser.parse_args()
+
+    if args.command == "baseline":
+        print(f"Yazıldı: {build_baseline(args.data, args.baseline, args.version)}")
+        sys.exit(0)
+
+    import ingestion
+    import model_registry
+
+    bundle = model_registry.load_bundle(args.version)
+    monitor = DriftMonitor.open(args.baseline, args.window)
+    import pandas as pd
+
+    fmt = ingestion.detect_format(args.data)
+    for _, X, non_numeric in ingestion.iter_feature_batches(args.data, bundle.features, fmt, args.window):
+        valid, _ = ingestion.validate(X, non_numeric)
+        X = X[valid]
+        if len(X):
+            monitor.update(X, bundle.predict_proba(pd.DataFrame(X, columns=bundle.features)))
+    status = monitor.status()
+    partial = monitor.evaluate_partial()
+    print(json.dumps({
+        **{k: status[k] for k in ("baseline_model", "rows", "windows", "active_alerts", "recent_alerts")},
+        "open_window": {"rows": status["window_rows"], "crossed": partial["crossed"] if partial else None},
+    }, ensure_ascii=False, indent=2))
@@ -0,0 +1,92 @@
+# Veri Analizi sekmesi için önceden çizilmiş grafik önbelleği.
+# Çalıştırmak için: python eda_cache.py   (--force ile yeniden çizer)
+#
+# Grafikler veri dosyasının SHA-256 özetiyle adlandırılan bir klasöre
+# (results/eda/<özet>/) sıkıştırılmış PNG olarak yazılır. Uygulama yalnızca bu
+# dosyaları gösterir; matplotlib/seaborn yalnızca veri değiştiğinde yüklenir.
+# Çizimler ham satırlardan değil eda_summary.py'nin parçalı okumayla çıkardığı
+# özetlerden yapılır; EDA_DATA_PATH ile milyonlarca satırlık CSV/Parquet dosyası verilebilir.
+
+import argparse
+import hashlib
+import os
+import shutil
+
+import metrics
+
+DATA_PATH = os.getenv("EDA_DATA_PATH", "data/data.csv")
+CACHE_DIR = "results/eda"
+HASH_LENGTH = 16
+DPI = 100
+
+# Sekmedeki sırayla grafik adı -> eda_plots içindeki çizim fonksiyonu
+FIGURES = {
+    "class_distribution": "plot_class_distribution",
+    "radius_box": "plot_radius_box",
+    "corr_heatmap": "plot_corr_heatmap",
+    "radius_hist": "plot_radius_hist",
+    "pca": "plot_pca",
+}
+
+# (yol, boyut, değişiklik zamanı) -> özet; büyük dosya her Streamlit çalıştırmasında yeniden okunmaz
+_HASH_MEMO = {}
+
+def data_hash(data_path=DATA_PATH):
+    stat = os.stat(data_path)
+    key = (os.path.abspath(data_path), stat.st_size, stat.st_mtime_ns)
+    if key not in _HASH_MEMO:
+        _HASH_MEMO[key] = _file_hash(data_path)
+    return _HASH_MEMO[key]
+
+def _file_hash(data_path):
+    h = hashlib.sha256()
+    with open(data_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:HASH_LENGTH]
+
+def figure_paths(digest):
+    return {name: os.path.join(CACHE_DIR, digest, f"{name}.png") for name in FIGURES}
+
+def build_cache(data_path=DATA_PATH, digest=None):
+    import matplotlib.pyplot as plt
+    import eda_plots
+    import eda_summary
+
+    digest = digest or data_hash(data_path)
+    summary = eda_summary.summarize(data_path)
+    out_dir = os.path.join(CACHE_DIR, digest)
+    os.makedirs(out_dir, exist_ok=True)
+
+    for name, fn_name in FIGURES.items():
+        with metrics.span("figure_render", figure=name):
+            fig = getattr(eda_plots, fn_name)(summary)
+            path = os.path.join(out_dir, f"{name}.png")
+            # Yarım yazılmış dosya başka bir süreç tarafından okunmasın diye önce geçici dosyaya yazılır
+            tmp_path = path + ".tmp"
+            fig.savefig(tmp_path, format="png", dpi=DPI, pil_kwargs={"optimize": True})
+            plt.close(fig)
+            os.replace(tmp_path, path)
+
+    # Eski veri sürümlerine ait klasörler silinir
+    for entry in os.listdir(CACHE_DIR):
+        if entry != digest and os.path.isdir(os.path.join(CACHE_DIR, entry)):
+            shutil.rmtree(os.path.join(CACHE_DIR, entry), ignore_errors=True)
+    return figure_paths(digest)
+
+def ensure_cache(data_path=DATA_PATH):
+    # Veri değişmediyse mevcut dosyalar döner; eksik veya eski ise yeniden çizilir
+    digest = data_hash(data_path)
+    paths = figure_paths(digest)
+    if all(os.path.exists(p) for p in paths.values()):
+        return paths
+    return build_cache(data_path, digest)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EDA grafik önbelleğini oluşturur")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+    paths = build_cache(args.data) if args.force else ensure_cache(args.data)
+    for name, path in paths.items():
+        print(f"{name}: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
@@ -0,0 +1,130 @@
+# Veri Analizi sekmesindeki EDA grafiklerini çizen fonksiyonlar.
+# Grafikler uygulama içinde değil, eda_cache.py tarafından bir kez çizilip
+# sıkıştırılmış PNG dosyaları olarak saklanır.
+#
+# Fonksiyonlar ham satırları değil eda_summary.summarize() çıktısını alır; çizilen
+# öğe sayısı (çubuk, kova, ızgara hücresi) veri boyutundan bağımsızdır.
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from eda_summary import binned_kde, box_stats
+
+CLASS_COLORS = {"B": "#43A047", "M": "#E53935"}
+DEFAULT_COLOR = "#1976D2"
+# PCA yoğunluk grafiğinde dolu hücreler bu çözünürlüğe kadar birleştirilir
+PCA_DISPLAY_BINS = 128
+
+def _colors(summary):
+    return [CLASS_COLORS.get(c, DEFAULT_COLOR) for c in summary["classes"]]
+
+# ─────────────────────────── EDA Fonksiyonları ─────────────────────────
+def plot_class_distribution(summary):
+    plt.style.use('default')
+    fig, ax = plt.subplots(figsize=(8,6))
+    sns.set_theme(style="whitegrid")
+    ax.bar(summary["classes"], summary["class_counts"], color=_colors(summary), width=0.8)
+    ax.set_title("Tümör Sınıf Dağılımı", fontsize=14, pad=20, color="#1B5E20")
+    ax.set_xlabel("Teşhis (M = Malign, B = Benign)", fontsize=12, color="#424242")
+    ax.set_ylabel("Sayı", fontsize=12, color="#424242")
+    plt.tight_layout()
+    return fig
+
+def plot_corr_heatmap(summary):
+    plt.style.use('default')
+    fig, ax = plt.subplots(figsize=(16,12))
+    sns.set_theme(style="whitegrid")
+    sns.heatmap(
+        summary["corr"],
+        xticklabels=summary["features"],
+        yticklabels=summary["features"],
+        cmap="RdYlGn",
+        linewidths=0.5,
+        ax=ax,
+        annot=False,
+        center=0
+    )
+    ax.set_title("Özellik Korelasyon Haritası", fontsize=14, pad=20, color="#1B5E20")
+    plt.tight_layout()
+    return fig
+
+def plot_radius_box(summary):
+    # Kutu grafiği ince histogramdan hesaplanan yüzdeliklerle çizilir
+    stats = [box_stats(h, summary["fine_edges"], c) for c, h in zip(summary["classes"], summary["fine_hist"])]
+    plt.style.use('default')
+    fig, ax = plt.subplots(figsize=(8,6))
+    sns.set_theme(style="whitegrid")
+    boxes = ax.bxp(stats, patch_artist=True, widths=0.8,
+                   medianprops={"color": "#424242"}, flierprops={"marker": "d", "markersize": 5})
+    for patch, color in zip(boxes["boxes"], _colors(summary)):
+        patch.set_facecolor(color)
+    ax.set_title("Sınıflara Göre Yarıçap Dağılımı", fontsize=14, pad=20, color="#1B5E20")
+    ax.set_xlabel("Teşhis", fontsize=12, color="#424242")
+    ax.set_ylabel("Ortalama Yarıçap", fontsize=12, color="#424242")
+    plt.tight_layout()
+    return fig
+
+def plot_radius_hist(summary):
+    edges = summary["hist_edges"]
+    width = edges[1] - edges[0]
+    plt.style.use('default')
+    fig, ax = plt.subplots(figsize=(8,6))
+    sns.set_theme(style="whitegrid")
+    for c, counts, fine, color in zip(summary["classes"], summary["hist"], summary["fine_hist"], _colors(summary)):
+        ax.stairs(counts, edges, fill=True, alpha=0.5, color=color, label=c)
+        # KDE, ham sütun yerine ince histogram üzerinde hesaplanır; sayı ölçeğine çevrilir
+        x, density = binned_kde(fine, summary["fine_edges"])
+        ax.plot(x, density * counts.sum() * width, color=color, linewidth=2)
+    ax.legend(title="diagnosis")
+    ax.set_title("Yarıçap Dağılımı (Histogram + KDE)", fontsize=14, pad=20, color="#1B5E20")
+    ax.set_xlabel("Ortalama Yarıçap", fontsize=12, color="#424242")
+    ax.set_ylabel("Frekans", fontsize=12, color="#424242")
+    plt.tight_layout()
+    return fig
+
+def _crop_grid(grid, edges_x, edges_y, max_bins):
+    # Izgara dolu hücrelerin kapsadığı alana kırpılır ve en fazla max_bins hücreye birleştirilir
+    occupied = grid.sum(axis=0)
+    rows, cols = np.nonzero(occupied)
+    if len(rows) == 0:
+        return grid, edges_x, edges_y
+    grid = grid[:, rows.min():rows.max() + 1, cols.min():cols.max() + 1]
+    edges_x = edges_x[rows.min():rows.max() + 2]
+    edges_y = edges_y[cols.min():cols.max() + 2]
+    factor = max(1, int(np.ceil(max(grid.shape[1:]) / max_bins)))
+    if factor > 1:
+        k, nx, ny = grid.shape
+        px, py = -nx % factor, -ny % factor
+        grid = np.pad(grid, ((0, 0), (0, px), (0, py)))
+        grid = grid.reshape(k, grid.shape[1] // factor, factor, grid.shape[2] // factor, factor).sum(axis=(2, 4))
+        step_x, step_y = edges_x[1] - edges_x[0], edges_y[1] - edges_y[0]
+        edges_x = edges_x[0] + np.arange(grid.shape[1] + 1) * step_x * factor
+        edges_y = edges_y[0] + np.arange(grid.shape[2] + 1) * step_y * factor
+    return grid, edges_x, edges_y
+
+def plot_pca(summary):
+    # Yoğunluk-kovalı saçılım: her dolu ızgara hücresi bir nokta, opaklık hücredeki satır sayısıyla artar
+    grid, edges_x, edges_y = _crop_grid(summary["pca_grid"], *summary["pca_edges"], PCA_DISPLAY_BINS)
+    cx = (edges_x[:-1] + edges_x[1:]) / 2
+    cy = (edges_y[:-1] + edges_y[1:]) / 2
+    plt.style.use('default')
+    fig, ax = plt.subplots(figsize=(8,6))
+    sns.set_theme(style="whitegrid")
+    for c, counts, color in zip(summary["classes"], grid, _colors(summary)):
+        i, j = np.nonzero(counts)
+        if len(i) == 0:
+            continue
+        weight = np.log1p(counts[i, j]) / np.log1p(counts.max())
+        rgba = np.tile(matplotlib.colors.to_rgba(color), (len(i), 1))
+        rgba[:, 3] = 0.35 + 0.65 * weight
+        ax.scatter(cx[i], cy[j], c=rgba, s=30, edgecolors="white", linewidths=0.5, label=c)
+    ax.legend(title="diagnosis")
+    explained = summary["pca_explained"]
+    ax.set_title("PCA 2D Projeksiyonu", fontsize=14, pad=20, color="#1B5E20")
+    ax.set_xlabel(f"PCA 1 (%{explained[0]*100:.1f})", fontsize=12, color="#424242")
+    ax.set_ylabel(f"PCA 2 (%{explained[1]*100:.1f})", fontsize=12, color="#424242")
+    plt.tight_layout()
+    return fig
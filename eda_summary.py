@@ -0,0 +1,238 @@
+# Veri Analizi sekmesi için toplama (aggregation) öncelikli EDA özetleri.
+#
+# Grafikler ham satırlardan değil, veri parça parça okunarak çıkarılan sabit boyutlu
+# özetlerden çizilir; bellek kullanımı bir parça + özetler kadardır, süre satır
+# sayısıyla doğrusal artar ve çizim süresi veri boyutundan bağımsızdır.
+#   1. geçiş: sınıf sayıları, özellik min/max, akışlı ortalama ve kovaryans
+#      (parçalar Chan birleştirmesiyle toplanır) -> korelasyon matrisi ve PCA eksenleri
+#   2. geçiş: sabit kenarlı histogramlar (görüntü + kutu grafiği/KDE için ince) ve
+#      PCA düzleminde sınıf başına 2B yoğunluk ızgarası
+#
+# Kullanım:
+#   python eda_summary.py data/data.csv
+#   python eda_summary.py tarama_gecmisi.parquet --chunk-rows 500000
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+import ingestion
+import metrics
+
+CHUNK_ROWS = 200_000
+LABEL_COLUMN = "diagnosis"
+CLASS_ORDER = ["B", "M"]
+UNLABELED = "Tümü"
+HIST_FEATURE = "radius_mean"
+HIST_BINS = 30
+FINE_BINS = 1024
+GRID_BINS = 512
+
+# ─────────────────────────── Okuma ──────────────────────────────────────
+def iter_chunks(path, features, chunk_rows=CHUNK_ROWS):
+    # (X float64 [n, d], etiketler) parçaları; etiket sütunu yoksa etiketler None
+    fmt = ingestion.detect_format(path)
+    if fmt == "csv":
+        header = pd.read_csv(path, nrows=0).columns
+        mapping = ingestion.map_columns(header, features)
+        label = next((c for c in header if str(c).strip().lower() == LABEL_COLUMN), None)
+        usecols = list(mapping.values()) + ([label] if label else [])
+        frames = pd.read_csv(path, usecols=usecols, chunksize=chunk_rows)
+    else:
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+
+        if fmt == "parquet":
+            # pre_buffer kapalı: satır grupları önceden tamponlanmaz, bellek bir parçayla sınırlı kalır
+            pf = pq.ParquetFile(path, pre_buffer=False, buffer_size=1 << 20)
+            names = pf.schema_arrow.names
+            mapping = ingestion.map_columns(names, features)
+            label = next((c for c in names if c.strip().lower() == LABEL_COLUMN), None)
+            columns = list(mapping.values()) + ([label] if label else [])
+            frames = (b.to_pandas() for b in pf.iter_batches(batch_size=chunk_rows, columns=columns))
+        else:
+            reader = ipc.open_file(path)
+            mapping = ingestion.map_columns(reader.schema.names, features)
+            label = next((c for c in reader.schema.names if c.strip().lower() == LABEL_COLUMN), None)
+            frames = (reader.get_batch(i).to_pandas() for i in range(reader.num_record_batches))
+    for frame in frames:
+        X = frame[[mapping[f] for f in features]].apply(pd.to_numeric, errors="coerce").to_numpy(np.float64)
+        labels = frame[label].astype(str).str.strip().to_numpy() if label else None
+        yield X, labels
+
+def _class_index(labels, classes, n):
+    if labels is None:
+        return np.zeros(n, dtype=np.intp)
+    idx = np.full(n, -1, dtype=np.intp)
+    for i, c in enumerate(classes):
+        idx[labels == c] = i
+    return idx
+
+# ─────────────────────────── Özet ───────────────────────────────────────
+def _merge_moments(n_a, mean_a, m2_a, X):
+    # Parçanın ortalama/kovaryans momentlerini biriken değerlere ekler (Chan vd.)
+    n_b = len(X)
+    if n_b == 0:
+        return n_a, mean_a, m2_a
+    mean_b = X.mean(axis=0)
+    Xc = X - mean_b
+    m2_b = Xc.T @ Xc
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + np.outer(delta, delta) * (n_a * n_b / n)
+    return n, mean, m2
+
+def _bin_index(values, edges):
+    # Eşit genişlikli kovalar için searchsorted yerine doğrudan hesap; sınırdaki değerler uç kovalara düşer
+    bins = len(edges) - 1
+    width = (edges[-1] - edges[0]) / bins or 1.0
+    return np.clip(((values - edges[0]) / width).astype(np.intp), 0, bins - 1)
+
+def _pca_axes(corr):
+    # Standartlaştırılmış veride PCA = korelasyon matrisinin özvektörleri
+    values, vectors = np.linalg.eigh(corr)
+    order = np.argsort(values)[::-1][:2]
+    W = vectors[:, order]
+    W *= np.sign(W[np.abs(W).argmax(axis=0), range(2)])  # yön sabitlenir; çizimler tekrarlanabilir olsun
+    return W, values[order] / values.sum()
+
+def summarize(path, features=None, chunk_rows=CHUNK_ROWS):
+    features = list(features or artifacts.load_features())
+    d = len(features)
+    hist_col = features.index(HIST_FEATURE)
+    start = time.perf_counter()
+
+    # 1. geçiş
+    classes = None
+    counts = None
+    n, mean, m2 = 0, np.zeros(d), np.zeros((d, d))
+    lo, hi = np.full(d, np.inf), np.full(d, -np.inf)
+    rows = dropped = 0
+    with metrics.span("eda_summary", step="moments"):
+        for X, labels in iter_chunks(path, features, chunk_rows):
+            if classes is None:
+                classes = CLASS_ORDER if labels is not None else [UNLABELED]
+                counts = np.zeros(len(classes), dtype=np.int64)
+            rows += len(X)
+            ok = np.isfinite(X).all(axis=1)
+            dropped += int((~ok).sum())
+            X = X[ok]
+            idx = _class_index(None if labels is None else labels[ok], classes, len(X))
+            counts += np.bincount(idx[idx >= 0], minlength=len(classes))
+            n, mean, m2 = _merge_moments(n, mean, m2, X)
+            if len(X):
+                lo, hi = np.minimum(lo, X.min(axis=0)), np.maximum(hi, X.max(axis=0))
+    if n < 2:
+        raise ValueError("EDA için en az iki geçerli satır gerekir")
+
+    cov = m2 / (n - 1)
+    std = np.sqrt(np.diag(cov))
+    std[std == 0] = 1.0
+    corr = cov / np.outer(std, std)
+    W, explained = _pca_axes(corr)
+
+    # 2. geçiş: kenarlar 1. geçişteki aralıklardan sabitlenir
+    hist_edges = np.linspace(lo[hist_col], hi[hist_col], HIST_BINS + 1)
+    fine_edges = np.linspace(lo[hist_col], hi[hist_col], FINE_BINS + 1)
+    # Her PC için |z·w| ≤ Σ|w_i|·max|z_i| sınırı; ızgara çizimde dolu hücrelere kırpılır
+    z_bound = np.maximum(np.abs(lo - mean), np.abs(hi - mean)) / std
+    pc_bound = np.abs(W).T @ z_bound
+    pc_edges = [np.linspace(-b, b, GRID_BINS + 1) for b in pc_bound]
+    k = len(classes)
+    hist = np.zeros((k, HIST_BINS), dtype=np.int64)
+    fine = np.zeros((k, FINE_BINS), dtype=np.int64)
+    grid = np.zeros((k, GRID_BINS, GRID_BINS), dtype=np.int64)
+    with metrics.span("eda_summary", step="binning"):
+        for X, labels in iter_chunks(path, features, chunk_rows):
+            ok = np.isfinite(X).all(axis=1)
+            X = X[ok]
+            idx = _class_index(None if labels is None else labels[ok], classes, len(X))
+            pcs = ((X - mean) / std) @ W
+            keep = idx >= 0
+            idx, v, pcs = idx[keep], X[keep, hist_col], pcs[keep]
+            # Sınıf ve kova indeksleri tek bir düz indekste birleştirilip bincount ile sayılır
+            hist += np.bincount(idx * HIST_BINS + _bin_index(v, hist_edges), minlength=hist.size).reshape(hist.shape)
+            fine += np.bincount(idx * FINE_BINS + _bin_index(v, fine_edges), minlength=fine.size).reshape(fine.shape)
+            cell = _bin_index(pcs[:, 0], pc_edges[0]) * GRID_BINS + _bin_index(pcs[:, 1], pc_edges[1])
+            grid += np.bincount(idx * GRID_BINS * GRID_BINS + cell, minlength=grid.size).reshape(grid.shape)
+
+    return {
+        "features": features,
+        "classes": classes,
+        "class_counts": counts,
+        "rows": rows,
+        "dropped_rows": dropped,
+        "mean": mean,
+        "std": std,
+        "corr": corr,
+        "pca_components": W,
+        "pca_explained": explained,
+        "hist_feature": HIST_FEATURE,
+        "hist_edges": hist_edges,
+        "hist": hist,
+        "fine_edges": fine_edges,
+        "fine_hist": fine,
+        "pca_edges": pc_edges,
+        "pca_grid": grid,
+        "seconds": time.perf_counter() - start,
+    }
+
+# ─────────────────────────── Türetilen İstatistikler ────────────────────
+def hist_quantiles(counts, edges, qs):
+    # Histogram üzerinden doğrusal aradeğerlemeyle yaklaşık yüzdelikler (hata ≤ bir kova genişliği)
+    cum = np.concatenate([[0], np.cumsum(counts)])
+    return np.interp(np.asarray(qs) * cum[-1], cum, edges)
+
+def box_stats(counts, edges, label):
+    # matplotlib Axes.bxp için kutu grafiği istatistikleri; uç değerler kova merkezleri olarak verilir
+    q1, med, q3 = hist_quantiles(counts, edges, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    centers = (edges[:-1] + edges[1:]) / 2
+    present = centers[counts > 0]
+    inside = present[(present >= q1 - 1.5 * iqr) & (present <= q3 + 1.5 * iqr)]
+    whislo, whishi = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+    return {
+        "label": label, "q1": q1, "med": med, "q3": q3,
+        "whislo": min(whislo, q1), "whishi": max(whishi, q3),
+        "fliers": present[(present < whislo) | (present > whishi)],
+    }
+
+def binned_kde(counts, edges):
+    # İnce histogramın Gauss çekirdeğiyle yumuşatılması (Scott bant genişliği); yoğunluk döner
+    n = counts.sum()
+    centers = (edges[:-1] + edges[1:]) / 2
+    if n < 2:
+        return centers, np.zeros_like(centers)
+    width = edges[1] - edges[0]
+    mu = (counts * centers).sum() / n
+    sigma = np.sqrt((counts * (centers - mu) ** 2).sum() / (n - 1))
+    bandwidth = max(1.06 * sigma * n ** (-1 / 5), width)
+    half = int(np.ceil(4 * bandwidth / width))
+    x = np.arange(-half, half + 1) * width
+    kernel = np.exp(-0.5 * (x / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    # Tam evrişimin ortası alınır: çekirdek kova sayısından uzun olsa da (küçük, geniş yayılımlı
+    # sınıf) çıktı her zaman kova sayısı kadardır; mode="same" bu durumda çekirdek boyunu döndürür
+    density = np.convolve(counts, kernel)[half:half + len(counts)] / (n * width)
+    return centers, density
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parçalı okuma ile EDA özetleri")
+    parser.add_argument("data")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    s = summarize(args.data, chunk_rows=args.chunk_rows)
+    print(json.dumps({
+        "rows": s["rows"],
+        "dropped_rows": s["dropped_rows"],
+        "class_counts": dict(zip(s["classes"], s["class_counts"].tolist())),
+        "pca_explained": s["pca_explained"].round(4).tolist(),
+        "seconds": round(s["seconds"], 3),
+        "rows_per_sec": round(s["rows"] / s["seconds"]),
+    }, ensure_ascii=False, indent=2))
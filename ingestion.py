@@ -0,0 +1,226 @@
+# Tahmin girdileri için sütunsal (Arrow) okuma ve vektörel doğrulama katmanı.
+#
+# CSV, Parquet ve Arrow IPC (Feather) dosyaları pyarrow ile parça parça okunur.
+# Sütunlar sıraya göre değil ada göre (büyük/küçük harf ve boşluk/alt çizgi farkı
+# gözetmeden) FEATURES ile eşleştirilir; fazladan sütunlar (id, diagnosis vb.)
+# hiç ayrıştırılmaz. Tamsayı sütunlar float64'e dönüştürülür. Eksik, sayısal
+# olmayan, sonsuz ve negatif değerler tek bir vektörel geçişte bulunur ve ilk
+# hatada durmak yerine satır bazında bir hata raporu üretilir.
+
+import csv
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+BATCH_SIZE = 10_000
+CSV_BLOCK_SIZE = 4 << 20
+
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+UPLOAD_TYPES = [ext.lstrip(".") for ext in FORMATS]
+
+# Hata kodları (bit maskesi)
+MISSING = 1
+NON_NUMERIC = 2
+NEGATIVE = 4
+INFINITE = 8
+ERROR_MESSAGES = {
+    MISSING: "eksik değer",
+    NON_NUMERIC: "sayısal olmayan değer",
+    NEGATIVE: "negatif değer",
+    INFINITE: "sonsuz değer",
+}
+
+def detect_format(name):
+    fmt = FORMATS.get(os.path.splitext(str(name))[1].lower())
+    if fmt is None:
+        raise ValueError(f"Hata: Desteklenmeyen dosya türü. Desteklenenler: {', '.join(UPLOAD_TYPES)}")
+    return fmt
+
+def _normalize(name):
+    return "".join(str(name).lower().replace("_", " ").split())
+
+def map_columns(columns, features):
+    # FEATURES içindeki her ada karşılık gelen dosya sütununu bulur
+    by_key = {}
+    for col in columns:
+        by_key.setdefault(_normalize(col), col)
+    mapping = {f: by_key.get(_normalize(f)) for f in features}
+    missing = [f for f, col in mapping.items() if col is None]
+    if missing:
+        raise ValueError(f"Hata: Dosyada bulunmayan özellik sütunları: {', '.join(missing)}")
+    return mapping
+
+# ─────────────────────────── Okuma ──────────────────────────────────────
+def _csv_header(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), [])
+    else:
+        pos = source.tell()
+        line = source.readline()
+        source.seek(pos)
+        if isinstance(line, bytes):
+            line = line.decode("utf-8-sig")
+        header = next(csv.reader(io.StringIO(line)), [])
+    # Başlıktaki sondaki virgül (data.csv'deki gibi) satırlarda karşılığı olmayan boş bir sütun üretir
+    while header and not header[-1].strip():
+        header.pop()
+    return header
+
+def _csv_batches(source, features):
+    header = _csv_header(source)
+    mapping = map_columns(header, features)
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE, column_names=header, skip_rows=1),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(mapping.values()),
+            column_types={col: pa.float64() for col in mapping.values()},
+        ),
+    )
+    for batch in reader:
+        yield batch, mapping
+
+def _csv_text_batches(source, features, batch_size):
+    # Yavaş ama hoşgörülü yol: hücreler metin olarak okunur, eksik alanlı satırlar da kabul edilir
+    header = _csv_header(source)
+    mapping = map_columns(header, features)
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    for chunk in pd.read_csv(source, usecols=list(mapping.values()), dtype=str, chunksize=batch_size):
+        yield pa.RecordBatch.from_pandas(chunk, preserve_index=False), mapping
+
+def _table_batches(source, fmt, features, batch_size):
+    if fmt == "parquet":
+        pf = pq.ParquetFile(source)
+        mapping = map_columns(pf.schema_arrow.names, features)
+        for batch in pf.iter_batches(batch_size=batch_size, columns=list(mapping.values())):
+            yield batch, mapping
+        return
+    try:
+        reader = ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        schema = reader.schema
+    except pa.ArrowInvalid:
+        # Dosya biçimi değil akış (stream) biçimi olabilir
+        if not isinstance(source, (str, os.PathLike)):
+            source.seek(0)
+        reader = ipc.open_stream(source)
+        batches, schema = reader, reader.schema
+    mapping = map_columns(schema.names, features)
+    for batch in batches:
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size), mapping
+
+def _to_float(column):
+    # (float64 dizi, sayısal olmayan maskesi) döner; boş (null) değerler NaN olur
+    try:
+        return pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False), None
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Metin sütununda sayıya çevrilemeyen hücreler tek tek işaretlenir
+        values = column.to_pandas()
+        numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+        non_numeric = np.isnan(numeric) & values.notna().to_numpy() & (values.astype(str).str.strip() != "").to_numpy()
+        return numeric, non_numeric
+
+def to_matrix(batch, mapping, features):
+    X = np.empty((batch.num_rows, len(features)), dtype=np.float64)
+    non_numeric = None
+    for j, f in enumerate(features):
+        values, bad = _to_float(batch.column(mapping[f]))
+        X[:, j] = values
+        if bad is not None and bad.any():
+            if non_numeric is None:
+                non_numeric = np.zeros(X.shape, dtype=bool)
+            non_numeric[:, j] = bad
+    return X, non_numeric
+
+def iter_feature_batches(source, features, fmt="csv", batch_size=BATCH_SIZE):
+    # (satır ofseti, X, sayısal olmayan maskesi) üçlüleri döner
+    if fmt != "csv":
+        offset = 0
+        for batch, mapping in _table_batches(source, fmt, features, batch_size):
+            X, non_numeric = to_matrix(batch, mapping, features)
+            yield offset, X, non_numeric
+            offset += len(X)
+        return
+
+    # Hızlı yol: özellik sütunları pyarrow ile doğrudan float64 olarak ayrıştırılır. Dosyada
+    # sayısal olmayan bir hücre veya bozuk bir satır varsa ayrıştırma durur; bu durumda dosya
+    # metin olarak baştan okunur, daha önce döndürülmüş satırlar atlanır ve hatalı hücreler
+    # raporlanır.
+    emitted = 0
+    try:
+        for batch, mapping in _csv_batches(source, features):
+            X, non_numeric = to_matrix(batch, mapping, features)
+            yield emitted, X, non_numeric
+            emitted += len(X)
+        return
+    except pa.ArrowInvalid:
+        if not isinstance(source, (str, os.PathLike)):
+            source.seek(0)
+
+    offset = 0
+    for batch, mapping in _csv_text_batches(source, features, batch_size):
+        if offset + batch.num_rows <= emitted:
+            offset += batch.num_rows
+            continue
+        if offset < emitted:
+            batch = batch.slice(emitted - offset)
+            offset = emitted
+        X, non_numeric = to_matrix(batch, mapping, features)
+        yield offset, X, non_numeric
+        offset += len(X)
+
+# ─────────────────────────── Doğrulama ──────────────────────────────────
+def validate(X, non_numeric=None):
+    # Tek geçişte hücre bazında hata kodları; geçerli satırlar için maske ve
+    # yalnızca hatalı satırlar için kodlar döner
+    with np.errstate(invalid="ignore"):
+        ok = X >= 0  # NaN ve negatifler için False
+        ok &= X < np.inf
+    if non_numeric is not None:
+        ok &= ~non_numeric
+    valid = ok.all(axis=1)
+    if valid.all():
+        return valid, None
+
+    bad_rows = np.flatnonzero(~valid)
+    Xb = X[bad_rows]
+    codes = np.zeros(Xb.shape, dtype=np.uint8)
+    nan = np.isnan(Xb)
+    if non_numeric is not None:
+        nn = non_numeric[bad_rows]
+        codes[nn] |= NON_NUMERIC
+        nan &= ~nn
+    codes[nan] |= MISSING
+    with np.errstate(invalid="ignore"):
+        codes[Xb < 0] |= NEGATIVE
+    codes[np.isinf(Xb) & (Xb > 0)] |= INFINITE
+    return valid, (bad_rows, codes)
+
+def error_report(offset, bad, features):
+    # Hatalı satırlar için okunabilir rapor: satır, sütun, hata
+    bad_rows, codes = bad
+    rows, cols = np.nonzero(codes)
+    return pd.DataFrame({
+        "satir": bad_rows[rows] + offset,
+        "sutun": np.asarray(features, dtype=object)[cols],
+        "hata": [ERROR_MESSAGES.get(int(c), " + ".join(m for k, m in ERROR_MESSAGES.items() if c & k)) for c in codes[rows, cols]],
+    })
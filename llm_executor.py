@@ -0,0 +1,154 @@
+# SağlıkGPT zinciri için paylaşılan asenkron yürütme katmanı.
+#
+# Her Streamlit oturumu kendi iş parçacığında çalışır; aynı anda gelen aynı sorular
+# için her oturum ayrı retrieval ve Gemini isteği yapıyordu. CoalescingExecutor:
+#   - Süreç başına tek bir asyncio olay döngüsünü arka plan iş parçacığında çalıştırır;
+#     zincir bu döngüde astream ile çağrıldığından LLM istemcisi (bağlantı havuzu)
+#     tüm oturumlarca paylaşılır,
+#   - Aynı anahtarla (namespace + normalize edilmiş soru) devam eden bir çağrı varsa
+#     yeni istek ona abone olur; üst akışa tek istek gider, parçalar tüm abonelere
+#     (geç katılanlara baştan itibaren) iletilir,
+#   - Eşzamanlı üst akış çağrılarını bir semafor ile sınırlar; sırada bekleme ve çağrı
+#     süresi için zaman aşımı uygular.
+# Senkron taraf (Streamlit) parçaları sıradan bir üreteç gibi tüketir.
+
+import asyncio
+import queue
+import threading
+
+MAX_CONCURRENCY = 4
+QUEUE_TIMEOUT_SEC = 30.0
+CALL_TIMEOUT_SEC = 60.0
+
+_END = object()
+
+class ExecutorBusy(TimeoutError):
+    # Eşzamanlılık sınırı dolu ve sıra bekleme süresi aşıldı
+    pass
+
+class _Broadcast:
+    def __init__(self):
+        self.chunks = []
+        self.subscribers = []
+        self.done = False
+
+class CoalescingExecutor:
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, queue_timeout=QUEUE_TIMEOUT_SEC, call_timeout=CALL_TIMEOUT_SEC):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.active = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self._inflight = {}
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        started = threading.Event()
+        threading.Thread(target=self._run_loop, args=(started,), daemon=True, name="llm-executor").start()
+        started.wait()
+
+    def _run_loop(self, started):
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop.call_soon(started.set)
+        self._loop.run_forever()
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def run(self, coro, timeout=None):
+        # Paylaşılan döngüde tek seferlik bir eşyordam çalıştırır (ör. istemci kurulumu)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    # ─────────────────────── Döngü iş parçacığı ─────────────────────────
+    def _subscribe(self, key, factory, q):
+        # Yalnızca döngü iş parçacığında çalışır; _inflight'a erişim bu yüzden kilitsizdir
+        broadcast = self._inflight.get(key)
+        if broadcast is not None:
+            self.coalesced += 1
+            for chunk in broadcast.chunks:
+                q.put(chunk)
+            broadcast.subscribers.append(q)
+            return
+        broadcast = self._inflight[key] = _Broadcast()
+        broadcast.subscribers.append(q)
+        self._loop.create_task(self._lead(key, factory, broadcast))
+
+    def _publish(self, broadcast, item):
+        for q in broadcast.subscribers:
+            q.put(item)
+
+    async def _lead(self, key, factory, broadcast):
+        try:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise ExecutorBusy("SağlıkGPT şu anda yoğun, lütfen biraz sonra tekrar deneyin.")
+            finally:
+                self.waiting -= 1
+            try:
+                self.active += 1
+                self.upstream_calls += 1
+                async with asyncio.timeout(self.call_timeout):
+                    async for chunk in factory():
+                        broadcast.chunks.append(chunk)
+                        self._publish(broadcast, chunk)
+            except TimeoutError:
+                self.timeouts += 1
+                raise
+            finally:
+                self.active -= 1
+                self._semaphore.release()
+            self._publish(broadcast, _END)
+        except BaseException as e:
+            self._publish(broadcast, e)
+        finally:
+            broadcast.done = True
+            # Tamamlanan çağrı yeni isteklere kapanır; sonraki aynı soru önbellekten gelir
+            if self._inflight.get(key) is broadcast:
+                del self._inflight[key]
+
+    # ─────────────────────── Senkron arayüz ─────────────────────────────
+    def stream(self, key, factory):
+        # factory() bir async iterator döndürür (ör. lambda: chain.astream(inputs))
+        q = queue.Queue()
+        self._loop.call_soon_threadsafe(self._subscribe, key, factory, q)
+        deadline = self.queue_timeout + self.call_timeout + 5.0
+        while True:
+            try:
+                item = q.get(timeout=deadline)
+            except queue.Empty:
+                raise TimeoutError("SağlıkGPT yanıtı zaman aşımına uğradı.")
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def call(self, key, factory):
+        # factory() bir awaitable döndürür (ör. lambda: chain.ainvoke(inputs)); sonuç aynı şekilde paylaşılır
+        async def single():
+            yield await factory()
+        for result in self.stream(("call", key), single):
+            return result
+
+    def stats(self):
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "inflight_keys": len(self._inflight),
+        }
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,222 @@
+# Aşama bazlı gecikme ölçümü, Prometheus metin biçiminde dışa aktarım ve isteğe bağlı iz (trace) kaydı.
+#
+# Kod yolları `with metrics.span("inference"):` ile sarılır. Her span süresi sabit
+# kovalı bir histograma (app_stage_duration_seconds{stage="..."}) işlenir; maliyet
+# bir perf_counter çifti, bir ikili arama ve kısa bir kilittir (~1-2 µs), bu yüzden
+# üretimde açık bırakılabilir.
+#
+# `with metrics.trace("predict"):` bir isteğin kökünü açar. TRACE_LOG ortam değişkeni
+# bir dosya yolu gösteriyorsa istek içindeki tüm span'ler (ad, başlangıç ofseti, süre)
+# tek bir JSON satırı olarak bu dosyaya eklenir.
+#
+# Metrikler tahmin servisinde GET /metrics ile, Streamlit uygulamasında METRICS_PORT
+# (varsayılan 9108) üzerinde çalışan küçük bir HTTP sunucusuyla yayınlanır.
+
+import bisect
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Saniye cinsinden kova sınırları: mikro saniyelik ölçekleme adımından saniyelerce süren LLM yanıtına
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_METRIC = "app_stage_duration_seconds"
+ROWS_METRIC = "app_rows_total"
+METRICS_PORT = 9108
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ─────────────────────────── Metrik Türleri ─────────────────────────────
+def _label_text(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+def _format(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (list(c), s, n) for key, (c, s, n) in self._series.items()}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, n) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', _format(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(key)} {_format(total)}")
+            lines.append(f"{self.name}_count{_label_text(key)} {n}")
+        return lines
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines += [f"{self.name}{_label_text(key)} {_format(value)}" for key, value in values]
+        return lines
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+STAGES = Histogram(STAGE_METRIC, "Aşama başına süre (saniye)")
+ROWS = Counter(ROWS_METRIC, "Aşamalarda işlenen satır sayısı")
+_METRICS = [STAGES, ROWS]
+
+def register(metric):
+    # Başka modüllerin metrikleri (ör. drift_monitor) aynı /metrics çıktısına eklenir
+    _METRICS.append(metric)
+    return metric
+
+def render():
+    lines = []
+    for metric in _METRICS:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+def observe(stage, seconds, **labels):
+    # Süresi başka yerde ölçülmüş (ör. akış halinde gelen yanıt) aşamalar için
+    STAGES.observe(seconds, stage=stage, **labels)
+    current = _TRACE.get()
+    if current is not None:
+        current["spans"].append({
+            "name": stage,
+            "start_ms": round((time.perf_counter() - seconds - current["t0"]) * 1000, 3),
+            "ms": round(seconds * 1000, 3),
+        })
+
+def count_rows(stage, n):
+    ROWS.inc(n, stage=stage)
+
+# ─────────────────────────── Span ve İz ─────────────────────────────────
+_TRACE = contextvars.ContextVar("trace", default=None)
+
+@contextmanager
+def span(stage, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        STAGES.observe(end - start, stage=stage, **labels)
+        current = _TRACE.get()
+        if current is not None:
+            current["spans"].append({
+                "name": stage,
+                "start_ms": round((start - current["t0"]) * 1000, 3),
+                "ms": round((end - start) * 1000, 3),
+            })
+
+_trace_lock = threading.Lock()
+
+@contextmanager
+def trace(kind, **attrs):
+    # İç içe çağrılarda dıştaki iz kullanılır; yalnızca kök iz kaydedilir
+    if _TRACE.get() is not None:
+        with span(kind):
+            yield
+        return
+    current = {"t0": time.perf_counter(), "spans": []}
+    token = _TRACE.set(current)
+    try:
+        with span(kind):
+            yield
+    finally:
+        _TRACE.reset(token)
+        path = os.getenv("TRACE_LOG")
+        if path:
+            record = {
+                "trace_id": uuid.uuid4().hex,
+                "kind": kind,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "total_ms": round((time.perf_counter() - current["t0"]) * 1000, 3),
+                **attrs,
+                "spans": current["spans"],
+            }
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with _trace_lock, open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+# ─────────────────────────── HTTP Uç Noktası ────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+
+def start_server(port=None, host="127.0.0.1"):
+    # Süreç başına tek sunucu; port doluysa (ör. başka bir Streamlit süreci) None döner
+    global _server
+    if _server is not None:
+        return _server
+    port = int(port or os.getenv("METRICS_PORT", METRICS_PORT))
+    try:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError:
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-http").start()
+    return _server
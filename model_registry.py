@@ -0,0 +1,287 @@
+# Sürümlü model artefakt kaydı ve çalışan süreçleri yeniden başlatmadan model değiştirme.
+#
+# model_registry.json her sürüm için artefakt dosyalarını (model, scaler, eşik, özellik
+# sırası) ve SHA-256 özetlerini tutar; "active" alanı kullanılacak sürümü belirtir.
+# Yükleme sırasında özetler doğrulanır, değişmiş veya bozulmuş bir dosya reddedilir.
+#
+# ModelStore, sunulan sürümü (ModelBundle) tek bir referans olarak tutar. Yeni sürüm
+# arka plan iş parçacığında yüklenir, birkaç örnek tahminle ısıtılır ve ardından
+# referans tek atamayla değiştirilir. Devam eden istekler başlarken aldıkları eski
+# bundle ile tamamlanır; eski bundle'a referans kalmayınca bellek geri kazanılır.
+#
+# Kullanım:
+#   python model_registry.py list
+#   python model_registry.py register v2 --dir models/v2 --note "yeni eğitim"
+#   python model_registry.py activate v2
+#   python model_registry.py verify v2
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import artifacts
+import metrics
+from numpy_mlp import file_sha256
+
+REGISTRY_PATH = "model_registry.json"
+ARTIFACT_FILES = {
+    "model": os.path.basename(artifacts.MODEL_PATH),
+    "scaler": os.path.basename(artifacts.SCALER_PATH),
+    "threshold": os.path.basename(artifacts.THRESHOLD_PATH),
+    "features": os.path.basename(artifacts.FEATURES_PATH),
+}
+# Isınma tahminleri için örnek satırlar
+WARMUP_PATHS = ["data/iyi.csv", "data/kotu.csv"]
+WATCH_INTERVAL_SEC = 5.0
+
+logger = logging.getLogger("model_registry")
+
+# ─────────────────────────── Kayıt Dosyası ──────────────────────────────
+def load_registry(path=REGISTRY_PATH):
+    if not os.path.exists(path):
+        # Kayıt yoksa kök dizindeki sabit artefaktlar tek sürüm olarak kabul edilir
+        return {"active": "default", "versions": {"default": {
+            "files": {
+                "model": artifacts.MODEL_PATH,
+                "scaler": artifacts.SCALER_PATH,
+                "threshold": artifacts.THRESHOLD_PATH,
+                "features": artifacts.FEATURES_PATH,
+            },
+            "sha256": None,
+        }}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_registry(registry, path=REGISTRY_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(registry, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+def active_version(path=REGISTRY_PATH):
+    return load_registry(path)["active"]
+
+def version_entry(version=None, path=REGISTRY_PATH):
+    registry = load_registry(path)
+    version = version or registry["active"]
+    if version not in registry["versions"]:
+        raise KeyError(f"Kayıtlı olmayan model sürümü: {version}")
+    return version, registry["versions"][version]
+
+def checksums(files):
+    return {kind: file_sha256(p) for kind, p in files.items()}
+
+def verify(entry):
+    # Kayıttaki özetlerle eşleşmeyen dosya varsa ValueError
+    if not entry.get("sha256"):
+        return
+    actual = checksums(entry["files"])
+    changed = [kind for kind, digest in entry["sha256"].items() if actual.get(kind) != digest]
+    if changed:
+        raise ValueError(f"Artefakt özeti kayıtla eşleşmiyor: {', '.join(changed)}")
+
+def register(version, files, note="", activate=False, path=REGISTRY_PATH):
+    missing = [k for k in ARTIFACT_FILES if k not in files]
+    if missing:
+        raise ValueError(f"Eksik artefakt dosyaları: {', '.join(missing)}")
+    registry = load_registry(path) if os.path.exists(path) else {"active": version, "versions": {}}
+    if version in registry["versions"]:
+        raise ValueError(f"Bu sürüm zaten kayıtlı: {version}")
+    registry["versions"][version] = {
+        "files": {k: files[k] for k in ARTIFACT_FILES},
+        "sha256": checksums({k: files[k] for k in ARTIFACT_FILES}),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "note": note,
+    }
+    if activate:
+        registry["active"] = version
+    save_registry(registry, path)
+    return registry["versions"][version]
+
+def activate(version, path=REGISTRY_PATH):
+    registry = load_registry(path)
+    if version not in registry["versions"]:
+        raise KeyError(f"Kayıtlı olmayan model sürümü: {version}")
+    verify(registry["versions"][version])
+    registry["active"] = version
+    save_registry(registry, path)
+
+# ─────────────────────────── Yükleme ────────────────────────────────────
+@dataclass
+class ModelBundle:
+    version: str
+    model: object
+    scaler: object
+    threshold: float
+    features: list
+    loaded_at: float = field(default_factory=time.time)
+
+    def predict_proba(self, X):
+        with metrics.span("scaling"):
+            X_scaled = self.scaler.transform(X)
+        with metrics.span("inference"):
+            prob = np.asarray(self.model.predict_on_batch(X_scaled)).reshape(-1)
+        metrics.count_rows("inference", len(prob))
+        return prob
+
+def load_bundle(version=None, path=REGISTRY_PATH, engine=None):
+    version, entry = version_entry(version, path)
+    verify(entry)
+    files = entry["files"]
+    model, scaler, threshold, features = artifacts.load_artifacts(
+        files["model"], files["scaler"], files["threshold"], files["features"], engine=engine)
+    return ModelBundle(version, model, scaler, threshold, features)
+
+def warm_up(bundle):
+    # İlk çağrı maliyeti (graf izleme, bellek ayırma) istek yolunda ödenmesin; çıktılar da denetlenir
+    import pandas as pd
+
+    frames = [pd.read_csv(p) for p in WARMUP_PATHS if os.path.exists(p)]
+    X = pd.concat(frames, ignore_index=True)[bundle.features] if frames else pd.DataFrame(
+        np.ones((2, len(bundle.features))), columns=bundle.features)
+    for n in (1, len(X)):
+        prob = bundle.predict_proba(X.iloc[:n])
+        if not np.all(np.isfinite(prob)) or prob.min() < 0 or prob.max() > 1:
+            raise ValueError(f"Isınma tahminleri geçersiz ({bundle.version})")
+
+class ModelStore:
+    def __init__(self, bundle, registry_path=REGISTRY_PATH, engine=None):
+        self._bundle = bundle
+        self.registry_path = registry_path
+        self.engine = engine
+        self.loading = None
+        self.last_error = None
+        self.swaps = 0
+        self._released = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, version=None, registry_path=REGISTRY_PATH, engine=None):
+        bundle = load_bundle(version, registry_path, engine)
+        warm_up(bundle)
+        return cls(bundle, registry_path, engine)
+
+    def current(self):
+        # İstek başında bir kez alınır; istek boyunca aynı sürüm kullanılır
+        return self._bundle
+
+    @property
+    def version(self):
+        return self._bundle.version
+
+    def swap(self, bundle):
+        old = self._bundle
+        self._bundle = bundle
+        self.swaps += 1
+        # Eski bundle'ı tutan son istek bittiğinde serbest kalır; gc çevrimleri de toplanır
+        self._released = weakref.ref(old.model) if _weakrefable(old.model) else None
+        del old
+        gc.collect()
+        logger.info("Model sürümü değişti: %s", bundle.version)
+
+    def reload(self, version=None, background=True):
+        # Aynı anda tek yükleme; istenen sürüm zaten sunuluyorsa veya yükleniyorsa bir şey yapılmaz
+        version = version or active_version(self.registry_path)
+        with self._lock:
+            if version == self.version or self.loading is not None:
+                return False
+            self.loading = version
+        if not background:
+            self._load(version)
+            return True
+        threading.Thread(target=self._load, args=(version,), daemon=True, name=f"model-load-{version}").start()
+        return True
+
+    def _load(self, version):
+        start = time.perf_counter()
+        try:
+            bundle = load_bundle(version, self.registry_path, self.engine)
+            with metrics.span("model_warmup"):
+                warm_up(bundle)
+            self.swap(bundle)
+            self.last_error = None
+            logger.info("%s %.2fs içinde yüklendi ve ısıtıldı", version, time.perf_counter() - start)
+        except Exception as e:
+            # Yeni sürüm yüklenemezse eski sürüm sunulmaya devam eder
+            self.last_error = f"{version}: {e}"
+            logger.exception("Model sürümü yüklenemedi: %s", version)
+        finally:
+            with self._lock:
+                self.loading = None
+
+    def follow_registry(self):
+        # Kayıttaki aktif sürüm değiştiyse arka planda yükler (her Streamlit çalıştırmasında ucuz bir okuma)
+        try:
+            return self.reload(active_version(self.registry_path))
+        except (OSError, ValueError, KeyError) as e:
+            self.last_error = str(e)
+            return False
+
+    def watch(self, interval=WATCH_INTERVAL_SEC):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.follow_registry()
+        threading.Thread(target=loop, daemon=True, name="model-registry-watch").start()
+
+    def status(self):
+        released = None
+        if self._released is not None:
+            released = self._released() is None
+        return {
+            "version": self.version,
+            "loaded_at": self._bundle.loaded_at,
+            "loading": self.loading,
+            "swaps": self.swaps,
+            "previous_released": released,
+            "last_error": self.last_error,
+        }
+
+def _weakrefable(obj):
+    try:
+        weakref.ref(obj)
+        return True
+    except TypeError:
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sürümlü model artefakt kaydı")
+    parser.add_argument("command", choices=["list", "register", "activate", "verify"])
+    parser.add_argument("version", nargs="?")
+    parser.add_argument("--dir", help="Artefakt dosyalarının bulunduğu dizin (register)")
+    parser.add_argument("--note", default="")
+    parser.add_argument("--activate", action="store_true", help="Kaydettikten sonra aktif sürüm yap")
+    parser.add_argument("--registry", default=REGISTRY_PATH)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "list":
+            registry = load_registry(args.registry)
+            for name, entry in registry["versions"].items():
+                mark = "*" if name == registry["active"] else " "
+                print(f"{mark} {name:20s} {entry.get('created', ''):20s} {entry['files']['model']}  {entry.get('note', '')}")
+        elif args.command == "register":
+            if not args.version or not args.dir:
+                parser.error("register için sürüm adı ve --dir gerekir")
+            files = {k: os.path.join(args.dir, name) for k, name in ARTIFACT_FILES.items()}
+            register(args.version, files, args.note, args.activate, args.registry)
+            print(f"Kaydedildi: {args.version}")
+        elif args.command == "activate":
+            activate(args.version, args.registry)
+            print(f"Aktif sürüm: {args.version}")
+        else:
+            verify(version_entry(args.version, args.registry)[1])
+            print("Özetler eşleşiyor")
+    except (ValueError, KeyError, OSError) as e:
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,206 @@
+# TensorFlow olmadan çalışan, saf NumPy ile MLP ileri geçişi.
+#
+# breast_mlp.h5 içindeki katman ağırlıkları ve aktivasyonları (h5py ile, Keras
+# yüklenmeden) ve scaler.pkl içindeki StandardScaler parametreleri tek bir
+# sıkıştırılmış dizi dosyasına (breast_mlp.npz) aktarılır. Aktarım sırasında:
+#   - StandardScaler (x - mean) / scale dönüşümü ilk Dense katmanına gömülür,
+#   - BatchNormalization katmanları (çıkarım modunda afin dönüşüm) bir sonraki Dense katmanına katlanır;
+#     arada bir Activation katmanı varsa katlama yanlış olacağından aktarım hata verir,
+#   - Dropout katmanları çıkarımda etkisiz olduğundan atlanır.
+# Sonuçta tahmin, ham özellikler üzerinde yalnızca birkaç matris çarpımıdır.
+#
+# Kullanım:
+#   python numpy_mlp.py export   # breast_mlp.npz üretir
+#   python numpy_mlp.py verify   # Keras çıktılarıyla data/data.csv üzerinde karşılaştırır
+
+import argparse
+import hashlib
+import json
+import sys
+
+import numpy as np
+
+NPZ_PATH = "breast_mlp.npz"
+TOLERANCE = 1e-4
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+# ─────────────────────────── Aktivasyonlar ──────────────────────────────
+def _sigmoid(x):
+    # exp taşmasını önlemek için tanh ile yazılmış kararlı sigmoid
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softmax": _softmax,
+}
+
+# ─────────────────────────── Çıkarım ────────────────────────────────────
+class NumpyMLP:
+    def __init__(self, weights, biases, activations):
+        self.weights = weights
+        self.biases = biases
+        self.activations = activations
+        self._fns = [ACTIVATIONS[a] for a in activations]
+        self.n_features = weights[0].shape[0]
+
+    @classmethod
+    def load(cls, path=NPZ_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            n = int(data["n_layers"])
+            weights = [data[f"W{i}"] for i in range(n)]
+            biases = [data[f"b{i}"] for i in range(n)]
+            activations = [str(a) for a in data["activations"]]
+        return cls(weights, biases, activations)
+
+    def predict_on_batch(self, X):
+        # Girdi ham (ölçeklenmemiş) özelliklerdir; scaler ilk katmana gömülüdür
+        h = np.asarray(X, dtype=self.weights[0].dtype)
+        for W, b, fn in zip(self.weights, self.biases, self._fns):
+            h = fn(h @ W + b)
+        return h
+
+    def predict(self, X, **kwargs):
+        return self.predict_on_batch(X)
+
+class IdentityScaler:
+    # Scaler ağırlıklara gömüldüğünde mevcut scaler.transform + model çağrı düzeni
+    # değişmeden kalsın diye kullanılan geçiş nesnesi
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float32)
+
+# ─────────────────────────── Aktarım ────────────────────────────────────
+def _read_layer_weights(h5, name):
+    weights = {}
+    group = h5["model_weights"][name]
+    group.visititems(lambda key, obj: weights.__setitem__(key.split("/")[-1].split(":")[0], obj[()])
+                     if hasattr(obj, "shape") else None)
+    return weights
+
+def _layer_configs(h5):
+    config = h5.attrs["model_config"]
+    if isinstance(config, bytes):
+        config = config.decode("utf-8")
+    config = json.loads(config)["config"]
+    layers = config["layers"]
+    # Functional modellerde yalnızca doğrusal zincir (her katman bir öncekine bağlı) desteklenir
+    names = [l["config"]["name"] for l in layers]
+    for prev, layer in zip(names, layers[1:]):
+        inbound = json.dumps(layer.get("inbound_nodes", []))
+        if inbound != "[]" and f'"{prev}"' not in inbound:
+            raise ValueError(f"Doğrusal olmayan model yapısı desteklenmiyor: {layer['config']['name']}")
+    return layers
+
+def export(h5_path="breast_mlp.h5", scaler_path="scaler.pkl", out_path=NPZ_PATH):
+    import h5py
+    import joblib
+
+    scaler = joblib.load(scaler_path)
+    mean = np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_), dtype=np.float64)
+    scale = np.asarray(scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_), dtype=np.float64)
+
+    # Bir sonraki Dense katmanına katlanacak bekleyen afin dönüşüm: x -> x * a + c
+    a = 1.0 / scale
+    c = -mean / scale
+
+    weights, biases, activations = [], [], []
+    # Henüz bir Dense'e katlanmamış BatchNormalization katmanının adı
+    pending_bn = None
+    with h5py.File(h5_path, "r") as h5:
+        for layer in _layer_configs(h5):
+            kind = layer["class_name"]
+            cfg = layer["config"]
+            if kind in ("InputLayer", "Dropout"):
+                continue
+            w = _read_layer_weights(h5, cfg["name"])
+            if kind == "BatchNormalization":
+                gamma = w.get("gamma", np.ones_like(w["moving_mean"]))
+                beta = w.get("beta", np.zeros_like(w["moving_mean"]))
+                bn_a = gamma / np.sqrt(w["moving_variance"] + cfg["epsilon"])
+                bn_c = beta - w["moving_mean"] * bn_a
+                a, c = a * bn_a, c * bn_a + bn_c
+                pending_bn = cfg["name"]
+            elif kind == "Dense":
+                W = w["kernel"].astype(np.float64)
+                b = w["bias"].astype(np.float64) if "bias" in w else np.zeros(W.shape[1])
+                weights.append(a[:, None] * W)
+                biases.append(c @ W + b)
+                activations.append(cfg.get("activation", "linear"))
+                a, c = np.ones(W.shape[1]), np.zeros(W.shape[1])
+                pending_bn = None
+            elif kind == "Activation":
+                # BN -> Activation -> Dense: aktivasyon doğrusal olmadığından BN sonraki Dense'e katlanamaz
+                if pending_bn is not None:
+                    raise ValueError(f"BatchNormalization ({pending_bn}) ile sonraki Dense arasında aktivasyon "
+                                     f"desteklenmiyor: {cfg['name']}")
+                if activations[-1] != "linear":
+                    raise ValueError(f"Art arda aktivasyon desteklenmiyor: {cfg['name']}")
+                activations[-1] = cfg["activation"]
+            else:
+                raise ValueError(f"Desteklenmeyen katman türü: {kind}")
+
+    # Ağ bir normalizasyon katmanıyla bitiyorsa kalan afin dönüşüm köşegen bir katman olarak eklenir
+    if not (np.allclose(a, 1) and np.allclose(c, 0)):
+        weights.append(np.diag(a))
+        biases.append(c)
+        activations.append("linear")
+
+    arrays = {"n_layers": np.array(len(weights)), "activations": np.array(activations)}
+    for i, (W, b) in enumerate(zip(weights, biases)):
+        arrays[f"W{i}"] = W.astype(np.float32)
+        arrays[f"b{i}"] = b.astype(np.float32)
+    arrays["source_sha256"] = np.array([file_sha256(h5_path), file_sha256(scaler_path)])
+    np.savez_compressed(out_path, **arrays)
+    return out_path
+
+def is_current(npz_path=NPZ_PATH, h5_path="breast_mlp.h5", scaler_path="scaler.pkl"):
+    # .npz dosyası, kaynak .h5 ve .pkl dosyalarından üretildiyse güncel kabul edilir
+    try:
+        with np.load(npz_path, allow_pickle=False) as data:
+            recorded = [str(s) for s in data["source_sha256"]]
+    except (OSError, KeyError):
+        return False
+    return recorded == [file_sha256(h5_path), file_sha256(scaler_path)]
+
+def verify(h5_path="breast_mlp.h5", scaler_path="scaler.pkl", npz_path=NPZ_PATH, data_path="data/data.csv", tolerance=TOLERANCE):
+    import joblib
+    import pandas as pd
+    from tensorflow.keras.models import load_model
+    import artifacts
+
+    features = artifacts.load_features()
+    X = pd.read_csv(data_path)[features]
+    keras_probs = load_model(h5_path, compile=False).predict(joblib.load(scaler_path).transform(X), verbose=0).ravel()
+    numpy_probs = NumpyMLP.load(npz_path).predict_on_batch(X.to_numpy()).ravel()
+    max_diff = float(np.abs(keras_probs - numpy_probs).max())
+    return {"rows": len(X), "max_abs_diff": max_diff, "tolerance": tolerance, "ok": max_diff <= tolerance}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MLP ağırlıklarını NumPy çıkarım motoruna aktarır")
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("--model", default="breast_mlp.h5")
+    parser.add_argument("--scaler", default="scaler.pkl")
+    parser.add_argument("--out", default=NPZ_PATH)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(f"Yazıldı: {export(args.model, args.scaler, args.out)}")
+    else:
+        report = verify(args.model, args.scaler, args.out)
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["ok"] else 1)
@@ -0,0 +1,293 @@
+# Streamlit arayüzünün yanında çalışan, başsız (headless) HTTP/JSON tahmin servisi.
+# Çalıştırmak için: python prediction_service.py --port 8502
+#
+# Eşzamanlı gelen tekil istekler, modele gitmeden önce küçük ve süre sınırlı
+# mikro-gruplar (micro-batch) halinde toplanır; böylece her istek için ayrı bir
+# ileri geçiş yerine grup başına tek bir model çağrısı yapılır.
+#
+# Uç noktalar:
+#   POST /predict        {"features": {"radius_mean": 17.99, ...}}  veya  {"values": [30 sayı]}
+#   POST /predict_batch  {"rows": [[30 sayı], ...]}
+#   GET  /health
+#   GET  /stats          istek sayısı, p50/p99 gecikme, ortalama grup boyutu, model sürümü, kayma durumu
+#   GET  /metrics        aşama gecikme histogramları (Prometheus metin biçimi, metrics.py)
+#   POST /reload         {"version": "v2"} (boşsa kayıttaki aktif sürüm); arka planda yükler
+#
+# Model model_registry.ModelStore üzerinden sunulur; --watch ile kayıttaki aktif sürüm
+# izlenir ve değiştiğinde süreç yeniden başlatılmadan yeni sürüme geçilir.
+#
+# drift_baseline.npz varsa puanlanan her grup kayma izleyicisine (drift_monitor.py) işlenir;
+# PSI/KS değerleri ve uyarı sayacı /metrics çıktısına eklenir.
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import drift_monitor
+import metrics
+import model_registry
+
+DEFAULT_PORT = 8502
+MAX_BATCH_SIZE = 32
+MAX_WAIT_MS = 5.0
+REQUEST_TIMEOUT = 10.0
+
+# ─────────────────────────── Mikro-Gruplama ─────────────────────────────
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.batched_rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, row, timeout=REQUEST_TIMEOUT):
+        fut = Future()
+        self._queue.put((row, fut))
+        return fut.result(timeout=timeout)
+
+    def _collect(self):
+        # İlk istek gelene kadar bekle, sonra en fazla max_wait kadar daha istek topla
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            X = np.stack([row for row, _ in batch])
+            try:
+                results = self.predict_fn(X)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.batched_rows += len(batch)
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+# ─────────────────────────── Servis ─────────────────────────────────────
+class PredictionService:
+    def __init__(self, store, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, monitor=None):
+        self.store = store
+        self.monitor = monitor
+        self.batcher = MicroBatcher(self.predict_batch, max_batch_size, max_wait_ms)
+        self.requests = 0
+        self.started = time.time()
+        self._latencies = deque(maxlen=10_000)
+        self._lock = threading.Lock()
+
+    # Model, eşik ve özellikler her çağrıda o anda sunulan sürümden okunur
+    @property
+    def threshold(self):
+        return self.store.current().threshold
+
+    @property
+    def features(self):
+        return self.store.current().features
+
+    def predict_rows(self, X, bundle=None):
+        bundle = bundle or self.store.current()
+        prob = bundle.predict_proba(pd.DataFrame(X, columns=bundle.features))
+        if self.monitor is not None:
+            self.monitor.update(X, prob)
+        return prob
+
+    def predict_batch(self, X):
+        # Mikro-grup tek bir sürümle puanlanır; her satır o sürümün eşiğiyle döner, böylece
+        # puanlama ile yanıt arasında sürüm değişse de olasılık ve etiket aynı sürümden gelir
+        bundle = self.store.current()
+        return [(float(p), bundle.threshold) for p in self.predict_rows(X, bundle)]
+
+    def parse_row(self, payload):
+        if "features" in payload:
+            missing = [f for f in self.features if f not in payload["features"]]
+            if missing:
+                raise ValueError(f"Eksik özellikler: {', '.join(missing)}")
+            values = [payload["features"][f] for f in self.features]
+        elif "values" in payload:
+            values = payload["values"]
+        else:
+            raise ValueError("İstek 'features' veya 'values' alanı içermelidir.")
+        return self.validate_rows([values])[0]
+
+    def validate_rows(self, rows):
+        with metrics.span("validation"):
+            return self._validate_rows(rows)
+
+    def _validate_rows(self, rows):
+        try:
+            X = np.asarray(rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("Tüm değerler sayısal olmalıdır.")
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(f"Her satır {len(self.features)} özellik içermelidir.")
+        if not np.isfinite(X).all():
+            raise ValueError("Eksik veya sonsuz değerler bulunamaz.")
+        if (X < 0).any():
+            raise ValueError("Negatif değerler bulunamaz.")
+        return X
+
+    def result(self, prob, threshold=None):
+        threshold = self.threshold if threshold is None else threshold
+        pred = int(prob > threshold)
+        return {
+            "probability": prob,
+            "prediction": pred,
+            "label": "Malign" if pred else "Benign",
+            "threshold": threshold,
+        }
+
+    def record(self, seconds):
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(seconds)
+
+    def stats(self):
+        with self._lock:
+            lat = sorted(self._latencies)
+            requests = self.requests
+        def pct(p):
+            if not lat:
+                return None
+            return lat[min(len(lat) - 1, math.ceil(p * len(lat)) - 1)] * 1000
+        stats = {
+            "requests": requests,
+            "uptime_sec": time.time() - self.started,
+            "latency_ms_p50": pct(0.50),
+            "latency_ms_p99": pct(0.99),
+            "batches": self.batcher.batches,
+            "avg_batch_size": self.batcher.batched_rows / self.batcher.batches if self.batcher.batches else None,
+        }
+        stats["model"] = self.store.status()
+        model = self.store.current().model
+        if hasattr(model, "stats"):
+            # Cascade modunda MLP'ye yükseltilen satır oranı
+            stats["cascade"] = model.stats()
+        if self.monitor is not None:
+            status = self.monitor.status()
+            stats["drift"] = {k: status[k] for k in ("baseline_model", "rows", "windows", "active_alerts", "recent_alerts")}
+        return stats
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code, body):
+            if isinstance(body, str):
+                data, content_type = body.encode("utf-8"), metrics.CONTENT_TYPE
+            else:
+                data, content_type = json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send(200, service.stats())
+            elif self.path == "/metrics":
+                self._send(200, metrics.render())
+            else:
+                self._send(404, {"error": "Bulunamadı"})
+
+        def do_POST(self):
+            with metrics.trace("http_request", path=self.path):
+                self._post()
+
+        def _post(self):
+            start = time.perf_counter()
+            try:
+                payload = self._read_json()
+                if self.path == "/predict":
+                    row = service.parse_row(payload)
+                    body = service.result(*service.batcher.submit(row))
+                elif self.path == "/predict_batch":
+                    # Zaten gruplanmış istekler mikro-gruplayıcıyı atlayıp doğrudan puanlanır;
+                    # istek boyunca tek bir model sürümü kullanılır
+                    bundle = service.store.current()
+                    X = service.validate_rows(payload.get("rows", []))
+                    body = {"results": [service.result(float(p), bundle.threshold) for p in service.predict_rows(X, bundle)]}
+                elif self.path == "/reload":
+                    started = service.store.reload(payload.get("version"))
+                    self._send(202, {"started": started, **service.store.status()})
+                    return
+                else:
+                    self._send(404, {"error": "Bulunamadı"})
+                    return
+            except (ValueError, KeyError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            service.record(time.perf_counter() - start)
+            self._send(200, body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    # Varsayılan dinleme kuyruğu (5) eşzamanlı bağlantı patlamalarında bağlantı sıfırlamasına yol açar
+    daemon_threads = True
+    request_queue_size = 256
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, watch_sec=None):
+    store = model_registry.ModelStore.open()
+    if watch_sec:
+        store.watch(watch_sec)
+    service = PredictionService(store, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                monitor=drift_monitor.open_monitor())
+    server = ServiceHTTPServer((host, port), make_handler(service))
+    print(f"Tahmin servisi http://{host}:{port} adresinde çalışıyor (model: {store.version}, grup: {max_batch_size}, bekleme: {max_wait_ms} ms)")
+    server.serve_forever()
+
+# ─────────────────────────── İstemci ────────────────────────────────────
+def request_prediction(url, features, timeout=REQUEST_TIMEOUT):
+    # Streamlit formu ve yük testi bu fonksiyonla servise istek gönderir
+    data = json.dumps({"features": features}).encode("utf-8")
+    req = urllib.request.Request(url.rstrip("/") + "/predict", data=data,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meme kanseri tahmin servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--watch", type=float, metavar="SN", help="Kayıttaki aktif sürümü bu aralıkla izle")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.watch)
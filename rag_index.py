@@ -0,0 +1,282 @@
+# SağlıkGPT için kalıcı ve artımlı vektör indeksi oluşturma adımı.
+# Çalıştırmak için: python rag_index.py            (docs/ altındaki tüm belgeler)
+#                   python rag_index.py --stub     (ağ/API anahtarı olmadan, test amaçlı;
+#                                                   ayrı ./chroma_db_stub dizinine yazar)
+#
+# docs/ dizinindeki belgeler (PDF, TXT, MD) ayrı işçi süreçlerinde paralel olarak
+# ayrıştırılır. Her belgenin sayfaları birleştirilip parçalara ayrılır; parçanın
+# başladığı ve bittiği sayfa, kaynak dosya adıyla birlikte metadata olarak saklanır.
+# Kaynak + metnin SHA-256 özeti Chroma'da belge kimliği olarak kullanılır. Böylece
+# yeniden çalıştırıldığında yalnızca yeni veya değişmiş parçalar embed edilir, artık
+# bulunmayan parçalar silinir ve indeks yeniden başlatmalarda büyümez.
+#
+# Embedding istekleri gruplar halinde, sınırlı eşzamanlılık ve dakikalık istek
+# sınırıyla gönderilir (BatchedEmbeddings). Uygulama tarafı (streamlit_rag.py)
+# yalnızca mevcut koleksiyonu açar; açılışta embedding çağrısı yapılmaz.
+
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+
+load_dotenv()
+
+DOCS_DIR = "docs"
+DOC_PATTERNS = ("*.pdf", "*.txt", "*.md")
+PERSIST_DIR = "./chroma_db"
+# --stub indeksleri üretim indeksine hiç dokunmasın diye ayrı dizine yazılır
+STUB_PERSIST_DIR = "./chroma_db_stub"
+# Chroma.from_texts'in varsayılan koleksiyon adı; mevcut chroma_db ile uyumlu kalmak için korunur.
+# Eski rastgele kimlikli (yinelenen) kayıtlar ilk indeksleme çalıştırmasında temizlenir.
+COLLECTION_NAME = "langchain"
+EMBEDDING_MODEL = "models/embedding-001"
+STUB_EMBEDDING_MODEL = "stub/sha256-768"
+EMBEDDING_DIM = 768
+MANIFEST_NAME = "index_manifest.json"
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+# Embedding isteği başına parça sayısı, aynı anda açık istek sayısı ve dakikalık istek sınırı
+EMBED_BATCH_SIZE = 32
+EMBED_CONCURRENCY = 4
+EMBED_REQUESTS_PER_MIN = 120
+EMBED_RETRIES = 3
+
+# ─────────────────────────── Embedding ──────────────────────────────────
+def get_embeddings():
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+
+class StubEmbeddings(Embeddings):
+    # Ağsız, deterministik embedding: metnin özetinden üretilen birim vektör (testler ve çevrim dışı deneme için)
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        v = np.random.default_rng(seed).standard_normal(self.dim)
+        return (v / np.linalg.norm(v)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+class RateLimiter:
+    # Dakikalık istek sınırı için basit aralık tabanlı sınırlayıcı (iş parçacığı güvenli)
+    def __init__(self, requests_per_min):
+        self.interval = 60.0 / requests_per_min if requests_per_min else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class BatchedEmbeddings(Embeddings):
+    # Belgeleri sabit boyutlu gruplara bölüp sınırlı sayıda eşzamanlı istekle embed eder; sıra korunur
+    def __init__(self, inner, batch_size=EMBED_BATCH_SIZE, max_concurrency=EMBED_CONCURRENCY,
+                 requests_per_min=EMBED_REQUESTS_PER_MIN, retries=EMBED_RETRIES):
+        self.inner = inner
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.limiter = RateLimiter(requests_per_min)
+        self.retries = retries
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _embed_batch(self, texts):
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            with self._lock:
+                self.requests += 1
+            try:
+                return self.inner.embed_documents(texts)
+            except Exception:
+                # Kota / geçici ağ hatalarında üstel bekleme ile yeniden denenir
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1 or self.max_concurrency <= 1:
+            return [v for b in batches for v in self._embed_batch(b)]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return [v for vectors in pool.map(self._embed_batch, batches) for v in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+def open_vectorstore(embeddings=None, persist_dir=PERSIST_DIR):
+    from langchain_chroma import Chroma
+    return Chroma(
+        collection_name=COLLECTION_NAME,
+        embedding_function=embeddings or get_embeddings(),
+        persist_directory=persist_dir,
+    )
+
+# ─────────────────────────── Belgeler ───────────────────────────────────
+def discover_documents(docs_dir=DOCS_DIR):
+    paths = set()
+    for pattern in DOC_PATTERNS:
+        paths.update(glob.glob(os.path.join(docs_dir, "**", pattern), recursive=True))
+    return sorted(paths)
+
+def parse_document(path):
+    # İşçi süreçte çalışır: [(sayfa_no, metin), ...]; sayfa numaraları 1'den başlar
+    if path.lower().endswith(".pdf"):
+        from langchain_community.document_loaders import PyPDFLoader
+        return [(i + 1, page.page_content) for i, page in enumerate(PyPDFLoader(path).load())]
+    with open(path, encoding="utf-8") as f:
+        return [(1, f.read())]
+
+def chunk_id(text, source=""):
+    return hashlib.sha256(f"{source}\n{text}".encode("utf-8")).hexdigest()
+
+def chunk_pages(source, pages):
+    # Sayfalar önceki gibi tek metin olarak bölünür (parçalar sayfa sınırını aşabilir);
+    # her parçanın başlangıç ofsetinden başladığı ve bittiği sayfa bulunur
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    starts, parts, offset = [], [], 0
+    for _, text in pages:
+        starts.append(offset)
+        parts.append(text)
+        offset += len(text) + 1
+    all_text = "\n".join(parts)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, add_start_index=True)
+    name = os.path.basename(source)
+    chunks = {}
+    for doc in splitter.create_documents([all_text]):
+        start = doc.metadata["start_index"]
+        first = bisect.bisect_right(starts, start) - 1
+        last = bisect.bisect_right(starts, start + len(doc.page_content) - 1) - 1
+        # Aynı belgede aynı metne sahip parçalar tek kimliğe düşer; sıralama korunur
+        chunks[chunk_id(doc.page_content, name)] = (doc.page_content, {
+            "source": name,
+            "page": pages[first][0],
+            "page_end": pages[last][0],
+            "start_index": start,
+        })
+    return chunks
+
+def load_chunks(paths, workers=None):
+    # Belgeler ayrı süreçlerde ayrıştırılır (PDF metin çıkarımı CPU yoğun ve GIL'e bağlıdır)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers == 1:
+        parsed = [parse_document(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_document, paths))
+    chunks, pages = {}, 0
+    for path, doc_pages in zip(paths, parsed):
+        pages += len(doc_pages)
+        chunks.update(chunk_pages(path, doc_pages))
+    return chunks, pages
+
+def manifest_path(persist_dir=PERSIST_DIR):
+    return os.path.join(persist_dir, MANIFEST_NAME)
+
+def read_manifest(persist_dir=PERSIST_DIR):
+    try:
+        with open(manifest_path(persist_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def index_fingerprint(persist_dir=PERSIST_DIR):
+    # İndeks içeriğini temsil eden özet; içerik değiştiğinde önbellekler bunu kullanarak geçersiz kılınır
+    return read_manifest(persist_dir).get("fingerprint")
+
+# ─────────────────────────── İndeksleme ─────────────────────────────────
+def build_index(docs_dir=DOCS_DIR, embeddings=None, embedding_model=EMBEDDING_MODEL, workers=None,
+                batch_size=EMBED_BATCH_SIZE, max_concurrency=EMBED_CONCURRENCY, requests_per_min=EMBED_REQUESTS_PER_MIN,
+                persist_dir=PERSIST_DIR):
+    start = time.perf_counter()
+    paths = discover_documents(docs_dir) if os.path.isdir(docs_dir) else [docs_dir]
+    if not paths:
+        raise ValueError(f"İndekslenecek belge bulunamadı: {docs_dir}")
+    chunks, pages = load_chunks(paths, workers)
+    parse_sec = time.perf_counter() - start
+
+    embedder = BatchedEmbeddings(embeddings or get_embeddings(), batch_size, max_concurrency, requests_per_min)
+    vs = open_vectorstore(embedder, persist_dir)
+
+    # Embedding modeli değiştiyse eski vektörler karşılaştırılamaz; koleksiyon sıfırlanır
+    if read_manifest(persist_dir).get("embedding_model") not in (None, embedding_model):
+        vs.reset_collection()
+
+    existing = set(vs.get(include=[])["ids"])
+    new_ids = [i for i in chunks if i not in existing]
+    stale_ids = [i for i in existing if i not in chunks]
+
+    if stale_ids:
+        vs.delete(ids=stale_ids)
+    embed_start = time.perf_counter()
+    if new_ids:
+        vs.add_texts([chunks[i][0] for i in new_ids], metadatas=[chunks[i][1] for i in new_ids], ids=new_ids)
+    embed_sec = time.perf_counter() - embed_start
+
+    fingerprint = hashlib.sha256(
+        (embedding_model + "\n" + "\n".join(sorted(chunks))).encode("utf-8")
+    ).hexdigest()
+    manifest = {
+        "collection": COLLECTION_NAME,
+        "embedding_model": embedding_model,
+        "sources": [os.path.basename(p) for p in paths],
+        "chunks": len(chunks),
+        "fingerprint": fingerprint,
+    }
+    os.makedirs(persist_dir, exist_ok=True)
+    with open(manifest_path(persist_dir), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    total_sec = time.perf_counter() - start
+    return {
+        "documents": len(paths),
+        "pages": pages,
+        "added": len(new_ids),
+        "removed": len(stale_ids),
+        "unchanged": len(chunks) - len(new_ids),
+        "total": len(chunks),
+        "embed_requests": embedder.requests,
+        "parse_sec": round(parse_sec, 3),
+        "embed_sec": round(embed_sec, 3),
+        "pages_per_sec": round(pages / parse_sec, 1) if parse_sec > 0 else None,
+        "chunks_per_sec": round(len(new_ids) / embed_sec, 1) if new_ids and embed_sec > 0 else None,
+        "total_sec": round(total_sec, 3),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SağlıkGPT vektör indeksini oluşturur / günceller")
+    parser.add_argument("--docs", default=DOCS_DIR, help="Belge dizini veya tek bir belge")
+    parser.add_argument("--workers", type=int, help="Ayrıştırma süreç sayısı")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=EMBED_REQUESTS_PER_MIN, help="Dakikalık embedding isteği sınırı (0: sınırsız)")
+    parser.add_argument("--stub", action="store_true", help="Ağsız deterministik embedding kullan (yalnızca test)")
+    parser.add_argument("--persist-dir", help=f"İndeks dizini (varsayılan: {PERSIST_DIR}, --stub ile {STUB_PERSIST_DIR})")
+    args = parser.parse_args()
+
+    persist_dir = args.persist_dir or (STUB_PERSIST_DIR if args.stub else PERSIST_DIR)
+    if args.stub and os.path.abspath(persist_dir) == os.path.abspath(PERSIST_DIR):
+        # Farklı embedding modeli üretim koleksiyonunu sıfırlardı
+        parser.error(f"--stub üretim indeksine ({PERSIST_DIR}) yazamaz")
+    embeddings = StubEmbeddings() if args.stub else None
+    model = STUB_EMBEDDING_MODEL if args.stub else EMBEDDING_MODEL
+    print(json.dumps(build_index(args.docs, embeddings, model, args.workers, args.batch_size, args.concurrency,
+                                 args.rpm, persist_dir), indent=2))
@@ -0,0 +1,133 @@
+# SağlıkGPT için yeniden sıralamalı (rerank) retrieval ve bağlam bütçesi.
+#
+# Düz benzerlik araması (k=10) ile gelen tüm parçalar isteme doldurulduğunda her soru
+# için ~10 bin karakter bağlam gönderiliyordu. Bu retriever:
+#   1. Vektör deposundan daha fazla aday çeker (fetch_k),
+#   2. Aynı / büyük ölçüde örtüşen parçaları eler (splitter chunk_overlap=100 kullanıyor),
+#   3. Adayları aday kümesi üzerinde hesaplanan BM25 skoru ile embedding benzerliğinin
+#      ağırlıklı birleşimiyle yeniden sıralar,
+#   4. Parçaları token bütçesi dolana kadar isteme ekler; komşu parçanın tekrar eden
+#      örtüşme kısmı kırpılır.
+
+import math
+import re
+from collections import Counter
+from typing import List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+import metrics
+
+FETCH_K = 20
+TOKEN_BUDGET = 1200
+# Token sayısı için kaba tahmin; Türkçe metinlerde token başına ~3.5 karakter
+CHARS_PER_TOKEN = 3.5
+DENSE_WEIGHT = 0.5
+DUPLICATE_JACCARD = 0.8
+MAX_OVERLAP_CHARS = 200
+# Türkçe eklerden etkilenmemek için kelimeler ilk 5 harfe kırpılır (F5 kök bulma)
+STEM_LENGTH = 5
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def estimate_tokens(text):
+    return int(math.ceil(len(text) / CHARS_PER_TOKEN))
+
+def tokenize(text):
+    return [t[:STEM_LENGTH] for t in _TOKEN_RE.findall(text.casefold()) if len(t) > 1]
+
+def bm25_scores(query_tokens, docs_tokens, k1=1.5, b=0.75):
+    n = len(docs_tokens)
+    avgdl = sum(len(d) for d in docs_tokens) / n if n else 0.0
+    df = Counter(t for d in docs_tokens for t in set(d))
+    scores = []
+    for d in docs_tokens:
+        tf = Counter(d)
+        score = 0.0
+        for t in set(query_tokens):
+            if t not in tf:
+                continue
+            idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+            score += idf * tf[t] * (k1 + 1) / (tf[t] + k1 * (1 - b + b * len(d) / (avgdl or 1.0)))
+        scores.append(score)
+    return scores
+
+def _min_max(values):
+    lo, hi = min(values), max(values)
+    if hi - lo < 1e-12:
+        return [1.0 for _ in values]
+    return [(v - lo) / (hi - lo) for v in values]
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _strip_overlap(kept_texts, text):
+    # Seçilmiş bir parçayla örtüşen baş veya son kısım (chunk_overlap bölgesi) atılır
+    for prev in kept_texts:
+        for size in range(min(MAX_OVERLAP_CHARS, len(prev), len(text)), 20, -1):
+            if prev.endswith(text[:size]):
+                text = text[size:].lstrip()
+                break
+            if prev.startswith(text[-size:]):
+                text = text[:-size].rstrip()
+                break
+    return text
+
+class HybridRetriever(BaseRetriever):
+    vectorstore: VectorStore
+    fetch_k: int = FETCH_K
+    token_budget: int = TOKEN_BUDGET
+    dense_weight: float = DENSE_WEIGHT
+
+    def rank(self, query):
+        # Chroma mesafe döndürür (küçük = daha benzer); işaret çevrilip benzerlik olarak kullanılır
+        with metrics.span("vector_search"):
+            hits = self.vectorstore.similarity_search_with_score(query, k=self.fetch_k)
+        candidates = [(doc, -dist) for doc, dist in hits]
+        if not candidates:
+            return []
+
+        # Birebir aynı veya büyük ölçüde örtüşen parçaları ele (ilk gelen daha yüksek benzerliklidir)
+        unique, seen_tokens = [], []
+        for doc, dense in candidates:
+            tokens = tokenize(doc.page_content)
+            token_set = set(tokens)
+            if any(_jaccard(token_set, s) >= DUPLICATE_JACCARD for s in seen_tokens):
+                continue
+            seen_tokens.append(token_set)
+            unique.append((doc, dense, tokens))
+
+        sparse = bm25_scores(tokenize(query), [t for _, _, t in unique])
+        dense_norm = _min_max([d for _, d, _ in unique])
+        sparse_norm = _min_max(sparse)
+        scored = [
+            (self.dense_weight * dn + (1 - self.dense_weight) * sn, doc)
+            for (doc, _, _), dn, sn in zip(unique, dense_norm, sparse_norm)
+        ]
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored
+
+    def pack(self, scored):
+        packed, kept_texts, used = [], [], 0
+        for score, doc in scored:
+            text = _strip_overlap(kept_texts, doc.page_content)
+            cost = estimate_tokens(text)
+            # En iyi parça bütçeyi aşsa bile tek başına eklenir; bağlam hiçbir zaman boş kalmaz
+            if packed and used + cost > self.token_budget:
+                continue
+            packed.append(Document(
+                page_content=text,
+                metadata={**doc.metadata, "hybrid_score": round(score, 4)},
+            ))
+            kept_texts.append(doc.page_content)
+            used += cost
+        return packed
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        with metrics.span("retrieval"):
+            return self.pack(self.rank(query))
@@ -0,0 +1,200 @@
+# Parça (shard) dizinleri için çevrim dışı, paralel toplu puanlama komutu.
+#
+# Girdi dizinindeki her dosya (feature_order.csv düzeninde CSV / Parquet / Arrow)
+# bir süreç havuzundaki işçilere dağıtılır. Model sürümü koordinatörde bir kez belirlenir
+# (varsayılan: model_registry.json'daki aktif sürüm, uygulamayla aynı); her işçi bu sürümü
+# model_registry.load_bundle ile yalnızca bir kez yükler ve dosyaları batch_scoring
+# ile parça parça puanlar. Her manifest kaydı puanlayan sürümü içerir. Sonuçlar önce
+# geçici dosyaya yazılıp tamamlanınca yerine taşınır; tamamlanan dosyalar çıktı
+# dizinindeki _manifest.jsonl dosyasına eklenir ve komut yeniden çalıştırıldığında
+# atlanır (kesintiden sonra kaldığı yerden devam). Başka bir model sürümüyle (veya sürüm
+# bilgisi olmadan) puanlanmış parçalar atlanmaz, bu çalıştırmanın sürümüyle yeniden puanlanır;
+# böylece çıktı dizini hiçbir zaman karışık sürümlü olmaz.
+#
+# Kullanım:
+#   python score_shards.py girdi_dizini/ cikti_dizini/ --workers 8
+#   python score_shards.py girdi_dizini/ cikti_dizini/ --version v2
+#
+# Çıktı adları kaynak uzantısını korur (a.csv -> a.csv.csv, a.parquet -> a.parquet.csv);
+# aynı adlı farklı biçimdeki parçalar birbirinin üzerine yazmaz.
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+MANIFEST_NAME = "_manifest.jsonl"
+# İşçi başına BLAS/TensorFlow iş parçacığı sayısı; paralellik süreç düzeyinde sağlanır
+THREAD_ENV = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"]
+
+# İşçi süreç içindeki artefaktlar (_init_worker ile bir kez yüklenir)
+_WORKER = {}
+
+def list_shards(input_dir):
+    import ingestion
+
+    paths = []
+    for ext in ingestion.FORMATS:
+        paths += glob.glob(os.path.join(input_dir, f"*{ext}"))
+    return sorted(paths)
+
+def output_paths(output_dir, shard):
+    name = os.path.basename(shard)
+    return os.path.join(output_dir, f"{name}.csv"), os.path.join(output_dir, f"{name}.errors.csv")
+
+def read_manifest(output_dir):
+    done = {}
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    done[entry["shard"]] = entry
+    return done
+
+# ─────────────────────────── İşçi ───────────────────────────────────────
+def _init_worker(version):
+    import model_registry
+
+    start = time.perf_counter()
+    bundle = model_registry.load_bundle(version)
+    _WORKER.update(model=bundle.model, scaler=bundle.scaler, threshold=bundle.threshold,
+                   features=bundle.features, version=bundle.version, load_sec=time.perf_counter() - start)
+
+def _score_shard(shard, output_dir, chunk_size):
+    import batch_scoring
+
+    out_path, errors_path = output_paths(output_dir, shard)
+    part_out, part_errors = out_path + ".part", errors_path + ".part"
+    start = time.perf_counter()
+    summary = batch_scoring.score_file(
+        shard, _WORKER["model"], _WORKER["scaler"], _WORKER["threshold"], _WORKER["features"],
+        name=shard, chunk_size=chunk_size, out_path=part_out, errors_path=part_errors,
+    )
+    # Yarım kalmış dosya hiçbir zaman tamamlanmış çıktı adıyla görünmez
+    if summary["out_path"]:
+        os.replace(part_out, out_path)
+    if summary["errors_path"]:
+        os.replace(part_errors, errors_path)
+    return {
+        "shard": os.path.basename(shard),
+        "worker": os.getpid(),
+        "model_version": _WORKER["version"],
+        "threshold": _WORKER["threshold"],
+        "rows": summary["rows"],
+        "scored": summary["scored"],
+        "invalid_rows": summary["invalid_rows"],
+        "malign": summary["malign"],
+        "seconds": time.perf_counter() - start,
+        "load_sec": _WORKER.pop("load_sec", 0.0),
+        "output": os.path.basename(out_path) if summary["out_path"] else None,
+        "errors": os.path.basename(errors_path) if summary["errors_path"] else None,
+    }
+
+# ─────────────────────────── Koordinatör ────────────────────────────────
+def worker_report(entries):
+    workers = {}
+    for e in entries:
+        w = workers.setdefault(e["worker"], {"shards": 0, "rows": 0, "busy_sec": 0.0, "load_sec": 0.0})
+        w["shards"] += 1
+        w["rows"] += e["rows"]
+        w["busy_sec"] += e["seconds"]
+        w["load_sec"] += e["load_sec"]
+    for w in workers.values():
+        w["rows_per_sec"] = w["rows"] / w["busy_sec"] if w["busy_sec"] > 0 else None
+    return workers
+
+def version_counts(done, names):
+    # Manifest kayıtlarının sürüm dağılımı; sürüm alanı olmayan eski kayıtlar None olarak sayılır
+    counts = {}
+    for name in names:
+        key = str(done[name].get("model_version"))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+def run(input_dir, output_dir, workers=None, chunk_size=None, version=None, log=print):
+    import batch_scoring
+    import model_registry
+
+    # Sürüm bir kez çözülür; çalışma sırasında aktif sürüm değişse de tüm işçiler aynı sürümü kullanır
+    version, _ = model_registry.version_entry(version)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or batch_scoring.CHUNK_SIZE
+    os.makedirs(output_dir, exist_ok=True)
+
+    shards = list_shards(input_dir)
+    done = read_manifest(output_dir)
+    names = [os.path.basename(s) for s in shards]
+    skipped = [n for n in names if n in done and done[n].get("model_version") == version]
+    rescored = [n for n in names if n in done and n not in skipped]
+    pending = [s for s, n in zip(shards, names) if n not in skipped]
+    skipped_versions = version_counts(done, skipped)
+    rescored_versions = version_counts(done, rescored)
+    log(f"{len(shards)} parça bulundu, {len(skipped)} tanesi daha önce tamamlanmış {skipped_versions}, {len(pending)} puanlanacak ({workers} işçi, model {version})")
+    if rescored:
+        log(f"{len(rescored)} parça başka sürümle puanlanmış {rescored_versions}; {version} ile yeniden puanlanacak")
+
+    # Alt süreçler temiz başlasın ve iş parçacığı ayarlarını import öncesinde görsün diye spawn kullanılır
+    for name in THREAD_ENV:
+        os.environ.setdefault(name, "1")
+
+    entries, failed = [], {}
+    start = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=get_context("spawn"),
+                                 initializer=_init_worker, initargs=(version,)) as pool, \
+                open(os.path.join(output_dir, MANIFEST_NAME), "a", encoding="utf-8") as manifest:
+            futures = {pool.submit(_score_shard, s, output_dir, chunk_size): s for s in pending}
+            for fut in as_completed(futures):
+                shard = os.path.basename(futures[fut])
+                try:
+                    entry = fut.result()
+                except Exception as e:
+                    failed[shard] = str(e)
+                    log(f"HATA {shard}: {e}")
+                    continue
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                manifest.flush()
+                entries.append(entry)
+                log(f"{shard}: {entry['rows']:,} satır, {entry['rows'] / max(entry['seconds'], 1e-9):,.0f} satır/sn (işçi {entry['worker']})")
+    wall = time.perf_counter() - start
+
+    rows = sum(e["rows"] for e in entries)
+    return {
+        "model_version": version,
+        "shards": len(shards),
+        "skipped": len(skipped),
+        "skipped_versions": skipped_versions,
+        "rescored": len(rescored),
+        "rescored_versions": rescored_versions,
+        "scored_shards": len(entries),
+        "failed": failed,
+        "rows": rows,
+        "wall_sec": wall,
+        "rows_per_sec": rows / wall if wall > 0 and rows else None,
+        "workers": worker_report(entries),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parça dizinlerini paralel olarak puanlar")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, help="İşçi süreç sayısı (varsayılan: CPU çekirdek sayısı)")
+    parser.add_argument("--chunk-size", type=int, help="Parça içi okuma grubu boyutu")
+    parser.add_argument("--version", help="Kayıttaki model sürümü (varsayılan: aktif sürüm)")
+    parser.add_argument("--report", help="Özet raporun yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    summary = run(args.input_dir, args.output_dir, args.workers, args.chunk_size, args.version)
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    sys.exit(1 if summary["failed"] else 0)
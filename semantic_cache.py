@@ -0,0 +1,175 @@
+# SağlıkGPT için sorgu embedding'lerine dayalı anlamsal yanıt önbelleği.
+#
+# Yeni bir sorunun embedding'i daha önce yanıtlanmış bir soruya kosinüs benzerliği
+# eşiğinin üzerinde yakınsa, saklanan yanıt retrieval ve Gemini çağrısı yapılmadan
+# döndürülür. Birebir aynı sorular embedding hesaplanmadan doğrudan eşleşir.
+# Kayıtlar LRU sırasıyla ve TTL süresiyle sınırlıdır; indeks içeriği veya sistem
+# istemi (namespace) değiştiğinde önbellek tamamen temizlenir.
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.95
+MAX_ENTRIES = 256
+TTL_SEC = 24 * 3600
+
+def normalize_question(question):
+    return " ".join(question.lower().split())
+
+class SemanticCache:
+    def __init__(self, embeddings, threshold=SIMILARITY_THRESHOLD, max_entries=MAX_ENTRIES, ttl_sec=TTL_SEC):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.namespace = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._entries = OrderedDict()  # normalize edilmiş soru -> kayıt
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def set_namespace(self, namespace):
+        # İndeks veya sistem istemi değiştiyse eski yanıtlar artık geçerli değildir
+        if namespace != self.namespace:
+            self.clear()
+            self.namespace = namespace
+
+    def _purge_expired(self, now):
+        expired = [k for k, e in self._entries.items() if now - e["created"] > self.ttl_sec]
+        for k in expired:
+            del self._entries[k]
+
+    def _embed(self, question):
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, question):
+        # (kayıt, embedding) döndürür; eşleşme yoksa kayıt None olur.
+        # Embedding, ıskalama durumunda store() içinde yeniden hesaplanmasın diye geri verilir.
+        key = normalize_question(question)
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry, entry["vector"]
+            if not self._entries:
+                entry_keys, matrix = [], None
+            else:
+                entry_keys = list(self._entries)
+                matrix = np.stack([self._entries[k]["vector"] for k in entry_keys])
+
+        vector = self._embed(question)
+        if matrix is None:
+            return None, vector
+        scores = matrix @ vector
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None, vector
+        with self._lock:
+            entry = self._entries.get(entry_keys[best])
+            if entry is not None:
+                self._entries.move_to_end(entry_keys[best])
+        return entry, vector
+
+    def store(self, question, vector, result, seconds):
+        with self._lock:
+            self._entries[normalize_question(question)] = {
+                "vector": vector,
+                "result": result,
+                "seconds": seconds,
+                "created": time.time(),
+            }
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, hit, saved_seconds=0.0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_seconds += saved_seconds
+            else:
+                self.misses += 1
+
+    def metrics(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "saved_seconds": self.saved_seconds,
+                "entries": len(self._entries),
+            }
+
+class CachedRAGChain:
+    # rag_chain.invoke({"input": ...}) arayüzünü koruyarak önbelleği zincirin önüne yerleştirir.
+    # namespace_fn her çağrıda değerlendirilir; böylece çalışan süreçte indeks yeniden
+    # oluşturulduğunda önbellek kendiliğinden geçersiz olur.
+    # executor (llm_executor.CoalescingExecutor) verilirse önbellek ıskalamaları paylaşılan
+    # olay döngüsünde çalışır; aynı anda sorulan aynı soru için zincir bir kez çağrılır.
+    def __init__(self, chain, cache, namespace_fn, executor=None):
+        self.chain = chain
+        self.cache = cache
+        self.namespace_fn = namespace_fn
+        self.executor = executor
+
+    def _upstream_key(self, question):
+        return (self.cache.namespace, normalize_question(question))
+
+    def _invoke_chain(self, inputs, config):
+        if self.executor is None:
+            return self.chain.invoke(inputs, config)
+        return self.executor.call(self._upstream_key(inputs["input"]), lambda: self.chain.ainvoke(inputs, config))
+
+    def _stream_chain(self, inputs, config):
+        if self.executor is None:
+            return self.chain.stream(inputs, config)
+        return self.executor.stream(self._upstream_key(inputs["input"]), lambda: self.chain.astream(inputs, config))
+
+    def invoke(self, inputs, config=None):
+        question = inputs["input"]
+        start = time.perf_counter()
+        self.cache.set_namespace(self.namespace_fn())
+
+        entry, vector = self.cache.lookup(question)
+        if entry is not None:
+            self.cache.record(True, max(entry["seconds"] - (time.perf_counter() - start), 0.0))
+            return {**entry["result"], "input": question, "cached": True}
+
+        result = self._invoke_chain(inputs, config)
+        self.cache.record(False)
+        self.cache.store(question, vector, result, time.perf_counter() - start)
+        return result
+
+    def stream(self, inputs, config=None):
+        # Önbellekte varsa yanıt tek parça halinde döner; yoksa zincirin parçaları
+        # (önce "context", ardından "answer" token'ları) iletilir ve sonunda saklanır
+        question = inputs["input"]
+        start = time.perf_counter()
+        self.cache.set_namespace(self.namespace_fn())
+
+        entry, vector = self.cache.lookup(question)
+        if entry is not None:
+            self.cache.record(True, max(entry["seconds"] - (time.perf_counter() - start), 0.0))
+            yield {**entry["result"], "input": question, "cached": True}
+            return
+
+        result = {"input": question, "answer": ""}
+        for chunk in self._stream_chain(inputs, config):
+            if "answer" in chunk:
+                result["answer"] += chunk["answer"]
+            if "context" in chunk:
+                result["context"] = chunk["context"]
+            yield chunk
+        self.cache.record(False)
+        self.cache.store(question, vector, result, time.perf_counter() - start)
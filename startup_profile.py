@@ -0,0 +1,67 @@
+# Uygulama açılış profili: modül import süreleri, kaynak yükleme süreleri ve ilk
+# çizime (first render) kadar geçen süre.
+#
+# Streamlit betiği her etkileşimde yeniden çalışır ancak modüller sys.modules'te
+# kaldığı için buradaki PROFILE süreç boyunca tek kopyadır; böylece yalnızca ilk
+# (soğuk) yükleme maliyetleri kaydedilir. Ayrıntılı import ağacı için:
+#   python -X importtime -c "import streamlit_rag" 2> importtime.log
+
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("startup")
+
+# Süreç içindeki ilk import anı; tüm süreler bu noktaya göre raporlanır
+_ORIGIN = time.perf_counter()
+
+class StartupProfile:
+    def __init__(self):
+        self.events = []
+        self.first_render_sec = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, name, kind="load"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.events.append({
+                    "name": name,
+                    "kind": kind,
+                    "at_sec": round(start - _ORIGIN, 4),
+                    "seconds": round(end - start, 4),
+                })
+
+    def import_module(self, name):
+        # Modül zaten yüklüyse maliyeti yoktur ve kaydedilmez
+        if name in sys.modules:
+            return sys.modules[name]
+        with self.timed(name, "import"):
+            return importlib.import_module(name)
+
+    def mark_first_render(self):
+        if self.first_render_sec is None:
+            self.first_render_sec = round(time.perf_counter() - _ORIGIN, 4)
+            logger.info("İlk çizim süresi: %.3fs", self.first_render_sec)
+
+    def report(self):
+        with self._lock:
+            events = list(self.events)
+        return {
+            "first_render_sec": self.first_render_sec,
+            "imports": [e for e in events if e["kind"] == "import"],
+            "loads": [e for e in events if e["kind"] != "import"],
+        }
+
+    def to_json(self):
+        return json.dumps(self.report(), ensure_ascii=False, indent=2)
+
+PROFILE = StartupProfile()
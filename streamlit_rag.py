@@ -1,53 +1,118 @@
+import hashlib
+import logging
+import time
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_chroma import Chroma
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import create_retrieval_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.chains.combine_documents import create_stuff_documents_chain
+from rag_index import EMBEDDING_MODEL, get_embeddings, open_vectorstore, build_index, index_fingerprint, read_manifest
+from semantic_cache import SemanticCache, CachedRAGChain
+from llm_executor import CoalescingExecutor
+from retrieval import HybridRetriever
+import metrics
 
 load_dotenv()
 
+logger = logging.getLogger("saglikgpt")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+LLM_MODEL = "models/gemini-2.5-flash-preview-04-17"
+
+SYSTEM_PROMPT = (
+    "Sen bir sağlık profesyoneli gibi davranan, meme kanseri hakkında bilgi vermek için eğitilmiş bir sohbet asistanısın. "
+    "Yanıtlarını yalnızca verilen bağlam içeriğinden oluştur ve PDF'te yer almayan hiçbir ek bilgi ekleme. "
+    "Yanıtların bilgilendirme amaçlıdır, teşhis ve tedavi önerisi yerine geçmez. "
+    "Kullanıcıdan net ve açık sorular gelmesini bekle. Sorular belirsizse, daha fazla açıklama iste. "
+    "İnsanlar genellikle sorularını 'Nelerdir?', 'Nasıl yapılır?', 'Kimler risk altındadır?', 'Belirtileri nelerdir?' gibi doğal dilde sorar. "
+    "Bu tür soruları anlayarak uygun başlıkları bağlamdan bulmaya çalış. "
+    "Başlıklar ve içerikler tam kelime kelime uyuşmasa da, anlam olarak yakın olanları eşleştirmeye çalış. "
+    "Kullanıcı teşekkür ettiğinde mutlaka \"Rica ederim, her zaman yardımcı olurum. Sağlıkla kalın.\" gibi nazik bir kapanış cümlesi ekle. "
+    "Eğer sorunun cevabını bağlamda bulamazsan, \"Üzgünüm bu konuda yardımcı olamıyorum.\" de. "
+    "Cevaplarını en fazla dört cümleyle ve anlaşılır bir dille yaz.\n\n"
+    "{context}"
+)
+
+class IndexMismatchError(RuntimeError):
+    pass
+
+def check_index_model(manifest, embedding_model=EMBEDDING_MODEL):
+    # Sorgular, indeksteki vektörleri üreten modelle embed edilmelidir; aksi halde benzerlikler anlamsızdır
+    indexed = manifest.get("embedding_model")
+    if indexed not in (None, embedding_model):
+        raise IndexMismatchError(
+            f"Vektör indeksi '{indexed}' ile oluşturulmuş, sorgu modeli '{embedding_model}'. "
+            "İndeksi yeniden oluşturun: python rag_index.py")
+
+def cache_namespace():
+    # Yanıt önbelleği; indeks içeriği, sistem istemi veya LLM modeli değiştiğinde geçersiz olur
+    key = f"{index_fingerprint()}\n{LLM_MODEL}\n{SYSTEM_PROMPT}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
 @st.cache_resource
 def setup_rag_chain():
 
-    loader = PyPDFLoader("docs/meme-kanseri-rehberi.pdf")
-    pages = loader.load()
-    all_text = "\n".join(p.page_content for p in pages)
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    docs = splitter.split_text(all_text)
-
-    emb = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vs = Chroma.from_texts(docs, emb, persist_directory="./chroma_db")
-    retriever = vs.as_retriever(search_type="similarity", search_kwargs={"k": 10})
+    # İndeks ayrı bir adımda oluşturulur (python rag_index.py); burada yalnızca mevcut koleksiyon açılır
+    check_index_model(read_manifest())
+    emb = get_embeddings()
+    vs = open_vectorstore(emb)
+    if not vs.get(limit=1, include=[])["ids"]:
+        # İlk kurulumda koleksiyon boşsa bir kereliğine indeksleme yapılır
+        build_index(embeddings=emb)
+    # Fazla aday çekip tekilleştiren, BM25 + embedding ile yeniden sıralayan ve token bütçesine göre paketleyen retriever
+    retriever = HybridRetriever(vectorstore=vs)
 
     llm = ChatGoogleGenerativeAI(
-        model="models/gemini-2.5-flash-preview-04-17", temperature=0.3, max_tokens=500
-    )
-
-    system_prompt = (
-        "Sen bir sağlık profesyoneli gibi davranan, meme kanseri hakkında bilgi vermek için eğitilmiş bir sohbet asistanısın. "
-        "Yanıtlarını yalnızca verilen bağlam içeriğinden oluştur ve PDF'te yer almayan hiçbir ek bilgi ekleme. "
-        "Yanıtların bilgilendirme amaçlıdır, teşhis ve tedavi önerisi yerine geçmez. "
-        "Kullanıcıdan net ve açık sorular gelmesini bekle. Sorular belirsizse, daha fazla açıklama iste. "
-        "İnsanlar genellikle sorularını 'Nelerdir?', 'Nasıl yapılır?', 'Kimler risk altındadır?', 'Belirtileri nelerdir?' gibi doğal dilde sorar. "
-        "Bu tür soruları anlayarak uygun başlıkları bağlamdan bulmaya çalış. "
-        "Başlıklar ve içerikler tam kelime kelime uyuşmasa da, anlam olarak yakın olanları eşleştirmeye çalış. "
-        "Kullanıcı teşekkür ettiğinde mutlaka \"Rica ederim, her zaman yardımcı olurum. Sağlıkla kalın.\" gibi nazik bir kapanış cümlesi ekle. "
-        "Eğer sorunun cevabını bağlamda bulamazsan, \"Üzgünüm bu konuda yardımcı olamıyorum.\" de. "
-        "Cevaplarını en fazla dört cümleyle ve anlaşılır bir dille yaz.\n\n"
-        "{context}"
+        model=LLM_MODEL, temperature=0.3, max_tokens=500
     )
 
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        ("system", SYSTEM_PROMPT),
         ("human", "{input}")
     ])
 
     qa_chain = create_stuff_documents_chain(llm, prompt)
     rag_chain = create_retrieval_chain(retriever, qa_chain)
 
-    return rag_chain
+    # Tüm oturumlar tek LLM istemcisini ve tek olay döngüsünü paylaşır; aynı anda gelen
+    # aynı sorular birleştirilir, Gemini'ye giden eşzamanlı istek sayısı sınırlanır
+    executor = CoalescingExecutor()
+    return CachedRAGChain(rag_chain, SemanticCache(emb), cache_namespace, executor=executor)
 
+
+def stream_answer(rag_chain, question, on_context=None):
+    # Yanıt token'larını geldikçe döndürür; istek başına ilk token süresi (TTFT) ve toplam süre loglanır
+    start = time.perf_counter()
+    retrieval_sec = None
+    ttft = None
+    cached = False
+    for chunk in rag_chain.stream({"input": question}):
+        if "context" in chunk and retrieval_sec is None:
+            retrieval_sec = time.perf_counter() - start
+            if on_context is not None:
+                on_context(chunk["context"])
+        cached = cached or chunk.get("cached", False)
+        if chunk.get("answer"):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            yield chunk["answer"]
+    total = time.perf_counter() - start
+    # Zincir içindeki Gemini çağrısı: bağlam geldikten sonra ilk token'a ve yanıtın sonuna kadar geçen süre
+    if not cached:
+        generation_start = retrieval_sec or 0.0
+        if ttft is not None:
+            metrics.observe("llm_first_token", ttft - generation_start)
+        metrics.observe("llm_generation", total - generation_start)
+    metrics.observe("chat_turn", total, cached=str(cached).lower())
+    logger.info(
+        "SağlıkGPT yanıtı: ttft=%.3fs retrieval=%s toplam=%.3fs önbellek=%s",
+        ttft if ttft is not None else total,
+        f"{retrieval_sec:.3f}s" if retrieval_sec is not None else "-",
+        total,
+        cached,
+    )
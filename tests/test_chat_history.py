@@ -0,0 +1,43 @@
+from chat_history import ChatHistoryStore
+
+def fill(store, session_id, n):
+    return [store.append(session_id, "user" if i % 2 == 0 else "assistant", f"{session_id}-{i}")["id"]
+            for i in range(n)]
+
+def test_recent_and_pages_cover_history_once(tmp_path):
+    store = ChatHistoryStore(str(tmp_path / "chat.db"))
+    ids = []
+    for _ in range(9):
+        # Oturumlar araya girer: kimlikler oturum içinde ardışık değildir
+        ids += fill(store, "s1", 5)
+        fill(store, "s2", 2)
+
+    window = store.recent("s1", limit=20)
+    assert [m["id"] for m in window] == ids[-20:]
+    assert window[-1]["content"] == "s1-4"
+
+    older, sizes, before = [], [], window[0]["id"]
+    while store.has_before("s1", before):
+        page = store.page("s1", before, limit=20)
+        sizes.append(len(page))
+        older = page + older
+        before = page[0]["id"]
+    assert sizes == [20, 5]
+    assert [m["id"] for m in older + window] == ids
+    assert store.count("s1") == 45 and store.count("s2") == 18
+    store.close()
+
+def test_page_before_first_message_is_empty(tmp_path):
+    store = ChatHistoryStore(str(tmp_path / "chat.db"))
+    ids = fill(store, "s1", 3)
+    assert store.page("s1", ids[0]) == []
+    assert not store.has_before("s1", ids[0])
+    assert store.recent("yok") == [] and store.count("yok") == 0
+    store.close()
+
+def test_evict_inactive_removes_messages(tmp_path):
+    store = ChatHistoryStore(str(tmp_path / "chat.db"))
+    fill(store, "s1", 3)
+    assert store.evict_inactive(ttl_sec=-1) == 1
+    assert store.count("s1") == 0 and store.stats() == {"sessions": 0, "messages": 0, "evicted": 1}
+    store.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import drift_monitor
+from drift_monitor import DriftMonitor, _combine, _merge, bin_counts, binned_ks, psi
+
+def test_psi_and_ks_on_known_counts():
+    ref = np.array([[0.5, 0.5], [0.25, 0.75]])
+    counts = np.array([[75, 25], [25, 75]])
+    # (0.75-0.5)·ln(1.5) + (0.25-0.5)·ln(0.5)
+    np.testing.assert_allclose(psi(ref, counts), [0.25 * np.log(1.5) + 0.25 * np.log(2.0), 0.0], atol=1e-12)
+    np.testing.assert_allclose(binned_ks(ref, counts), [0.25, 0.0], atol=1e-12)
+
+def test_bin_counts_match_searchsorted():
+    rng = np.random.default_rng(0)
+    Z = rng.normal(size=(500, 3))
+    Z[:5] = 0.0  # kenara tam eşit değerler üst kovaya düşer
+    edges = np.vstack([np.linspace(-1.5, 1.5, 9), np.linspace(-2.0, 2.0, 9), np.zeros(9)])
+    expected = np.array([np.bincount(np.searchsorted(edges[j], Z[:, j], side="right"), minlength=10)
+                         for j in range(3)])
+    np.testing.assert_array_equal(bin_counts(Z, edges), expected)
+
+def test_chan_merge_matches_full_moments():
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(3.0, 2.0, (n, 4)) for n in (1, 7, 64, 300)]
+    n, mean, m2 = 0, np.zeros(4), np.zeros(4)
+    for Z in parts:
+        n, mean, m2 = _merge(n, mean, m2, Z)
+    full = np.vstack(parts)
+    assert n == len(full)
+    np.testing.assert_allclose(mean, full.mean(axis=0))
+    np.testing.assert_allclose(m2 / (n - 1), full.var(axis=0, ddof=1))
+    # Boş taraf birleştirmeyi değiştirmez
+    assert _combine(0, np.zeros(4), np.zeros(4), n, mean, m2)[0] == n
+
+def make_monitor(rng, window_rows=100):
+    X = rng.normal(10.0, 2.0, (2_000, 2))
+    prob = rng.uniform(size=2_000)
+    Z = np.column_stack([X, prob])
+    quantiles = np.linspace(0, 1, drift_monitor.BINS + 1)[1:-1]
+    edges = np.vstack([np.quantile(X, quantiles, axis=0).T, quantiles[None, :]])
+    counts = bin_counts(Z, edges)
+    names = ["a", "b", drift_monitor.PROBABILITY]
+    return DriftMonitor(names, edges, counts / counts.sum(axis=1, keepdims=True),
+                        Z.mean(axis=0), Z.std(axis=0, ddof=1), "test", window_rows)
+
+def test_monitor_status_spans_windows():
+    rng = np.random.default_rng(2)
+    monitor = make_monitor(rng)
+    X = rng.normal(10.0, 2.0, (250, 2))
+    prob = rng.uniform(size=250)
+    # Pencere, window_rows'a ulaşan grubun sonunda kapanır (120 ve 110 satır); son 20 satır açık pencerede kalır
+    for start, stop in ((0, 7), (7, 120), (120, 133), (133, 230), (230, 250)):
+        monitor.update(X[start:stop], prob[start:stop])
+    status = monitor.status()
+    assert (status["rows"], status["windows"], status["window_rows"]) == (250, 2, 20)
+    Z = np.column_stack([X, prob])
+    assert list(status["mean"].values()) == pytest.approx(Z.mean(axis=0).round(4).tolist(), abs=1e-4)
+    assert list(status["std"].values()) == pytest.approx(Z.std(axis=0, ddof=1).round(4).tolist(), abs=1e-4)
+
+def test_monitor_alerts_only_on_new_crossings():
+    rng = np.random.default_rng(3)
+    monitor = make_monitor(rng)
+    same = monitor.update(rng.normal(10.0, 2.0, (100, 2)), rng.uniform(size=100))
+    assert same["crossed"] == [] and not monitor.alerts
+
+    # "a" kayar: iki ardışık pencerede de eşik aşılır ama uyarılar yalnızca ilk pencerede eklenir
+    alerts = []
+    for _ in range(2):
+        X = np.column_stack([rng.normal(14.0, 2.0, 100), rng.normal(10.0, 2.0, 100)])
+        report = monitor.update(X, rng.uniform(size=100))
+        assert {"a:psi", "a:mean_shift"} <= set(report["crossed"])
+        assert not any(c.startswith("b:") for c in report["crossed"])
+        alerts.append(len(monitor.alerts))
+    assert alerts[0] >= 2 and alerts[1] == alerts[0]
+    assert monitor.status()["active_alerts"] == report["crossed"]
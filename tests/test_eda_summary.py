@@ -0,0 +1,40 @@
+import numpy as np
+
+from eda_summary import FINE_BINS, binned_kde
+
+def test_binned_kde_wide_kernel_keeps_bin_count():
+    # Küçük ve geniş yayılımlı sınıf: Scott bant genişliği kova sayısından uzun bir çekirdek üretir
+    edges = np.linspace(0.0, 30.0, FINE_BINS + 1)
+    counts = np.zeros(FINE_BINS, dtype=np.int64)
+    counts[[0, 5, FINE_BINS - 6, FINE_BINS - 1]] = 1
+    centers, density = binned_kde(counts, edges)
+    assert len(density) == len(centers) == FINE_BINS
+    assert np.isfinite(density).all() and (density >= 0).all()
+    # Simetrik veri, simetrik yoğunluk: kesit çekirdeğin ortasından alınmış olmalı
+    np.testing.assert_allclose(density, density[::-1], rtol=1e-9, atol=1e-12)
+
+def test_binned_kde_narrow_kernel_integrates_to_one():
+    edges = np.linspace(0.0, 30.0, FINE_BINS + 1)
+    rng = np.random.default_rng(0)
+    counts = np.bincount(((rng.normal(15.0, 1.0, 50_000) / 30.0) * FINE_BINS).astype(int), minlength=FINE_BINS)
+    _, density = binned_kde(counts, edges)
+    assert abs(density.sum() * (edges[1] - edges[0]) - 1.0) < 1e-3
+
+def test_radius_hist_plots_small_high_variance_class():
+    import matplotlib.pyplot as plt
+    from eda_plots import plot_radius_hist
+
+    fine_edges = np.linspace(5.0, 30.0, FINE_BINS + 1)
+    hist_edges = np.linspace(5.0, 30.0, 31)
+    small = np.zeros(FINE_BINS, dtype=np.int64)
+    small[[0, FINE_BINS - 1]] = 1
+    large = np.zeros(FINE_BINS, dtype=np.int64)
+    large[400:600] = 10
+    summary = {
+        "classes": ["B", "M"],
+        "hist": np.array([np.histogram([5.0, 30.0], hist_edges)[0], np.full(30, 66)]),
+        "fine_hist": np.array([small, large]),
+        "hist_edges": hist_edges,
+        "fine_edges": fine_edges,
+    }
+    plt.close(plot_radius_hist(summary))
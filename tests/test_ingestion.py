@@ -0,0 +1,109 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import ingestion
+
+FEATURES = ["radius_mean", "texture_mean", "area_mean"]
+
+# Sütunlar FEATURES sırasında değil, fazladan id/diagnosis sütunları var; eksik ve negatif hücreler içerir
+SHUFFLED_CSV = """id,Area Mean,diagnosis,radius_mean,TEXTURE_MEAN
+1,500.0,M,14.1,20.2
+2,-3.0,B,12.0,18.5
+3,610.5,M,,21.0
+4,700.0,B,15.3,-1.0
+5,420.0,B,11.9,17.3
+6,-1.0,M,-2.5,
+"""
+
+def collect(batches):
+    # (geçerli satır numaraları, birleşik hata raporu)
+    valid_rows, reports = [], []
+    for offset, X, non_numeric in batches:
+        valid, bad = ingestion.validate(X, non_numeric)
+        valid_rows += (offset + np.flatnonzero(valid)).tolist()
+        if bad is not None:
+            reports.append(ingestion.error_report(offset, bad, FEATURES))
+    return valid_rows, pd.concat(reports, ignore_index=True)
+
+def text_batches(source, batch_size=2):
+    # Metin (yavaş) yolu doğrudan: hücreler str olarak okunup to_matrix ile çevrilir
+    offset = 0
+    for batch, mapping in ingestion._csv_text_batches(source, FEATURES, batch_size):
+        X, non_numeric = ingestion.to_matrix(batch, mapping, FEATURES)
+        yield offset, X, non_numeric
+        offset += len(X)
+
+def reference_codes(X, non_numeric):
+    # Hücre hücre dolaşan başvuru uygulaması
+    codes = np.zeros(X.shape, dtype=np.uint8)
+    for i in range(X.shape[0]):
+        for j in range(X.shape[1]):
+            v = X[i, j]
+            if non_numeric is not None and non_numeric[i, j]:
+                codes[i, j] |= ingestion.NON_NUMERIC
+            elif np.isnan(v):
+                codes[i, j] |= ingestion.MISSING
+            if v < 0:
+                codes[i, j] |= ingestion.NEGATIVE
+            if v == np.inf:
+                codes[i, j] |= ingestion.INFINITE
+    return codes
+
+def test_fast_and_text_paths_report_the_same_errors():
+    fast_valid, fast_report = collect(ingestion.iter_feature_batches(io.BytesIO(SHUFFLED_CSV.encode()), FEATURES))
+    text_valid, text_report = collect(text_batches(io.BytesIO(SHUFFLED_CSV.encode())))
+    assert fast_valid == text_valid == [0, 4]
+    pd.testing.assert_frame_equal(fast_report, text_report)
+    assert fast_report.to_dict("records") == [
+        {"satir": 1, "sutun": "area_mean", "hata": "negatif değer"},
+        {"satir": 2, "sutun": "radius_mean", "hata": "eksik değer"},
+        {"satir": 3, "sutun": "texture_mean", "hata": "negatif değer"},
+        {"satir": 5, "sutun": "radius_mean", "hata": "negatif değer"},
+        {"satir": 5, "sutun": "texture_mean", "hata": "eksik değer"},
+        {"satir": 5, "sutun": "area_mean", "hata": "negatif değer"},
+    ]
+
+def test_non_numeric_cell_falls_back_without_repeating_rows(monkeypatch):
+    # Küçük blok: hızlı yol birkaç parça döndürdükten sonra son satırdaki metin hücresinde durur
+    monkeypatch.setattr(ingestion, "CSV_BLOCK_SIZE", 64)
+    rows = [f"{i},{10 + i}.5,{20 + i}.25,{300 + i}.0" for i in range(12)]
+    rows[-1] = "11,abc,31.25,-311.0"
+    source = io.BytesIO(("id,radius_mean,texture_mean,area_mean\n" + "\n".join(rows) + "\n").encode())
+
+    offsets = []
+    def batches():
+        for offset, X, non_numeric in ingestion.iter_feature_batches(source, FEATURES, batch_size=5):
+            offsets.append((offset, len(X)))
+            yield offset, X, non_numeric
+
+    valid_rows, report = collect(batches())
+    # Her satır tam bir kez döner: parçalar art arda ve boşluksuz
+    assert [o for o, _ in offsets] == np.cumsum([0] + [n for _, n in offsets[:-1]]).tolist()
+    assert sum(n for _, n in offsets) == 12
+    assert valid_rows == list(range(11))
+    assert report.to_dict("records") == [
+        {"satir": 11, "sutun": "radius_mean", "hata": "sayısal olmayan değer"},
+        {"satir": 11, "sutun": "area_mean", "hata": "negatif değer"},
+    ]
+
+def test_validate_matches_per_cell_reference():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0.0, 10.0, (200, 4))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    X[rng.random(X.shape) < 0.05] *= -1
+    X[rng.random(X.shape) < 0.02] = np.inf
+    X[rng.random(X.shape) < 0.02] = -np.inf
+    non_numeric = rng.random(X.shape) < 0.03
+    X[non_numeric] = np.nan
+
+    valid, (bad_rows, codes) = ingestion.validate(X, non_numeric)
+    expected = reference_codes(X, non_numeric)
+    np.testing.assert_array_equal(valid, ~expected.any(axis=1))
+    np.testing.assert_array_equal(bad_rows, np.flatnonzero(expected.any(axis=1)))
+    np.testing.assert_array_equal(codes, expected[bad_rows])
+
+def test_validate_clean_matrix_has_no_report():
+    valid, bad = ingestion.validate(np.array([[1.0, 0.0], [2.5, 3.0]]))
+    assert valid.all() and bad is None
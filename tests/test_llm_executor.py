@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_executor import CoalescingExecutor
+
+def gated_factory(started, gate, calls, chunks=("a", "b", "c")):
+    # İlk parçadan sonra gate açılana kadar bekleyen sahte zincir akışı
+    async def stream():
+        calls.append(1)
+        yield chunks[0]
+        started.set()
+        while not gate.is_set():
+            await asyncio.sleep(0.005)
+        for chunk in chunks[1:]:
+            yield chunk
+    return stream
+
+def consume(executor, key, factory, results, i):
+    results[i] = list(executor.stream(key, factory))
+
+@pytest.fixture
+def executor():
+    ex = CoalescingExecutor(max_concurrency=2, queue_timeout=5.0, call_timeout=5.0)
+    yield ex
+    ex.close()
+
+def test_same_key_is_coalesced(executor):
+    started, gate, calls, results = threading.Event(), threading.Event(), [], [None, None]
+    factory = gated_factory(started, gate, calls)
+    first = threading.Thread(target=consume, args=(executor, "q", factory, results, 0))
+    first.start()
+    assert started.wait(5.0)
+    # Geç katılan abone "a" parçasını da baştan alır
+    second = threading.Thread(target=consume, args=(executor, "q", factory, results, 1))
+    second.start()
+    while executor.stats()["coalesced"] == 0:
+        time.sleep(0.005)
+    gate.set()
+    first.join(5.0)
+    second.join(5.0)
+
+    assert results == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(calls) == 1
+    stats = executor.stats()
+    assert (stats["upstream_calls"], stats["coalesced"], stats["inflight_keys"]) == (1, 1, 0)
+
+    # Tamamlanan çağrıya yeni istek katılmaz
+    assert list(executor.stream("q", factory)) == ["a", "b", "c"]
+    assert len(calls) == 2
+
+def test_different_keys_are_not_coalesced(executor):
+    gate = threading.Event()
+    gate.set()
+    calls = []
+    for key in ("q1", "q2"):
+        assert list(executor.stream(key, gated_factory(threading.Event(), gate, calls))) == ["a", "b", "c"]
+    assert len(calls) == 2 and executor.stats()["coalesced"] == 0
+
+def test_call_shares_result_and_errors(executor):
+    async def answer():
+        return {"answer": "42"}
+    assert executor.call("q", answer) == {"answer": "42"}
+
+    async def fail():
+        raise ValueError("üst akış hatası")
+    with pytest.raises(ValueError, match="üst akış hatası"):
+        executor.call("q", fail)
+    assert executor.stats()["inflight_keys"] == 0
@@ -0,0 +1,75 @@
+import time
+from types import SimpleNamespace
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+class FakeEmbeddings:
+    # Soru -> sabit vektör; kaç kez embedding hesaplandığı sayılır
+    VECTORS = {
+        "meme kanseri nedir?": [1.0, 0.0, 0.0],
+        "meme kanseri ne demek?": [0.99, 0.05, 0.0],
+        "mamografi ne zaman çekilir?": [0.0, 1.0, 0.0],
+        "risk faktörleri nelerdir?": [0.0, 0.0, 1.0],
+    }
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, question):
+        self.calls += 1
+        return self.VECTORS[question.lower()]
+
+def fake_clock(monkeypatch, start=1_000.0):
+    clock = [start]
+    monkeypatch.setattr(semantic_cache, "time", SimpleNamespace(time=lambda: clock[0], perf_counter=time.perf_counter))
+    return clock
+
+def ask(cache, question, answer=None):
+    # Iskalamada yanıtı saklar; (isabet mi, yanıt) döner
+    entry, vector = cache.lookup(question)
+    if entry is not None:
+        return True, entry["result"]["answer"]
+    cache.store(question, vector, {"answer": answer or question}, 1.0)
+    return False, None
+
+def test_exact_and_similar_questions_hit():
+    embeddings = FakeEmbeddings()
+    cache = SemanticCache(embeddings)
+    assert ask(cache, "Meme kanseri nedir?", "A") == (False, None)
+    calls = embeddings.calls
+    # Normalize edilmiş birebir eşleşme embedding hesaplamaz
+    assert ask(cache, "  MEME   kanseri nedir? ") == (True, "A")
+    assert embeddings.calls == calls
+    assert ask(cache, "Meme kanseri ne demek?") == (True, "A")
+    assert ask(cache, "Mamografi ne zaman çekilir?", "B") == (False, None)
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    cache = SemanticCache(FakeEmbeddings(), ttl_sec=60)
+    ask(cache, "Meme kanseri nedir?", "A")
+    clock[0] += 60
+    assert ask(cache, "Meme kanseri nedir?") == (True, "A")
+    clock[0] += 1  # saklamadan bu yana 61 sn
+    assert cache.lookup("Meme kanseri nedir?")[0] is None
+    assert cache.metrics()["entries"] == 0
+
+def test_lru_evicts_least_recently_used():
+    cache = SemanticCache(FakeEmbeddings(), max_entries=2)
+    ask(cache, "Meme kanseri nedir?", "A")
+    ask(cache, "Mamografi ne zaman çekilir?", "B")
+    assert ask(cache, "Meme kanseri nedir?") == (True, "A")  # A en son kullanılan olur
+    ask(cache, "Risk faktörleri nelerdir?", "C")
+    assert cache.metrics()["entries"] == 2
+    assert ask(cache, "Meme kanseri nedir?") == (True, "A")
+    assert ask(cache, "Risk faktörleri nelerdir?") == (True, "C")
+    assert cache.lookup("Mamografi ne zaman çekilir?")[0] is None
+
+def test_namespace_change_clears_entries():
+    cache = SemanticCache(FakeEmbeddings())
+    cache.set_namespace("index-1")
+    ask(cache, "Meme kanseri nedir?", "A")
+    cache.set_namespace("index-1")
+    assert cache.metrics()["entries"] == 1
+    cache.set_namespace("index-2")
+    assert cache.metrics()["entries"] == 0
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from sklearn.metrics import confusion_matrix, f1_score
+
+from threshold_sweep import ThresholdSweep
+
+# 0.4 skoru üç kez tekrarlanır (biri negatif, ikisi pozitif): bisect sınırı bu bağ üzerinde denenir
+SCORES = [0.1, 0.4, 0.4, 0.4, 0.55, 0.7, 0.9, 0.2, 0.05, 0.9]
+LABELS = [0, 0, 1, 1, 0, 1, 1, 0, 0, 1]
+
+def sklearn_confusion(threshold):
+    pred = (np.asarray(SCORES) > threshold).astype(int)
+    tn, fp, fn, tp = confusion_matrix(LABELS, pred, labels=[0, 1]).ravel()
+    return {"tn": tn, "fp": fp, "fn": fn, "tp": tp}
+
+def test_confusion_matches_sklearn():
+    sweep = ThresholdSweep(SCORES, LABELS)
+    for threshold in (0.0, 0.05, 0.15, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0):
+        assert sweep.confusion(threshold) == sklearn_confusion(threshold), threshold
+
+def test_confusion_at_tied_score():
+    sweep = ThresholdSweep(SCORES, LABELS)
+    # Kural "olasılık > eşik": eşik bağlı skora eşitse üçü de benign, hemen altındaysa üçü de malign
+    below = np.nextafter(0.4, 0.0)
+    assert sweep.confusion(0.4) == sklearn_confusion(0.4) == {"tn": 4, "fp": 1, "fn": 2, "tp": 3}
+    assert sweep.confusion(below) == sklearn_confusion(below) == {"tn": 3, "fp": 2, "fn": 0, "tp": 5}
+
+def test_curve_f1_matches_sklearn():
+    sweep = ThresholdSweep(SCORES, LABELS)
+    curve = sweep.curve()
+    expected = [f1_score(LABELS, (np.asarray(SCORES) > t).astype(int), zero_division=0.0) for t in curve["threshold"]]
+    np.testing.assert_allclose(curve["f1"], expected)
+    threshold, f1 = sweep.best_f1()
+    assert f1 == pytest.approx(max(expected))
+    assert sweep.metrics(threshold)["f1"] == pytest.approx(f1)
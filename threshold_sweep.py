@@ -0,0 +1,165 @@
+# Değerlendirme kümesinde anlık eşik taraması ve seçilen eşiğin yeni artefakt sürümü olarak kaydı.
+#
+# Test kümesi (notebook ile aynı bölme) bir kez puanlanır; skorlar sıralanır ve
+# sıralı skorlar boyunca pozitif etiketlerin kümülatif sayısı tutulur. Bir eşik için
+# ikili arama, eşiğin altında kalan satır sayısını (k) verir; karışıklık matrisi
+# k ve kümülatif sayılardan hesaplanır. Eşik değişimi O(log n)'dir, yeniden çıkarım yapılmaz.
+# Tahmin kuralı uygulamanın geri kalanıyla aynıdır: prob > eşik ise malign.
+#
+# Kullanım:
+#   python threshold_sweep.py                       # aktif sürüm, mevcut eşik ve en iyi F1 eşiği
+#   python threshold_sweep.py --threshold 0.35
+#   python threshold_sweep.py --threshold 0.35 --save v1-esik-035 --note "recall öncelikli"
+
+import argparse
+import bisect
+import json
+import os
+import re
+import shutil
+import sys
+
+import numpy as np
+
+import cascade
+import model_registry
+
+DATA_PATH = "data/data.csv"
+EVAL_TEST_SIZE = 0.2
+EVAL_RANDOM_STATE = 42
+MODELS_DIR = "models"
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+# ─────────────────────────── Değerlendirme Kümesi ───────────────────────
+def evaluation_split(features, data_path=DATA_PATH):
+    # Notebook ve cascade.fit ile aynı bölme; model bu satırları eğitimde görmedi
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(data_path)
+    y = df["diagnosis"].map({"M": 1, "B": 0}).to_numpy()
+    _, X_test, _, y_test = train_test_split(
+        df[features], y, test_size=EVAL_TEST_SIZE, random_state=EVAL_RANDOM_STATE, stratify=y)
+    return X_test, y_test
+
+# ─────────────────────────── Eşik Taraması ──────────────────────────────
+class ThresholdSweep:
+    def __init__(self, scores, labels):
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        labels = np.asarray(labels).astype(np.int64).reshape(-1)
+        order = np.argsort(scores, kind="stable")
+        self._sorted = scores[order]
+        # bisect için düz liste; cum_pos[k] = en düşük k skor içindeki pozitif sayısı
+        self.scores = self._sorted.tolist()
+        self.cum_pos = np.concatenate([[0], np.cumsum(labels[order])]).tolist()
+        self.n = len(self.scores)
+        self.positives = self.cum_pos[-1]
+
+    @classmethod
+    def from_bundle(cls, bundle, data_path=DATA_PATH):
+        X_test, y_test = evaluation_split(bundle.features, data_path)
+        return cls(bundle.predict_proba(X_test), y_test)
+
+    def confusion(self, threshold):
+        k = bisect.bisect_right(self.scores, threshold)  # skoru ≤ eşik olanlar: benign tahmini
+        fn = self.cum_pos[k]
+        tp = self.positives - fn
+        return {"tn": k - fn, "fp": self.n - k - tp, "fn": fn, "tp": tp}
+
+    def metrics(self, threshold):
+        c = self.confusion(threshold)
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else 0.0
+        recall = c["tp"] / self.positives if self.positives else 0.0
+        negatives = self.n - self.positives
+        return {
+            **c,
+            "threshold": threshold,
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "accuracy": (c["tp"] + c["tn"]) / self.n if self.n else 0.0,
+            "specificity": c["tn"] / negatives if negatives else 0.0,
+        }
+
+    def curve(self):
+        # Tüm farklı skorlarda eşik; grafik ve en iyi eşik araması için bir kez, vektörel hesaplanır
+        thresholds = np.unique(self._sorted)
+        k = np.searchsorted(self._sorted, thresholds, side="right")
+        fn = np.asarray(self.cum_pos)[k]
+        tp = self.positives - fn
+        predicted = self.n - k
+        precision = np.divide(tp, predicted, out=np.zeros(len(k)), where=predicted > 0)
+        recall = tp / self.positives if self.positives else np.zeros(len(k))
+        denom = precision + recall
+        f1 = np.divide(2 * precision * recall, denom, out=np.zeros(len(k)), where=denom > 0)
+        return {"threshold": thresholds, "precision": precision, "recall": recall, "f1": f1}
+
+    def best_f1(self):
+        curve = self.curve()
+        i = int(np.argmax(curve["f1"]))
+        return float(curve["threshold"][i]), float(curve["f1"][i])
+
+# ─────────────────────────── Yeni Sürüm ─────────────────────────────────
+def save_threshold_version(version, threshold, base_version=None, note="", activate=False,
+                           registry_path=model_registry.REGISTRY_PATH, models_dir=MODELS_DIR):
+    # Temel sürümün model/scaler/özellik dosyaları models/<sürüm>/ altına kopyalanır,
+    # yalnızca threshold.json yeni eşikle yazılır ve sürüm kayda eklenir
+    if not VERSION_PATTERN.match(version or ""):
+        raise ValueError("Sürüm adı yalnızca harf, rakam, '.', '_' ve '-' içerebilir")
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError("Eşik 0 ile 1 arasında olmalıdır")
+    if version in model_registry.load_registry(registry_path)["versions"]:
+        raise ValueError(f"Bu sürüm zaten kayıtlı: {version}")
+    base_version, entry = model_registry.version_entry(base_version, registry_path)
+    model_registry.verify(entry)
+
+    out_dir = os.path.join(models_dir, version)
+    if os.path.exists(out_dir) and os.listdir(out_dir):
+        raise ValueError(f"Hedef dizin boş değil: {out_dir}")
+    os.makedirs(out_dir, exist_ok=True)
+    files = {}
+    for kind, name in model_registry.ARTIFACT_FILES.items():
+        files[kind] = os.path.join(out_dir, name)
+        if kind != "threshold":
+            shutil.copy2(entry["files"][kind], files[kind])
+    # NumPy motoru dosyası modelin yanında aranır; kaynak dosyalar aynı olduğundan güncel kalır
+    npz_path = os.path.splitext(entry["files"]["model"])[0] + ".npz"
+    if os.path.exists(npz_path):
+        shutil.copy2(npz_path, os.path.splitext(files["model"])[0] + ".npz")
+    # Cascade de yalnızca model ve scaler özetlerine bağlıdır; eşik bandın dışındaysa
+    # artifacts yükleme sırasında uyarıyla MLP'ye döner
+    cascade_src = cascade.cascade_path(entry["files"]["model"])
+    if os.path.exists(cascade_src) and cascade.is_current(cascade_src, entry["files"]["model"], entry["files"]["scaler"]):
+        shutil.copy2(cascade_src, cascade.cascade_path(files["model"]))
+    with open(files["threshold"], "w") as f:
+        json.dump({"threshold": round(float(threshold), 6)}, f)
+
+    note = note or f"{base_version} sürümünden eşik {threshold:.4f}"
+    return model_registry.register(version, files, note, activate, registry_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test kümesinde eşik taraması")
+    parser.add_argument("--version", help="Değerlendirilecek sürüm (varsayılan: aktif sürüm)")
+    parser.add_argument("--threshold", type=float, help="Değerlendirilecek eşik (varsayılan: sürümün eşiği)")
+    parser.add_argument("--save", metavar="SÜRÜM", help="Eşiği bu adla yeni sürüm olarak kaydet")
+    parser.add_argument("--note", default="")
+    parser.add_argument("--activate", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        bundle = model_registry.load_bundle(args.version)
+        sweep = ThresholdSweep.from_bundle(bundle)
+        threshold = bundle.threshold if args.threshold is None else args.threshold
+        best_threshold, best_f1 = sweep.best_f1()
+        print(json.dumps({
+            "version": bundle.version,
+            "rows": sweep.n,
+            "metrics": sweep.metrics(threshold),
+            "best_f1": {"threshold": best_threshold, "f1": best_f1},
+        }, ensure_ascii=False, indent=2))
+        if args.save:
+            save_threshold_version(args.save, threshold, bundle.version, args.note, args.activate)
+            print(f"Kaydedildi: {args.save} (eşik {threshold})")
+    except (ValueError, KeyError, OSError) as e:
+        print(e)
+        sys.exit(1)